@@ -5,6 +5,7 @@ from dataclasses import dataclass, asdict
 import folium
 from folium import plugins
 from datetime import datetime
+from uuid import uuid4
 
 from agents.osm_data_collector import OSMDataCollector, PropertyData, POI
 from agents.neighborhood_analyst import NeighborhoodAnalyst, NeighborhoodMetrics
@@ -51,7 +52,7 @@ class PropertyAnalysisOrchestrator:
         """Complete property analysis orchestration"""
 
         if analysis_id is None:
-            analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:8]}"
 
         logger.info(f"Starting property analysis for: {address} (ID: {analysis_id})")
 
@@ -76,22 +77,28 @@ class PropertyAnalysisOrchestrator:
             property_data = osm_data['property']
             pois = osm_data['pois']
 
-            # Step 2: Analyze neighborhood
-            logger.info("Step 2: Analyzing neighborhood metrics...")
+            # Step 2: Start the pedestrian Overpass query in a worker thread; it only
+            # needs the geocoded property, so it overlaps the local metric steps below
+            logger.info("Step 2: Collecting pedestrian infrastructure in the background...")
+            pedestrian_future = asyncio.get_running_loop().run_in_executor(
+                None, asyncio.run, self.pedestrian_analyzer.collect_pedestrian_data(property_data)
+            )
+
+            # Step 3: Analyze neighborhood
+            logger.info("Step 3: Analyzing neighborhood metrics...")
             metrics = self.neighborhood_analyst.analyze_neighborhood(property_data, pois)
 
-            # Step 3: Calculate advanced metrics
-            logger.info("Step 3: Calculating advanced metrics...")
+            # Step 4: Calculate advanced metrics
+            logger.info("Step 4: Calculating advanced metrics...")
             advanced_metrics = self.advanced_metrics_calculator.calculate_all_metrics(pois)
 
-            # Step 4: Analyze pedestrian infrastructure
-            logger.info("Step 4: Analyzing pedestrian infrastructure...")
-            pedestrian_infrastructure = await self.pedestrian_analyzer.collect_pedestrian_data(property_data)
-            pedestrian_score = self.pedestrian_analyzer.calculate_pedestrian_score(pedestrian_infrastructure)
-
-            # Step 5: Generate insights
+            # Step 5: Generate insights while the pedestrian query finishes
             logger.info("Step 5: Generating insights with LLM...")
-            insights = await self.insight_generator.generate_insights(property_data, metrics, pois)
+            pedestrian_infrastructure, insights = await asyncio.gather(
+                pedestrian_future,
+                self.insight_generator.generate_insights(property_data, metrics, pois)
+            )
+            pedestrian_score = self.pedestrian_analyzer.calculate_pedestrian_score(pedestrian_infrastructure)
 
             # Step 6: Create interactive map
             logger.info("Step 6: Creating interactive map...")
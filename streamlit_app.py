@@ -3,21 +3,33 @@ import asyncio
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from plotly.colors import sample_colorscale
+import streamlit.components.v1 as components
 from streamlit_folium import folium_static
 import folium
-from folium.plugins import HeatMap, MarkerCluster
+from folium.plugins import HeatMap, MarkerCluster, FastMarkerCluster
 try:
     from folium.plugins import Draw, MeasureControl, MiniMap
 except ImportError:
     # Fallback if plugins not available
     Draw = MeasureControl = MiniMap = None
+try:
+    import segno
+except ImportError:
+    # QR codes fall back to a placeholder
+    segno = None
 import pandas as pd
 from datetime import datetime
-import time
 import numpy as np
 from collections import Counter
+from functools import lru_cache
+from string import Template as StringTemplate
+from operator import itemgetter
+from types import MappingProxyType
+from statistics import fmean
 import math
 import json
+import re
 from branca.element import Template, MacroElement
 
 # Import our agents
@@ -36,6 +48,10 @@ if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = {}
 if 'current_analysis' not in st.session_state:
     st.session_state.current_analysis = None
+if '_analysis_version' not in st.session_state:
+    st.session_state._analysis_version = 0
+if 'analysis_done' not in st.session_state:
+    st.session_state.analysis_done = False
 if 'comparison_addresses' not in st.session_state:
     st.session_state.comparison_addresses = []
 
@@ -48,12 +64,31 @@ if 'custom_weights' not in st.session_state:
         'healthcare': 0.10, 'transport': 0.20, 'services': 0.10
     }
 
-# Initialize orchestrator
+# One-time per-process setup, shared by every session and rerun
 @st.cache_resource
 def get_orchestrator():
     return PropertyAnalysisOrchestrator()
 
-orchestrator = get_orchestrator()
+class _AnalysisFailed(Exception):
+    """Carries a failed analysis result out of the cache so it is not stored"""
+    def __init__(self, result):
+        super().__init__(result.error_message)
+        self.result = result
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_analysis(address):
+    """Full analysis of an address, shared across sessions for an hour"""
+    result = asyncio.run(get_orchestrator().analyze_property(address))
+    if not result.success:
+        raise _AnalysisFailed(result)
+    return result
+
+def analyze_address(address):
+    """Analyze an address, reusing a recent successful result when one is cached"""
+    try:
+        return _cached_analysis(address)
+    except _AnalysisFailed as failed:
+        return failed.result
 
 # Helper functions
 def get_score_grade(score):
@@ -250,14 +285,14 @@ def create_accessibility_analysis(result):
     
     # Count POIs in each time zone
     accessibility_data = []
-    categories = set([poi.get('category', 'other') for poi in result.pois])
+    categories = {poi.get('category', 'other') for poi in result.pois}
     
     for category in categories:
         category_pois = [poi for poi in result.pois if poi.get('category') == category]
         zone_counts = {}
         
         for zone_name, max_distance in time_zones.items():
-            count = len([poi for poi in category_pois if poi.get('distance', 0) <= max_distance])
+            count = sum(1 for poi in category_pois if poi.get('distance', 0) <= max_distance)
             zone_counts[zone_name] = count
         
         for zone, count in zone_counts.items():
@@ -284,27 +319,40 @@ def create_accessibility_analysis(result):
     
     return fig
 
-def create_folium_map(result, show_radius=True, poi_filter=None):
-    """Enhanced map creation with optional radius and POI filtering"""
+# POI marker colors on the property map
+POI_MARKER_COLORS = {
+    'education': 'blue',
+    'healthcare': 'green',
+    'shopping': 'orange',
+    'transport': 'purple',
+    'entertainment': 'pink',
+    'restaurant': 'darkgreen',
+    'services': 'gray',
+    'park': 'lightgreen'
+}
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_map_html(lat, lon, address, total_score, radius, pois_fingerprint, poi_filter):
+    """Render the property map with its POI markers to HTML"""
     m = folium.Map(
-        location=[result.property_data.lat, result.property_data.lon],
+        location=[lat, lon],
         zoom_start=15,
         tiles='OpenStreetMap'
     )
     
     # Add property marker
     folium.Marker(
-        [result.property_data.lat, result.property_data.lon],
-        popup=f"<b>Propriedade</b><br>{result.property_data.address}<br>Score: {result.metrics.total_score:.1f}",
+        [lat, lon],
+        popup=f"<b>Propriedade</b><br>{address}<br>Score: {total_score:.1f}",
         icon=folium.Icon(color='red', icon='home')
     ).add_to(m)
     
     # Add analysis radius circle
-    if show_radius:
+    if radius:
         folium.Circle(
-            [result.property_data.lat, result.property_data.lon],
-            radius=st.session_state.analysis_radius,
-            popup=f"Raio de Análise ({st.session_state.analysis_radius}m)",
+            [lat, lon],
+            radius=radius,
+            popup=f"Raio de Análise ({radius}m)",
             color='blue',
             fill=True,
             fillOpacity=0.1,
@@ -312,36 +360,49 @@ def create_folium_map(result, show_radius=True, poi_filter=None):
             opacity=0.8
         ).add_to(m)
     
-    # POI color mapping
-    color_map = {
-        'education': 'blue',
-        'healthcare': 'green', 
-        'shopping': 'orange',
-        'transport': 'purple',
-        'entertainment': 'pink',
-        'restaurant': 'darkgreen',
-        'services': 'gray',
-        'park': 'lightgreen'
-    }
-    
-    # Add POI markers with clustering
-    marker_cluster = MarkerCluster().add_to(m)
+    # Add POIs as a single GeoJSON layer of circle markers instead of one icon marker each
+    wanted = {c.lower() for c in poi_filter}
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [poi_lon or 0, poi_lat or 0]},
+            "properties": {
+                "name": name or 'POI',
+                "category": category or 'N/A',
+                "distance": f"{distance:.0f}m",
+                "color": POI_MARKER_COLORS.get((category or 'other').lower(), 'gray')
+            }
+        }
+        for category, distance, name, poi_lat, poi_lon in pois_fingerprint
+        if not wanted or (category or '').lower() in wanted
+    ]
     
-    for poi in result.pois:
-        # Apply POI filter if specified
-        if poi_filter and poi.get('category', '').lower() not in [c.lower() for c in poi_filter]:
-            continue
-            
-        category = poi.get('category', 'other').lower()
-        color = color_map.get(category, 'gray')
-        
-        folium.Marker(
-            [poi.get('lat', 0), poi.get('lon', 0)],
-            popup=f"<b>{poi.get('name', 'POI')}</b><br>Categoria: {poi.get('category', 'N/A')}<br>Distância: {poi.get('distance', 0):.0f}m",
-            icon=folium.Icon(color=color, icon='info-sign')
-        ).add_to(marker_cluster)
+    poi_layer = folium.FeatureGroup(name="POIs").add_to(m)
+    if features:
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.8, weight=1),
+            style_function=lambda feature: {
+                "color": feature["properties"]["color"],
+                "fillColor": feature["properties"]["color"]
+            },
+            tooltip=folium.GeoJsonTooltip(fields=["name", "distance"], aliases=["POI", "Distância"]),
+            popup=folium.GeoJsonPopup(fields=["name", "category", "distance"], aliases=["POI", "Categoria", "Distância"])
+        ).add_to(poi_layer)
     
-    return m
+    return m.get_root().render()
+
+def create_folium_map(result, show_radius=True, poi_filter=None):
+    """Enhanced map HTML with optional radius and POI filtering, cached per location and POI set"""
+    return _build_map_html(
+        result.property_data.lat,
+        result.property_data.lon,
+        result.property_data.address,
+        result.metrics.total_score,
+        st.session_state.analysis_radius if show_radius else None,
+        pois_key(result.pois),
+        tuple(poi_filter or ())
+    )
 
 def create_density_visualization(result):
     """Create POI density visualization"""
@@ -765,7 +826,7 @@ def create_smart_clustering_map(result, zoom_level=14):
     
     for category in category_colors.keys():
         clusters[category] = MarkerCluster(
-            name=f"{category.title()} ({len([p for p in result.pois if p.get('category') == category])})",
+            name=f"{category.title()} ({sum(1 for p in result.pois if p.get('category') == category)})",
             options={
                 'maxClusterRadius': 80 if zoom_level < 15 else 40,
                 'spiderfyOnMaxZoom': True,
@@ -871,7 +932,7 @@ def create_adjustable_radius_map(result, radius=1000, show_radius=True):
     # Add distance rings
     for ring_radius in [250, 500, 750, 1000, 1250, 1500]:
         if ring_radius <= radius:
-            pois_in_ring = len([p for p in result.pois if p.get('distance', 0) <= ring_radius])
+            pois_in_ring = sum(1 for p in result.pois if p.get('distance', 0) <= ring_radius)
             folium.Circle(
                 [result.property_data.lat, result.property_data.lon],
                 radius=ring_radius,
@@ -927,22 +988,69 @@ def create_adjustable_radius_map(result, radius=1000, show_radius=True):
     
     return m
 
+# Leaflet callback for FastMarkerCluster rows of [lat, lon, color, popup]
+CONVENIENCE_MARKER_JS = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'info-sign', markerColor: row[2]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[3]);
+    return marker;
+}
+"""
+
+@st.cache_resource(max_entries=32)
+def _build_convenience_map(lat, lon, pois_fingerprint):
+    """Render the walking-time convenience map to HTML"""
+    m = folium.Map(location=[lat, lon], zoom_start=15)
+    
+    # Add center point
+    folium.Marker(
+        [lat, lon],
+        popup="📍 Localização Analisada",
+        icon=folium.Icon(color='red', icon='home')
+    ).add_to(m)
+    
+    # Add colored circles for convenience zones
+    for radius, popup, color, opacity in [
+        (400, "🟢 5 min a pé - Muito Conveniente", 'green', 0.2),
+        (800, "🟡 10 min a pé - Conveniente", 'yellow', 0.1),
+        (1200, "🟠 15 min a pé - Aceitável", 'orange', 0.05)
+    ]:
+        folium.Circle(
+            location=[lat, lon],
+            radius=radius,
+            popup=popup,
+            color=color,
+            fill=True,
+            fillOpacity=opacity
+        ).add_to(m)
+    
+    # Add POIs with appropriate colors as one clustered layer
+    if pois_fingerprint:
+        dist = np.array([poi[1] for poi in pois_fingerprint], dtype=float)
+        lats = np.array([lat if poi[3] is None else poi[3] for poi in pois_fingerprint], dtype=float)
+        lons = np.array([lon if poi[4] is None else poi[4] for poi in pois_fingerprint], dtype=float)
+        colors = np.array(['green', 'yellow', 'orange', 'red'])[np.digitize(dist, RADII, right=True)]
+        popups = [f"{poi[2] or 'N/A'}<br>🚶‍♂️ {d / WALK_SPEED_M_PER_MIN:.1f} min" for poi, d in zip(pois_fingerprint, dist)]
+        rows = [[la, lo, c, pop] for la, lo, c, pop in zip(lats.tolist(), lons.tolist(), colors.tolist(), popups)]
+        FastMarkerCluster(rows, callback=CONVENIENCE_MARKER_JS).add_to(m)
+    
+    return m.get_root().render()
+
 # Temporal & Trends Analysis Functions
-def calculate_urban_maturity_index(pois):
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_urban_maturity_index(pois_fingerprint):
     """Calculate urban maturity based on POI diversity and density"""
-    if not pois:
+    if not pois_fingerprint:
         return 0, {}
     
     # Count POIs by category
-    categories = {}
-    for poi in pois:
-        cat = poi.get('category', 'outros')
-        categories[cat] = categories.get(cat, 0) + 1
+    categories = category_counts(pois_fingerprint)
     
     # Urban maturity factors
     factors = {
         'diversity': len(categories) * 12.5,  # Max 8 categories = 100
-        'density': min(len(pois) * 2, 100),  # Max 50 POIs = 100
+        'density': min(len(pois_fingerprint) * 2, 100),  # Max 50 POIs = 100
         'essential_services': 0,
         'premium_services': 0,
         'transport_connectivity': 0
@@ -950,12 +1058,12 @@ def calculate_urban_maturity_index(pois):
     
     # Essential services (basic urban needs)
     essential_cats = ['healthcare', 'education', 'shopping', 'services']
-    essential_present = sum([1 for cat in essential_cats if categories.get(cat, 0) > 0])
+    essential_present = sum(1 for cat in essential_cats if categories.get(cat, 0) > 0)
     factors['essential_services'] = (essential_present / len(essential_cats)) * 100
     
     # Premium services (gentrification indicators)
     premium_keywords = ['restaurant', 'entertainment', 'cafe', 'bar', 'gym']
-    premium_count = sum([categories.get(cat, 0) for cat in premium_keywords])
+    premium_count = sum(categories.get(cat, 0) for cat in premium_keywords)
     factors['premium_services'] = min(premium_count * 10, 100)
     
     # Transport connectivity
@@ -971,13 +1079,14 @@ def calculate_urban_maturity_index(pois):
         'transport_connectivity': 0.15
     }
     
-    maturity_index = sum([factors[key] * weights[key] for key in factors.keys()])
+    maturity_index = sum(factors[key] * weights[key] for key in factors.keys())
     
     return maturity_index, factors
 
-def calculate_gentrification_index(pois):
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_gentrification_index(pois_fingerprint):
     """Calculate gentrification potential based on service mix"""
-    if not pois:
+    if not pois_fingerprint:
         return 0, {}
     
     # Gentrification indicators
@@ -990,13 +1099,12 @@ def calculate_gentrification_index(pois):
     }
     
     scores = {}
-    total_pois = len(pois)
+    total_pois = len(pois_fingerprint)
+    names_cats = [(name.lower(), (cat or '').lower()) for cat, _, name, _, _ in pois_fingerprint]
     
     for category, keywords in gentrification_keywords.items():
         count = 0
-        for poi in pois:
-            poi_name = poi.get('name', '').lower()
-            poi_cat = poi.get('category', '').lower()
+        for poi_name, poi_cat in names_cats:
             if any(keyword in poi_name or keyword in poi_cat for keyword in keywords):
                 count += 1
         
@@ -1049,14 +1157,15 @@ def find_similar_neighborhoods(target_result, all_results):
     similarities.sort(key=lambda x: x[1], reverse=True)
     return similarities[:3]
 
-def predict_development_potential(pois, property_coords):
+@st.cache_data(max_entries=32, show_spinner=False)
+def predict_development_potential(pois_fingerprint, property_coords):
     """Predict future development potential"""
-    if not pois:
+    if not pois_fingerprint:
         return 0, {}
     
     # Calculate current saturation
     area_km2 = 3.14159 * (1.0 ** 2)  # 1km radius
-    poi_density = len(pois) / area_km2
+    poi_density = len(pois_fingerprint) / area_km2
     
     # Development indicators
     indicators = {
@@ -1068,8 +1177,8 @@ def predict_development_potential(pois, property_coords):
     
     # Infrastructure gaps (missing essential services)
     essential_categories = ['education', 'healthcare', 'shopping', 'transport', 'services']
-    present_categories = set([poi.get('category') for poi in pois])
-    missing_essentials = len([cat for cat in essential_categories if cat not in present_categories])
+    present_categories = {cat for cat, *_ in pois_fingerprint}
+    missing_essentials = sum(1 for cat in essential_categories if cat not in present_categories)
     indicators['infrastructure_gaps'] = max(0, 100 - (missing_essentials * 20))
     
     # Growth momentum (density vs typical urban patterns)
@@ -1081,20 +1190,20 @@ def predict_development_potential(pois, property_coords):
         indicators['growth_momentum'] = 30
     
     # Accessibility factor (transport connectivity)
-    transport_pois = [p for p in pois if p.get('category') == 'transport']
-    if transport_pois:
-        avg_transport_distance = sum([p.get('distance', 0) for p in transport_pois]) / len(transport_pois)
+    transport_distances = [distance for cat, distance, *_ in pois_fingerprint if cat == 'transport']
+    if transport_distances:
+        avg_transport_distance = sum(transport_distances) / len(transport_distances)
         indicators['accessibility_factor'] = max(0, 100 - (avg_transport_distance / 10))
     else:
         indicators['accessibility_factor'] = 20  # Low if no transport
     
     # Market potential (mix of services)
-    service_diversity = len(set([poi.get('category') for poi in pois]))
+    service_diversity = len(present_categories)
     indicators['market_potential'] = min(service_diversity * 12.5, 100)
     
     # Overall development potential
     weights = {'infrastructure_gaps': 0.3, 'growth_momentum': 0.3, 'accessibility_factor': 0.2, 'market_potential': 0.2}
-    development_potential = sum([indicators[key] * weights[key] for key in indicators.keys()])
+    development_potential = sum(indicators[key] * weights[key] for key in indicators.keys())
     
     return development_potential, indicators
 
@@ -1123,203 +1232,1489 @@ def calculate_investment_timeline(development_potential, maturity_index):
     
     return timelines
 
-def main():
-    # Sidebar for advanced options
-    with st.sidebar:
-        st.header("🎛️ Configurações Avançadas")
-        
-        # Analysis radius
-        st.subheader("📏 Raio de Análise")
-        radius_options = {
-            "1 km": 1000,
-            "2 km": 2000, 
-            "3 km": 3000
-        }
-        selected_radius = st.selectbox(
-            "Selecione o raio:",
-            options=list(radius_options.keys()),
-            index=0,
-            help="Defina o raio de análise para coleta de POIs"
-        )
-        st.session_state.analysis_radius = radius_options[selected_radius]
-        
-        # Quick Stats
-        st.subheader("📊 Estatísticas da Sessão")
-        if st.session_state.analysis_results:
-            st.metric("Análises Realizadas", len(st.session_state.analysis_results))
-            total_pois = sum([len(r.pois) for r in st.session_state.analysis_results.values() if r.success])
-            st.metric("Total de POIs Coletados", total_pois)
-        else:
-            st.info("Nenhuma análise realizada ainda")
+# POI array helpers
+WALK_SPEED_M_PER_MIN = 80  # average walking speed
+RADII = np.array([400., 800., 1200.])  # 5, 10 and 15 minutes on foot
+POI_CATEGORIES = ('outros', 'shopping', 'healthcare', 'education', 'transport',
+                  'restaurant', 'entertainment', 'services', 'park', 'food', 'leisure', 'other')
+CAT_TO_CODE = {cat: code for code, cat in enumerate(POI_CATEGORIES)}
+N_CATS = len(POI_CATEGORIES)
 
-    # Main Application Header
-    st.title("🏙️ UrbanSight Enhanced")
-    st.subheader("Plataforma Avançada de Inteligência Imobiliária")
+CATEGORY_NAMES = {
+    'education': '🎓 Educação',
+    'healthcare': '🏥 Saúde',
+    'shopping': '🛒 Compras',
+    'transport': '🚌 Transporte',
+    'entertainment': '🎭 Entretenimento',
+    'restaurant': '🍽️ Restaurantes',
+    'services': '🏛️ Serviços',
+    'park': '🌳 Parques'
+}
+CATEGORY_ICONS = {
+    'shopping': '🛒',
+    'healthcare': '🏥',
+    'education': '🎓',
+    'transport': '🚌',
+    'restaurant': '🍽️',
+    'entertainment': '🎭',
+    'services': '🔧',
+    'park': '🌳'
+}
+
+def build_poi_arrays(pois):
+    """Convert POI dicts to structure-of-arrays form (distances, categories, names)"""
+    n = len(pois)
+    dist = np.fromiter((p.get('distance', 0) for p in pois), dtype=np.float32, count=n)
+    cats = np.array([p.get('category', 'outros') for p in pois], dtype=object)
+    cat_codes = np.fromiter((CAT_TO_CODE.get(cat, 0) for cat in cats), dtype=np.int8, count=n)
+    names = np.array([p.get('name') or '' for p in pois], dtype=object)
+    return {
+        'dist': dist,
+        'cats': cats,
+        'cat_codes': cat_codes,
+        'names': names,
+        'names_lc': np.char.lower(names.astype(str)),
+        'band': np.digitize(dist, RADII, right=True),
+        'has_dist': np.fromiter(('distance' in p for p in pois), dtype=bool, count=n)
+    }
+
+# Neighborhood profiles: (category, points per POI) terms capped at 100 each
+PROFILE_NAMES = ('👨‍👩‍👧‍👦 Famílias com crianças', '👥 Jovens profissionais', '👴 Idosos', '🚗 Quem tem carro', '🚶 Quem anda a pé')
+PROFILE_TERM_CODES = np.array([CAT_TO_CODE[c] for c in (
+    'education', 'park', 'healthcare',            # families
+    'transport', 'restaurant', 'entertainment',   # young professionals
+    'healthcare', 'shopping', 'transport',        # elderly
+    'shopping'                                    # car owners
+)])
+PROFILE_TERM_WEIGHTS = np.array([20, 25, 15, 20, 15, 25, 30, 20, 25, 15], dtype=np.float64)
+
+def profile_scores_kernel(dist, cat_codes):
+    """Score each neighborhood profile from POI distance and category-code arrays"""
+    counts = np.bincount(cat_codes, minlength=N_CATS)
+    terms = np.minimum(counts[PROFILE_TERM_CODES] * PROFILE_TERM_WEIGHTS, 100)
     
-    # Navigation tabs
-    main_tab1, main_tab2, main_tab3, main_tab4, main_tab5, main_tab6, main_tab7, main_tab8, main_tab9, main_tab10 = st.tabs([
-        "🔍 Análise Individual", 
-        "⚖️ Comparação de Propriedades", 
-        "📊 Analytics Avançados",
-        "🗺️ Mapas Avançados",
-        "📈 Tendências & Futuro",
-        "🎯 Ferramentas Inteligentes",
-        "🛠️ Ferramentas Extras",
-        "🏠 Minha Casa Ideal",
-        "🏢 Para Imobiliárias",
-        "🏆 UrbanSight Premium"
-    ])
+    # Walkability: average per-category proximity score
+    present = counts > 0
+    sums = np.bincount(cat_codes, weights=dist, minlength=N_CATS)
+    avgs = np.where(present, sums / np.maximum(counts, 1), 0)
+    walk = np.clip(100 - avgs / 10, 0, None)
+    walkability = min(walk[present].mean(), 100) if present.any() else 0
     
-    with main_tab1:
-        st.header("🔍 Análise de Propriedades")
+    return np.array([
+        (terms[0] + terms[1] + terms[2] + 70) / 4,  # 70 = base safety score
+        terms[3:6].mean(),
+        terms[6:9].mean(),
+        (85 + terms[9]) / 2,  # 85 = assume good parking for car owners
+        walkability
+    ])
 
-        # Address Input
-        address = st.text_input(
-            "Endereço da Propriedade",
-            placeholder="Digite o endereço completo (ex: Avenida Paulista, 1000, Bela Vista, São Paulo, SP)",
-            help="💡 Quanto mais específico o endereço, melhor será a análise"
-        )
+# Essential services: (category bitmask, keywords also matched against POI names)
+def _category_mask(*categories):
+    return sum(1 << CAT_TO_CODE[c] for c in categories)
 
-        # Analysis Button
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            analyze_button = st.button(
-                "🚀 Iniciar Análise",
-                type="primary",
-                use_container_width=True
-            )
+ESSENTIALS = {
+    '🛒 Mercado/Supermercado': (_category_mask('shopping'), ('shopping', 'supermarket')),
+    '🏥 Hospital/Clínica': (_category_mask('healthcare'), ('healthcare', 'hospital', 'clinic')),
+    '💊 Farmácia': (_category_mask('healthcare'), ('pharmacy', 'healthcare')),
+    '🚌 Ponto de Ônibus': (_category_mask('transport'), ('transport', 'bus_stop')),
+    '🏦 Banco/ATM': (_category_mask('services'), ('bank', 'atm', 'services')),
+    '⛽ Posto de Gasolina': (0, ('fuel', 'gas_station')),
+    '🎓 Escola': (_category_mask('education'), ('education', 'school')),
+    '🌳 Parque/Praça': (_category_mask('park', 'leisure'), ('park', 'leisure'))
+}
 
-        # Analysis Execution
-        if analyze_button and address:
-            st.info("🤖 UrbanSight Processando - Analisando dados de localização...")
+def essential_mask(soa, essential_name):
+    """Boolean mask of the POIs that satisfy an essential service"""
+    bitmask, keywords = ESSENTIALS[essential_name]
+    by_category = ((1 << soa['cat_codes'].astype(np.int32)) & bitmask) != 0
+    by_name = np.fromiter(
+        (any(keyword in name for keyword in keywords) for name in soa['names_lc']),
+        dtype=bool, count=len(soa['names_lc'])
+    )
+    return by_category | by_name
 
-            try:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
+def pois_key(pois, missing_distance=0):
+    """Hashable fingerprint of a POI list, used as cache key"""
+    return tuple(
+        (p.get('category', 'outros'), p.get('distance', missing_distance), p.get('name') or '', p.get('lat'), p.get('lon'))
+        for p in pois
+    )
 
-                # Step 1: Data Collection
-                status_text.text("🗺️ Coletando dados do OpenStreetMap...")
-                progress_bar.progress(25)
-                time.sleep(0.5)
+@st.cache_data(show_spinner=False)
+def _group_pois(pois_tuple):
+    """Group POI distances and names by category"""
+    distances, names = {}, {}
+    for cat, distance, name, _, _ in pois_tuple:
+        distances.setdefault(cat, []).append(distance)
+        names.setdefault(cat, []).append(name)
+    return {cat: np.array(d, dtype=np.float32) for cat, d in distances.items()}, names
 
-                # Run analysis
-                result = asyncio.run(orchestrator.analyze_property(address))
+@st.cache_data(show_spinner=False)
+def category_band_counts(pois_fingerprint):
+    """(category x walking band) matrix of POIs within 5, 10 and 15 minutes (cumulative)"""
+    n = len(pois_fingerprint)
+    dist = np.fromiter((poi[1] for poi in pois_fingerprint), dtype=np.float32, count=n)
+    cat_codes = np.fromiter((CAT_TO_CODE.get(poi[0], 0) for poi in pois_fingerprint), dtype=np.int64, count=n)
+    
+    # band 0..2 is the first range a POI falls in, band 3 is beyond 15 min
+    bands = np.digitize(dist, RADII, right=True)
+    counts = np.bincount(cat_codes * 4 + bands, minlength=N_CATS * 4).reshape(N_CATS, 4)
+    return counts.cumsum(axis=1)[:, :3]
 
-                # Step 2: Processing
-                status_text.text("🏘️ Analisando características da vizinhança...")
-                progress_bar.progress(50)
-                time.sleep(0.5)
+def _pois_to_arrays(pois_fingerprint):
+    """Columnar view of a POI fingerprint: category codes, distances and category labels"""
+    # factorize gives missing values the -1 sentinel, so name them before coding
+    codes, labels = pd.factorize(pd.Series([poi[0] or 'outros' for poi in pois_fingerprint], dtype=object))
+    distances = np.fromiter((poi[1] for poi in pois_fingerprint), dtype=np.float32, count=len(pois_fingerprint))
+    return codes, distances, list(labels)
 
-                # Step 3: Metrics
-                status_text.text("📊 Calculando métricas avançadas...")
-                progress_bar.progress(75)
-                time.sleep(0.5)
+def category_stats(pois_fingerprint):
+    """Per-category POI count, mean distance and minimum distance"""
+    codes, distances, labels = _pois_to_arrays(pois_fingerprint)
+    if not labels:
+        return {}
+    
+    n_labels = len(labels)
+    counts = np.bincount(codes, minlength=n_labels)
+    sums = np.bincount(codes, weights=distances, minlength=n_labels)
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(n_labels))
+    mins = np.minimum.reduceat(distances[order], starts)
+    return {
+        label: {'count': int(count), 'avg': float(total / count), 'min': float(low)}
+        for label, count, total, low in zip(labels, counts, sums, mins)
+    }
 
-                # Step 4: AI Insights
-                status_text.text("🧠 Gerando insights com IA...")
-                progress_bar.progress(100)
-                time.sleep(0.5)
+@st.cache_data(max_entries=64, show_spinner=False)
+def category_counts(pois_fingerprint):
+    """Number of POIs per category"""
+    return Counter(cat for cat, *_ in pois_fingerprint)
 
-                # Store result
-                st.session_state.analysis_results[address] = result
-                st.session_state.current_analysis = result
+def store_analysis(address, result):
+    """Save an analysis result and bump the session's analysis version"""
+    st.session_state.analysis_results[address] = result
+    st.session_state._analysis_version += 1
+    if result.success:
+        st.session_state.analysis_done = True
+        get_premium_cache(result)
 
-                # Clear progress
-                progress_bar.empty()
-                status_text.empty()
+def portfolio_avg_score():
+    """Mean simple walk score over all analyzed addresses, recomputed only when results change"""
+    version = st.session_state._analysis_version
+    cached = st.session_state.get('_portfolio_avg_score')
+    if cached is None or cached[0] != version:
+        cached = (version, fmean(len(r.pois) * 3 for r in st.session_state.analysis_results.values()))
+        st.session_state['_portfolio_avg_score'] = cached
+    return cached[1]
 
-                if result.success:
-                    st.success("✅ Análise concluída com sucesso!")
-                    st.balloons()
-                else:
-                    st.error(f"❌ Falha na análise: {result.error_message}")
+def get_poi_arrays(result):
+    """Return the POI arrays of an analysis, building them once per session"""
+    cache = st.session_state.setdefault('poi_arrays', {})
+    if result.analysis_id not in cache:
+        cache[result.analysis_id] = build_poi_arrays(result.pois)
+    return cache[result.analysis_id]
 
-            except Exception as e:
-                st.error(f"❌ Erro inesperado: {str(e)}")
+def get_premium_cache(result):
+    """Maturity, gentrification and development indices of an analysis, computed once per result"""
+    if not hasattr(result, 'premium_cache'):
+        poi_fp = pois_key(result.pois)
+        result.premium_cache = {
+            'maturity': calculate_urban_maturity_index(poi_fp),
+            'gentrification': calculate_gentrification_index(poi_fp),
+            'potential': predict_development_potential(poi_fp, (result.property_data.lat, result.property_data.lon)),
+        }
+    return result.premium_cache
 
-        elif analyze_button and not address:
-            st.warning("⚠️ Por favor, digite um endereço válido")
+# Broker & Buyer Analysis Functions
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_personalized_score(pois_fingerprint, has_children=False, uses_public_transport=False,
+                                 likes_nightlife=False, exercises_regularly=False,
+                                 elderly_care=False, frequent_shopping=False):
+    """Score the location against the user's lifestyle profile"""
+    weights = {
+        'education': 0.1,
+        'healthcare': 0.15,
+        'shopping': 0.15,
+        'transport': 0.15,
+        'entertainment': 0.1,
+        'restaurant': 0.1,
+        'services': 0.1,
+        'park': 0.15
+    }
+    
+    # Adjust weights based on profile
+    if has_children:
+        weights['education'] = 0.25
+        weights['park'] = 0.2
+        weights['healthcare'] = 0.2
+    
+    if uses_public_transport:
+        weights['transport'] = 0.3
+    
+    if likes_nightlife:
+        weights['entertainment'] = 0.2
+        weights['restaurant'] = 0.15
+    
+    if exercises_regularly:
+        weights['park'] = 0.25
+    
+    if elderly_care:
+        weights['healthcare'] = 0.3
+    
+    if frequent_shopping:
+        weights['shopping'] = 0.25
+    
+    # Calculate score based on POI counts and distances
+    dist_by_cat, _ = _group_pois(pois_fingerprint)
+    category_scores = {}
+    for category in weights.keys():
+        category_pois = dist_by_cat.get(category)
+        if category_pois is not None:
+            avg_distance = float(category_pois.mean())
+            count_score = min(category_pois.size * 20, 100)  # Max 100 for 5+ POIs
+            distance_score = max(0, 100 - (avg_distance / 10))  # Max 100 for 0m, 0 for 1000m+
+            category_scores[category] = (count_score + distance_score) / 2
+        else:
+            category_scores[category] = 0
+    
+    total_score = sum(category_scores[cat] * weights[cat] for cat in weights.keys())
+    return total_score, category_scores, weights
 
-        # Results Display
-        if st.session_state.current_analysis:
-            result = st.session_state.current_analysis
+def get_walking_time(distance):
+    """Convert a distance in meters to minutes on foot"""
+    return distance / WALK_SPEED_M_PER_MIN
 
-            if result.success:
-                st.write("---")
+def calculate_profile_scores(dist, cat_codes):
+    """Score how well the neighborhood suits each resident profile"""
+    return dict(zip(PROFILE_NAMES, profile_scores_kernel(dist, cat_codes).tolist()))
 
-                # Analysis Header
-                st.header("📋 Relatório de Análise")
-                st.subheader(f"📍 {result.property_data.address}")
-                st.caption(f"Analisado em {datetime.now().strftime('%d de %B de %Y às %H:%M')}")
+SCORE_CARD_TMPL = """
+<div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; color: white;">
+    <h1 style="margin: 0; font-size: 3rem;">{emoji}</h1>
+    <h2 style="margin: 0;">{score:.1f}/100</h2>
+    <p style="margin: 0; font-size: 1.2rem;">Compatibilidade com seu perfil</p>
+</div>
+"""
+MARKDOWN_EMPHASIS_RE = re.compile(r'[*]+')
+CHECKLIST_MIN_COUNT = {'🍽️ Opções gastronômicas': 2}  # items needing more than one matching POI
 
-                # Key Metrics Row
-                st.subheader("🎯 Métricas Principais de Desempenho")
+@st.cache_data(max_entries=32, show_spinner=False)
+def generate_automatic_pitch(pois_fingerprint):
+    """Build the broker pitch highlights and a simple walk score"""
+    dist_by_cat, _ = _group_pois(pois_fingerprint)
+    band_counts = category_band_counts(pois_fingerprint)
+    empty = np.empty(0, dtype=np.float32)
+    total_pois = len(pois_fingerprint)
+    
+    # Generate pitch components
+    pitch_parts = []
+    
+    # Shopping analysis
+    shopping_pois = dist_by_cat.get('shopping', empty)
+    if shopping_pois.size:
+        shopping_5min = int(band_counts[CAT_TO_CODE['shopping'], 0])
+        shopping_10min = int(band_counts[CAT_TO_CODE['shopping'], 1])
+        if shopping_5min >= 3:
+            pitch_parts.append(f"🛒 **{shopping_5min} mercados em apenas 5 minutos a pé**")
+        elif shopping_10min >= 2:
+            pitch_parts.append(f"🛒 **{shopping_10min} opções de compras em 10 minutos a pé**")
+    
+    # Education analysis
+    education_pois = dist_by_cat.get('education', empty)
+    if education_pois.size:
+        closest_school = float(education_pois.min())
+        school_count = education_pois.size
+        if closest_school <= 500:
+            pitch_parts.append(f"🎓 **Escola a apenas {closest_school:.0f}m - ideal para famílias**")
+        elif school_count >= 2:
+            pitch_parts.append(f"🎓 **{school_count} escolas na região**")
+    
+    # Healthcare analysis
+    healthcare_pois = dist_by_cat.get('healthcare', empty)
+    if healthcare_pois.size:
+        closest_health = float(healthcare_pois.min())
+        if closest_health <= 800:
+            pitch_parts.append(f"🏥 **Serviços de saúde a {closest_health:.0f}m**")
+    
+    # Transport analysis
+    transport_pois = dist_by_cat.get('transport', empty)
+    if transport_pois.size:
+        transport_5min = int(band_counts[CAT_TO_CODE['transport'], 0])
+        if transport_5min >= 2:
+            pitch_parts.append(f"🚌 **{transport_5min} opções de transporte em 5 minutos**")
+    
+    # Restaurant/Entertainment
+    social_count = dist_by_cat.get('restaurant', empty).size + dist_by_cat.get('entertainment', empty).size
+    if social_count >= 5:
+        pitch_parts.append(f"🍽️ **Rica vida social com {social_count} restaurantes e entretenimento**")
+    
+    # Calculate Walk Score
+    walk_score = min(total_pois * 3, 100)  # Simple calculation
+    
+    return pitch_parts, walk_score
 
-                col1, col2, col3, col4, col5 = st.columns(5)
+@st.cache_data(max_entries=32, show_spinner=False)
+def analyze_pros_cons(pois_fingerprint):
+    """List the location's pros and cons from category counts per walking band"""
+    pros = []
+    cons = []
+    
+    # Count POIs by category within different ranges (5, 10 and 15 min)
+    band_counts = category_band_counts(pois_fingerprint)
+    categories_5min, categories_10min, categories_15min = (
+        dict(zip(POI_CATEGORIES, band_counts[:, band].tolist())) for band in range(3)
+    )
+    
+    # Analyze pros
+    if categories_5min.get('shopping', 0) >= 3:
+        pros.append("🛒 Muitos mercados/lojas em 5 min a pé")
+    elif categories_10min.get('shopping', 0) >= 2:
+        pros.append("🛒 Boa oferta de compras em 10 min a pé")
+    
+    if categories_10min.get('education', 0) >= 2:
+        pros.append("🎓 Várias opções de educação próximas")
+    
+    if categories_5min.get('healthcare', 0) >= 1:
+        pros.append("🏥 Acesso rápido a serviços de saúde")
+    
+    if categories_10min.get('transport', 0) >= 3:
+        pros.append("🚌 Excelente conectividade de transporte")
+    elif categories_5min.get('transport', 0) >= 1:
+        pros.append("🚌 Transporte público acessível")
+    
+    if categories_10min.get('restaurant', 0) >= 5:
+        pros.append("🍽️ Rica oferta gastronômica")
+    
+    if categories_15min.get('park', 0) >= 2:
+        pros.append("🌳 Boas opções de lazer e exercícios")
+    
+    if categories_10min.get('entertainment', 0) >= 2:
+        pros.append("🎭 Vida cultural e entretenimento ativa")
+    
+    # Analyze cons
+    if categories_15min.get('shopping', 0) < 1:
+        cons.append("🛒 Falta de opções de compras próximas")
+    
+    if categories_15min.get('healthcare', 0) < 1:
+        cons.append("🏥 Serviços de saúde distantes")
+    
+    if categories_10min.get('transport', 0) < 1:
+        cons.append("🚌 Transporte público limitado")
+    
+    if categories_15min.get('education', 0) < 1:
+        cons.append("🎓 Poucas opções educacionais")
+    
+    if categories_15min.get('restaurant', 0) < 2:
+        cons.append("🍽️ Opções gastronômicas limitadas")
+    
+    if categories_15min.get('park', 0) < 1:
+        cons.append("🌳 Falta de espaços verdes e lazer")
+    
+    if categories_15min.get('entertainment', 0) < 1:
+        cons.append("🎭 Vida noturna/cultural limitada")
+    
+    return pros, cons
 
-                with col1:
-                    st.metric(
-                        "Pontuação Geral",
-                        f"{result.metrics.total_score:.1f}",
-                        help="Pontuação geral da propriedade"
-                    )
+SALES_CATEGORY_NAMES = {
+    'shopping': '🛒 Compras e Mercados',
+    'education': '🎓 Educação',
+    'healthcare': '🏥 Saúde',
+    'transport': '🚌 Transporte',
+    'restaurant': '🍽️ Gastronomia',
+    'entertainment': '🎭 Entretenimento',
+    'services': '🔧 Serviços',
+    'park': '🌳 Lazer e Parques'
+}
+SALES_CLOSING_POINTS = {
+    'shopping': "Compras do dia a dia resolvidas a pé",
+    'education': "Várias opções educacionais para os filhos",
+    'transport': "Mobilidade urbana facilitada"
+}
 
-                with col2:
-                    st.metric(
-                        "Walk Score",
-                        f"{result.metrics.walk_score.overall_score:.1f}",
-                        help="Classificação de caminhabilidade"
-                    )
+@st.cache_data(max_entries=32, show_spinner=False)
+def generate_sales_arguments(pois_fingerprint):
+    """Derive strengths, closing arguments and convenience factors from nearby POIs"""
+    strengths = []
+    selling_points = []
+    convenience_factors = []
+    
+    # Analyze each category
+    for category, data in category_stats(pois_fingerprint).items():
+        count = data['count']
+        avg_distance = data['avg']
+        min_distance = data['min']
+        
+        name = SALES_CATEGORY_NAMES.get(category, category.title())
+        
+        # Generate specific arguments
+        if count >= 3 and avg_distance <= 600:
+            strengths.append(f"{name}: {count} opções próximas (média {avg_distance:.0f}m)")
+            if category in SALES_CLOSING_POINTS:
+                selling_points.append(SALES_CLOSING_POINTS[category])
+        
+        if min_distance <= 300:
+            convenience_factors.append(f"{name}: {min_distance:.0f}m do mais próximo")
+    
+    return strengths, selling_points, convenience_factors
 
-                with col3:
-                    st.metric(
-                        "Transporte",
-                        f"{result.metrics.accessibility_score:.1f}",
-                        help="Acesso ao transporte público"
-                    )
+# Per-category weights of the component-averaged buyer profiles; each
+# component is capped at 100 before the profile average is taken
+BUYER_PROFILE_CATS = ('education', 'park', 'healthcare', 'transport', 'restaurant', 'entertainment', 'services', 'shopping')
+BUYER_PROFILE_NAMES = ('👨‍👩‍👧‍👦 Famílias com crianças', '👥 Jovens profissionais', '👴 Idosos')
+BUYER_PROFILE_WEIGHTS = np.array([
+    [25, 30, 20, 0, 0, 0, 0, 0],      # Family with children
+    [0, 0, 0, 25, 15, 30, 20, 0],     # Young professionals
+    [0, 0, 40, 35, 0, 0, 0, 25],      # Elderly
+], dtype=np.float64)
+BUYER_PROFILE_BASE = np.array([70, 0, 0], dtype=np.float64)  # Assume reasonable safety for families
+BUYER_PROFILE_TERMS = np.array([4, 4, 3], dtype=np.float64)
+# (profile row, category, reason) shown when that component scores above 50
+BUYER_PROFILE_REASONS = (
+    (0, 'education', "Boas opções educacionais"),
+    (0, 'park', "Áreas de lazer para crianças"),
+    (1, 'transport', "Excelente mobilidade urbana"),
+    (1, 'entertainment', "Vida noturna ativa"),
+    (2, 'healthcare', "Fácil acesso a serviços de saúde"),
+    (2, 'shopping', "Compras próximas"),
+)
 
-                with col4:
-                    st.metric(
-                        "Conveniência",
-                        f"{result.metrics.convenience_score:.1f}",
-                        help="Serviços próximos"
-                    )
+@st.cache_data(max_entries=32, show_spinner=False)
+def analyze_buyer_profile(pois_fingerprint):
+    """Score how well the location suits each buyer profile"""
+    # Analyze POI composition to determine ideal buyer
+    categories = Counter(cat for cat, *_ in pois_fingerprint)
+    
+    # Calculate suitability scores for different profiles
+    counts = np.array([categories.get(cat, 0) for cat in BUYER_PROFILE_CATS], dtype=np.float64)
+    capped = np.minimum(BUYER_PROFILE_WEIGHTS * counts, 100)
+    scores = (capped.sum(axis=1) + BUYER_PROFILE_BASE) / BUYER_PROFILE_TERMS
+    profiles = {
+        name: {'score': float(score), 'reasons': []}
+        for name, score in zip(BUYER_PROFILE_NAMES, scores)
+    }
+    for row, cat, reason in BUYER_PROFILE_REASONS:
+        if capped[row, BUYER_PROFILE_CATS.index(cat)] > 50:
+            profiles[BUYER_PROFILE_NAMES[row]]['reasons'].append(reason)
+    
+    # Investors
+    total_pois = sum(categories.values())
+    density_score = min(total_pois * 4, 100)
+    diversity_score = len(categories) * 12.5  # 8 categories max = 100
+    profiles['💼 Investidores'] = {
+        'score': (density_score + diversity_score) / 2,
+        'reasons': []
+    }
+    if total_pois > 15: profiles['💼 Investidores']['reasons'].append("Alta densidade urbana")
+    if len(categories) >= 6: profiles['💼 Investidores']['reasons'].append("Diversidade de serviços")
+    
+    # Car-free lifestyle
+    walking_score = min(sum(categories.get(cat, 0) for cat in ('shopping', 'healthcare', 'services')) * 20, 100)
+    profiles['🚶 Estilo de vida sem carro'] = {
+        'score': walking_score,
+        'reasons': []
+    }
+    if categories.get('shopping', 0) >= 2: profiles['🚶 Estilo de vida sem carro']['reasons'].append("Compras essenciais a pé")
+    if categories.get('transport', 0) >= 2: profiles['🚶 Estilo de vida sem carro']['reasons'].append("Boa rede de transporte público")
+    
+    return profiles
 
-                with col5:
-                    st.metric(
-                        "Estilo de Vida",
-                        f"{result.metrics.quality_of_life_score:.1f}",
-                        help="Pontuação de qualidade de vida"
-                    )
+# Express checklist: (label, category, maximum distance of the closest POI in meters)
+EXPRESS_CHECKLIST = (
+    ('🛒 Mercado próximo', 'shopping', 800),
+    ('🏥 Saúde acessível', 'healthcare', 1200),
+    ('🚌 Transporte próximo', 'transport', 400),
+    ('🎓 Escola na região', 'education', math.inf),
+    ('🌳 Área de lazer', 'park', math.inf)
+)
 
-                # Enhanced Tabbed Content
-                tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-                    "📋 Resumo Executivo",
-                    "🗺️ Mapas Interativos", 
-                    "📊 Análise Detalhada",
-                    "🎯 Acessibilidade",
-                    "📈 Densidade & Distribuição",
-                    "🧠 Insights de IA"
-                ])
+MARKETING_TIPS = {
+    '👨‍👩‍👧‍👦 Famílias com crianças': (
+        "Destaque proximidade de escolas nos anúncios",
+        "Mencione segurança e áreas de lazer",
+        "Foque em imóveis com 2+ quartos"
+    ),
+    '👥 Jovens profissionais': (
+        "Enfatize vida noturna e entretenimento",
+        "Destaque facilidade de transporte",
+        "Mencione proximidade do trabalho/universidades"
+    ),
+    '👴 Idosos': (
+        "Priorize acesso à saúde",
+        "Destaque facilidade de locomoção",
+        "Mencione segurança da região"
+    ),
+    '💼 Investidores': (
+        "Apresente dados de valorização",
+        "Destaque potencial de aluguel",
+        "Mencione desenvolvimento da região"
+    ),
+    '🚶 Estilo de vida sem carro': (
+        "Destaque Walk Score alto",
+        "Mencione economia com transporte",
+        "Foque em sustentabilidade"
+    )
+}
 
-                with tab1:
-                    st.subheader("📄 Resumo Executivo")
+def _render_profile_card(profile_name, data):
+    """Recommendation level, reasons and marketing tips of one buyer profile"""
+    score = data['score']
+    reasons = data['reasons']
+    
+    # Create recommendation level
+    if score >= 70:
+        level = "🏆 ALTAMENTE RECOMENDADO"
+    elif score >= 50:
+        level = "✅ RECOMENDADO"
+    else:
+        level = "📍 ADEQUADO"
+    
+    st.markdown(f"**{level}**")
+    
+    if reasons:
+        st.markdown("**Por que é ideal:**")
+        st.markdown("\n".join(f"- {reason}" for reason in reasons))
+    
+    # Marketing suggestions
+    st.markdown("**💡 Sugestões de Marketing:**")
+    tips = MARKETING_TIPS.get(profile_name)
+    if tips:
+        st.markdown("\n".join(f"- {tip}" for tip in tips))
 
-                    st.info(f"**🎯 Avaliação Geral:** {result.insights.executive_summary}")
+WHATSAPP_FMT = """🏠 *Análise Técnica do Imóvel*
 
-                    col1, col2 = st.columns(2)
+📍 Localização com {total_pois} pontos de interesse próximos
+🚶‍♂️ Walk Score: {walk_score}/100
 
-                    with col1:
-                        st.write("### ✅ Principais Pontos Fortes")
-                        for i, strength in enumerate(result.insights.strengths[:5], 1):
-                            st.success(f"**{i}.** {strength}")
+✅ *Destaques da região:*
+• Infraestrutura consolidada
+• Boa caminhabilidade
+• Serviços diversificados
 
-                    with col2:
-                        st.write("### ⚠️ Áreas de Preocupação") 
-                        for i, concern in enumerate(result.insights.concerns[:5], 1):
-                            st.warning(f"**{i}.** {concern}")
+💡 Gostaria de agendar uma visita para conhecer pessoalmente?
 
-                    st.info(f"**👥 Perfil Ideal do Morador:** {result.insights.ideal_resident_profile}")
+_Análise realizada com UrbanSight - Inteligência Imobiliária_"""
+
+EMAIL_FMT = """Assunto: Análise Técnica - Imóvel de Interesse
+
+Olá!
+
+Realizei uma análise técnica detalhada da localização do imóvel que você demonstrou interesse.
+
+📊 RESUMO DA ANÁLISE:
+• {total_pois} pontos de interesse identificados
+• Walk Score: {walk_score}/100
+• Infraestrutura consolidada na região
+
+A localização oferece excelente conveniência para o dia a dia, com fácil acesso a comércios, serviços e transporte.
+
+Gostaria de agendar uma apresentação detalhada?
+
+Atenciosamente,
+[Seu Nome]
+[Sua Imobiliária]
+
+---
+Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
+
+@st.cache_data(show_spinner=False)
+def build_templates(total_pois, walk_score):
+    """WhatsApp and email follow-up texts for a location"""
+    return (
+        WHATSAPP_FMT.format(total_pois=total_pois, walk_score=walk_score),
+        EMAIL_FMT.format(total_pois=total_pois, walk_score=walk_score)
+    )
+
+@lru_cache(maxsize=2048)
+def _share_id(address):
+    """Short opaque id used in the shareable report URL"""
+    import hashlib
+    return hashlib.md5(address.encode()).hexdigest()[:8]
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _qr_png(url):
+    """PNG bytes of the QR code for a share URL"""
+    import io
+    buffer = io.BytesIO()
+    segno.make(url, error='l').save(buffer, kind='png', scale=4)
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _quick_comparison(addr1, addr2, pois1_key, pois2_key):
+    """Side-by-side POI counts and Walk Score of two analyzed addresses"""
+    def column(fingerprint):
+        counts = category_counts(fingerprint)
+        return [
+            len(fingerprint),
+            counts.get('shopping', 0),
+            counts.get('education', 0),
+            counts.get('transport', 0),
+            counts.get('healthcare', 0),
+            f"{min(len(fingerprint) * 3, 100):.0f}/100"
+        ]
+    
+    return pd.DataFrame({
+        'Métrica': ['Total POIs', 'Mercados', 'Escolas', 'Transporte', 'Saúde', 'Walk Score'],
+        addr1: column(pois1_key),
+        addr2: column(pois2_key)
+    })
+
+def _summarize(address, analysis_result):
+    """Portfolio ranking row for one analyzed address"""
+    total_pois = len(analysis_result.pois)
+    walk_score = min(total_pois * 3, 100)
+    
+    # Calculate category strengths
+    categories = {
+        cat: data['count']
+        for cat, data in category_stats(pois_key(analysis_result.pois)).items()
+    }
+    
+    # Determine best profile
+    education_score = categories.get('education', 0) * 25
+    transport_score = categories.get('transport', 0) * 25
+    entertainment_score = categories.get('entertainment', 0) * 30
+    
+    if education_score >= transport_score and education_score >= entertainment_score:
+        best_for = "Famílias"
+    elif transport_score >= entertainment_score:
+        best_for = "Profissionais"
+    else:
+        best_for = "Jovens"
+    
+    return {
+        'Endereço': address,
+        'Walk Score': walk_score,
+        'Total POIs': total_pois,
+        'Ideal para': best_for,
+        'Mercados': categories.get('shopping', 0),
+        'Escolas': categories.get('education', 0),
+        'Transporte': categories.get('transport', 0),
+        'Saúde': categories.get('healthcare', 0)
+    }
+
+# Premium Analysis Functions
+# Name keyword families used by the premium scores
+KEYWORD_FAMILIES = {
+    'quality': ('premium', 'gourmet', 'boutique', 'design', 'luxury', 'fine'),
+    'innovation': ('tech', 'coworking', 'startup', 'innovation', 'digital'),
+    'cultural': ('museum', 'theater', 'art'),
+    'tech': ('tech', 'digital', 'coworking', 'startup'),
+    'gastronomic': ('coffee', 'bakery', 'bistro'),
+    'green': ('park', 'garden', 'green'),
+    'exclusive': ('luxury', 'premium', 'exclusive', 'boutique', 'gourmet', 'fine', 'private'),
+    # Future, Mobility, Resilience and Social tabs
+    'bike': ('bike',),
+    'innovation_hub': ('tech', 'coworking', 'startup', 'innovation', 'digital', 'hub'),
+    'adaptability': ('coworking', 'digital', 'tech', 'innovation', 'startup', 'flex'),
+    'heritage': ('museum', 'art', 'theater', 'cultural', 'heritage', 'history')
+}
+ALL_KEYWORDS = tuple(dict.fromkeys(kw for keywords in KEYWORD_FAMILIES.values() for kw in keywords))
+KEYWORD_INDEX = {kw: i for i, kw in enumerate(ALL_KEYWORDS)}
+FAMILY_COLUMNS = {
+    family: np.array([KEYWORD_INDEX[kw] for kw in keywords])
+    for family, keywords in KEYWORD_FAMILIES.items()
+}
+# Zero-width lookahead so overlapping keywords are all reported in one scan
+KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, sorted(ALL_KEYWORDS, key=len, reverse=True))) + '))')
+
+# Rare POI categories (substring match) for the rarity index
+RARE_CATEGORY_RE = re.compile('|'.join(map(re.escape, ['art_gallery', 'museum', 'theater', 'observatory', 'monument'])))
+
+# Categories counted as leisure destinations by the Time Savings calculator
+LEISURE_CATS = np.array(['entertainment', 'restaurant', 'park'], dtype=object)
+
+# Column accessors for pois_key() fingerprint tuples
+fp_category, fp_distance, fp_name = itemgetter(0), itemgetter(1), itemgetter(2)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def poi_names_lc(pois_fingerprint):
+    """Lowercased POI names, computed once per fingerprint"""
+    return [name.lower() for name in map(fp_name, pois_fingerprint)]
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def keyword_hits(pois_fingerprint):
+    """(POI x keyword) matrix of which keywords appear in each lowercased POI name"""
+    hits = np.zeros((len(pois_fingerprint), len(ALL_KEYWORDS)), dtype=bool)
+    for i, name_lc in enumerate(poi_names_lc(pois_fingerprint)):
+        for kw in KEYWORD_RE.findall(name_lc):
+            hits[i, KEYWORD_INDEX[kw]] = True
+    return hits
+
+# UrbanScore Elite components and their weights, in the same order
+ELITE_KEYS = ('diversity', 'density', 'quality', 'accessibility', 'innovation', 'cultural')
+ELITE_WEIGHTS = np.array([0.20, 0.15, 0.25, 0.15, 0.15, 0.10], dtype=np.float64)
+ELITE_FACTOR_NAMES = {
+    'diversity': '🏷️ Diversidade',
+    'density': '📍 Densidade',
+    'quality': '✨ Qualidade Premium',
+    'accessibility': '🚶 Acessibilidade Elite',
+    'innovation': '🚀 Índice de Inovação',
+    'cultural': '🎭 Riqueza Cultural'
+}
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_urban_score_elite(pois_fingerprint):
+    """Proprietary elite score combining diversity, density, quality, accessibility, innovation and culture"""
+    # Columnar view of the POIs, built once
+    cats = np.array(list(map(fp_category, pois_fingerprint)), dtype=object)
+    hits = keyword_hits(pois_fingerprint)
+    dists = np.fromiter(map(fp_distance, pois_fingerprint), dtype=np.float32, count=len(pois_fingerprint))
+    
+    # Base scores
+    diversity_score = np.unique(cats).size * 10
+    density_score = min(len(pois_fingerprint) * 2, 100)
+    
+    # Quality indicators
+    quality_count = np.count_nonzero(hits[:, FAMILY_COLUMNS['quality']])
+    quality_score = min(quality_count * 15, 100)
+    
+    # Accessibility premium
+    close_pois = np.count_nonzero(dists <= 300)
+    accessibility_premium = min(close_pois * 5, 100)
+    
+    # Innovation index
+    innovation_count = np.count_nonzero(hits[:, FAMILY_COLUMNS['innovation']])
+    innovation_score = min(innovation_count * 20, 100)
+    
+    # Cultural richness
+    cultural_categories = ['entertainment', 'art', 'museum', 'theater']
+    cultural_count = np.count_nonzero(np.isin(cats, cultural_categories))
+    cultural_score = min(cultural_count * 12, 100)
+    
+    # Calculate elite score
+    scores = np.array([diversity_score, density_score, quality_score,
+                       accessibility_premium, innovation_score, cultural_score], dtype=np.float64)
+    elite_score = float(scores @ ELITE_WEIGHTS)
+    
+    return elite_score, dict(zip(ELITE_KEYS, scores.tolist()))
+
+# DNA genes in kernel column order, with the caption shown for dominant genes
+DNA_KEYS = ('Urbano', 'Residencial', 'Comercial', 'Cultural', 'Tecnológico', 'Gastronômico', 'Educacional', 'Verde')
+DNA_GENE_DESCRIPTIONS = (
+    "Localização com forte infraestrutura urbana e conectividade",
+    "Área ideal para moradia familiar com serviços essenciais",
+    "Centro de atividade comercial e empresarial",
+    "Rica vida cultural e entretenimento",
+    "Hub de inovação e tecnologia",
+    "Paraíso gastronômico com diversas opções",
+    "Foco em educação e desenvolvimento acadêmico",
+    "Abundante em áreas verdes e natureza urbana"
+)
+
+# Points each matching POI adds to a DNA gene, in gene order
+DNA_GENE_POINTS = np.array([2, 2, 1.5, 3, 4, 2, 3, 3], dtype=np.float64)
+
+def _dna_kernel(cats, hits):
+    """Raw expression of the 8 DNA genes from category and keyword-hit arrays"""
+    family_hit = {
+        family: hits[:, FAMILY_COLUMNS[family]].any(axis=1)
+        for family in ('cultural', 'tech', 'gastronomic', 'green')
+    }
+    gene_mask = np.column_stack([
+        np.isin(cats, ['transport', 'services']),               # Urbano
+        np.isin(cats, ['shopping', 'healthcare', 'education']), # Residencial
+        np.isin(cats, ['shopping', 'services', 'restaurant']),  # Comercial
+        (cats == 'entertainment') | family_hit['cultural'],      # Cultural
+        family_hit['tech'],                                      # Tecnológico
+        (cats == 'restaurant') | family_hit['gastronomic'],      # Gastronômico
+        cats == 'education',                                     # Educacional
+        (cats == 'park') | family_hit['green']                   # Verde
+    ])
+    return gene_mask.sum(axis=0) * DNA_GENE_POINTS
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_location_dna(pois_fingerprint):
+    """Share of each urban 'gene' in the POI mix, normalized to 100 and ordered as DNA_KEYS"""
+    cats = np.array([cat.lower() for cat in map(fp_category, pois_fingerprint)], dtype=object)
+    expression = _dna_kernel(cats, keyword_hits(pois_fingerprint))
+    
+    # Normalize to 100
+    total = expression.sum()
+    if total > 0:
+        expression *= 100.0 / total
+    
+    return expression
+
+# Rarity Index factors and their weights, in the same order
+RARITY_KEYS = ('uniqueness', 'exclusivity', 'scarcity', 'premium_density')
+RARITY_WEIGHTS = np.array([0.3, 0.3, 0.2, 0.2], dtype=np.float64)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_rarity_index(pois_fingerprint):
+    """How unique and exclusive the location is, with its factor breakdown"""
+    rarity_factors = {
+        'uniqueness': 0,
+        'exclusivity': 0,
+        'scarcity': 0,
+        'premium_density': 0
+    }
+    
+    # Uniqueness - rare POI categories
+    categories = list(map(fp_category, pois_fingerprint))
+    unique_pois = sum(1 for cat in categories if RARE_CATEGORY_RE.search(cat.lower()))
+    rarity_factors['uniqueness'] = min(unique_pois * 25, 100)
+    
+    # Exclusivity - premium keywords
+    exclusive_pois = np.count_nonzero(keyword_hits(pois_fingerprint)[:, FAMILY_COLUMNS['exclusive']].any(axis=1))
+    rarity_factors['exclusivity'] = min(exclusive_pois * 20, 100)
+    
+    # Scarcity - high POI density (rare in most cities)
+    total_pois = len(pois_fingerprint)
+    if total_pois > 150:
+        rarity_factors['scarcity'] = 100
+    elif total_pois > 100:
+        rarity_factors['scarcity'] = 75
+    elif total_pois > 50:
+        rarity_factors['scarcity'] = 50
+    else:
+        rarity_factors['scarcity'] = 25
+    
+    # Premium density - concentration of high-end services
+    high_end_categories = ['restaurant', 'entertainment', 'services']
+    premium_density = sum(cat in high_end_categories for cat in categories) / len(pois_fingerprint) * 100
+    rarity_factors['premium_density'] = min(premium_density * 2, 100)
+    
+    # Overall rarity index
+    overall_rarity = float(np.array([rarity_factors[factor] for factor in RARITY_KEYS]) @ RARITY_WEIGHTS)
+    
+    return overall_rarity, rarity_factors
+
+# Viridis sampled at 11 expression bins (0-10%, ..., 100%) for the DNA bars
+DNA_BIN_COLORS = sample_colorscale('Viridis', [i / 10 for i in range(11)])
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def dna_bar_figure(dna_items):
+    """Bar chart of DNA gene expression, from (gene, expression) pairs sorted descending"""
+    genes, expression = zip(*dna_items)
+    fig = go.Figure(go.Bar(
+        x=genes,
+        y=expression,
+        marker_color=[DNA_BIN_COLORS[int(e // 10)] for e in expression]
+    ))
+    fig.update_layout(
+        title="DNA Urbano - Expressão Genética por Característica",
+        xaxis_title='Gene',
+        yaxis_title='Expressão'
+    )
+    return fig
+
+ELITE_CARD = """
+<div style="text-align: center; padding: 30px; background: {color}20; 
+           border-radius: 20px; border: 3px solid {color};">
+    <h1 style="margin: 0; color: {color}; font-size: 4rem;">{score:.0f}</h1>
+    <h3 style="margin: 10px 0 0 0; color: {color};">UrbanScore Elite</h3>
+    <p style="margin: 5px 0 0 0; opacity: 0.8;">
+        {level}
+    </p>
+</div>
+"""
+
+LIFESTYLE_CARD = """
+<div style="text-align: center; padding: 20px; background: {color}20; 
+           border-radius: 15px; border: 2px solid {color};">
+    <h2 style="margin: 0; color: {color};">{score:.0f}/100</h2>
+    <p style="margin: 5px 0 0 0; color: {color};">
+        {level}
+    </p>
+</div>
+"""
+
+RARITY_CARD = """
+<div style="text-align: center; padding: 25px; background: {color}20; 
+           border-radius: 20px; border: 3px solid {color};">
+    <h1 style="margin: 0; color: {color}; font-size: 3rem;">{score:.0f}</h1>
+    <h3 style="margin: 10px 0; color: {color};">{level}</h3>
+    <p style="margin: 0; opacity: 0.8;">{desc}</p>
+</div>
+"""
+
+# Score tiers from the highest down: (minimum score, color, label[, description])
+ELITE_TIERS = (
+    (80, "#4CAF50", '🏆 EXCEPCIONAL'),
+    (60, "#FF9800", '⭐ PREMIUM'),
+    (0, "#F44336", '📍 PADRÃO')
+)
+LIFESTYLE_TIERS = (
+    (75, "#4CAF50", '🎯 LIFESTYLE PERFEITO'),
+    (50, "#FF9800", '👍 BOM LIFESTYLE'),
+    (0, "#F44336", '⚠️ LIFESTYLE LIMITADO')
+)
+RARITY_TIERS = (
+    (80, "#9C27B0", "💎 ULTRA RARO", "Localização excepcional - menos de 1% das áreas urbanas"),
+    (60, "#3F51B5", "💍 RARO", "Localização especial - top 5% das áreas urbanas"),
+    (40, "#FF9800", "⭐ DIFERENCIADO", "Acima da média - top 20% das áreas urbanas"),
+    (0, "#9E9E9E", "📍 COMUM", "Padrão urbano comum")
+)
+
+def tier(score, tiers):
+    """First tier whose minimum the score reaches, falling back to the lowest"""
+    return next((t for t in tiers if score >= t[0]), tiers[-1])
+
+@st.cache_data(show_spinner=False)
+def render_elite_card(score):
+    """HTML score card for the UrbanScore Elite"""
+    _, color, level = tier(score, ELITE_TIERS)
+    return ELITE_CARD.format(color=color, score=score, level=level)
+
+@st.cache_data(show_spinner=False)
+def render_lifestyle_card(score):
+    """HTML score card for the weekly lifestyle score"""
+    _, color, level = tier(score, LIFESTYLE_TIERS)
+    return LIFESTYLE_CARD.format(color=color, score=score, level=level)
+
+@st.cache_data(show_spinner=False)
+def render_rarity_card(score):
+    """HTML score card for the Rarity Index"""
+    _, color, level, desc = tier(score, RARITY_TIERS)
+    return RARITY_CARD.format(color=color, score=score, level=level, desc=desc)
+
+# Indicator keys of each premium index, in the order the premium kernel emits them
+FUTURE_KEYS = ('infrastructure_momentum', 'demographic_trends', 'economic_growth', 'sustainability_index', 'innovation_potential')
+MOBILITY_KEYS = ('walkability_premium', 'public_transport_density', 'cycling_infrastructure', 'car_dependency', 'multimodal_connectivity')
+RESILIENCE_KEYS = ('service_redundancy', 'economic_diversity', 'infrastructure_stability', 'social_cohesion', 'adaptability_index')
+SOCIAL_KEYS = ('community_wellbeing', 'accessibility_inclusion', 'environmental_impact', 'economic_contribution', 'cultural_preservation')
+# Index weights, in the same key order
+FUTURE_W = np.array([0.25, 0.20, 0.25, 0.15, 0.15])      # infrastructure, demographics, economy, sustainability, innovation
+RESILIENCE_W = np.array([0.25, 0.20, 0.20, 0.20, 0.15])  # redundancy, economic diversity, infrastructure, cohesion, adaptability
+SOCIAL_W = np.array([0.25, 0.25, 0.20, 0.15, 0.15])      # wellbeing, inclusion, environment, economy, culture
+
+# Score tiers of the Future, Resilience and Social Impact cards: (minimum score, color, label, description)
+FUTURE_TIERS = (
+    (80, "#4CAF50", "🚀 FUTURO BRILHANTE", ""),
+    (60, "#2196F3", "📈 BOM POTENCIAL", ""),
+    (40, "#FF9800", "⚖️ ESTÁVEL", ""),
+    (0, "#F44336", "⚠️ INCERTO", "")
+)
+RESILIENCE_TIERS = (
+    (80, "#4CAF50", "🛡️ ULTRA RESILIENTE", "Extremamente resistente a mudanças e crises"),
+    (60, "#2196F3", "🏰 RESILIENTE", "Boa capacidade de adaptação"),
+    (40, "#FF9800", "⚖️ MODERADAMENTE RESILIENTE", "Resistência adequada"),
+    (0, "#F44336", "⚠️ VULNERÁVEL", "Baixa resistência a mudanças")
+)
+SOCIAL_TIERS = (
+    (80, "#4CAF50", "🌟 IMPACTO EXCEPCIONAL", "Contribuição extraordinária para o bem-estar social"),
+    (60, "#8BC34A", "🌱 IMPACTO POSITIVO", "Boa contribuição para a comunidade"),
+    (40, "#FF9800", "⚖️ IMPACTO NEUTRO", "Impacto social moderado"),
+    (0, "#F44336", "⚠️ IMPACTO LIMITADO", "Baixa contribuição social")
+)
+
+SCORE_CARD = StringTemplate("""
+<div style="text-align: center; padding: 25px; background: ${color}20; 
+           border-radius: 20px; border: 3px solid ${color};">
+    <h1 style="margin: 0; color: ${color}; font-size: 3rem;">${score}</h1>
+    <h3 style="margin: 10px 0; color: ${color};">${label}</h3>
+    <p style="margin: 0; opacity: 0.8;">${level}</p>${details}
+</div>
+""")
+SCORE_CARD_DETAILS = StringTemplate("""
+    <p style="margin: 5px 0 0 0; font-size: 0.9em; opacity: 0.7;">${desc}</p>""")
+
+@st.cache_data(show_spinner=False)
+def render_index_card(score, label, tiers):
+    """HTML score card for the Future, Resilience and Social Impact indices"""
+    _, color, level, desc = tier(score, tiers)
+    details = SCORE_CARD_DETAILS.substitute(desc=desc) if desc else ""
+    return SCORE_CARD.substitute(color=color, score=f"{score:.0f}", label=label, level=level, details=details)
+
+# SDG goals and the social metric each one tracks (None = overall social impact score)
+SDG_SPEC = (
+    ("3. Saúde e Bem-estar", 'community_wellbeing'),
+    ("4. Educação de Qualidade", 'community_wellbeing'),
+    ("8. Trabalho Decente", 'economic_contribution'),
+    ("10. Redução das Desigualdades", 'accessibility_inclusion'),
+    ("11. Cidades Sustentáveis", None),
+    ("13. Ação Climática", 'environmental_impact')
+)
+
+# Display names of the Future indicators and Resilience factors
+FUTURE_INDICATOR_NAMES = {
+    'infrastructure_momentum': '🏗️ Momentum de Infraestrutura',
+    'demographic_trends': '👥 Tendências Demográficas',
+    'economic_growth': '💼 Crescimento Econômico',
+    'sustainability_index': '🌱 Índice de Sustentabilidade',
+    'innovation_potential': '🚀 Potencial de Inovação'
+}
+RESILIENCE_FACTOR_NAMES = {
+    'service_redundancy': '🔄 Redundância de Serviços',
+    'economic_diversity': '💼 Diversidade Econômica',
+    'infrastructure_stability': '🏗️ Estabilidade da Infraestrutura',
+    'social_cohesion': '👥 Coesão Social',
+    'adaptability_index': '🔧 Índice de Adaptabilidade'
+}
+
+# Category groups used by the premium metrics
+BUSINESS_CATS = frozenset({'shopping', 'restaurant', 'services'})
+ESSENTIAL_CATS = frozenset({'shopping', 'healthcare', 'education', 'transport'})
+WALKABLE_ESSENTIAL_CATS = frozenset({'shopping', 'healthcare'})
+COMMUNITY_CATS = frozenset({'park', 'entertainment', 'restaurant', 'education'})
+WELLBEING_CATS = frozenset({'healthcare', 'education', 'park'})
+
+# Category groups counted by the premium kernel, in column order
+PREMIUM_GROUPS = (
+    frozenset({'transport'}), BUSINESS_CATS, frozenset({'park'}), WELLBEING_CATS, COMMUNITY_CATS,
+    frozenset({'entertainment'}), WALKABLE_ESSENTIAL_CATS,
+    *(frozenset({cat}) for cat in sorted(ESSENTIAL_CATS))
+)
+PREMIUM_ESSENTIAL_COLUMNS = np.arange(7, 7 + len(ESSENTIAL_CATS))
+
+def _premium_kernel(group_mask, dist, extra):
+    """Scores of the 20 premium indicators, in FUTURE/MOBILITY/RESILIENCE/SOCIAL key order"""
+    if not extra[0]:
+        return np.zeros(20)
+    
+    counts = group_mask.sum(axis=0)
+    within = np.column_stack([dist <= 300, dist <= 500, dist <= 800])
+    near = group_mask.T.astype(np.int64) @ within
+    within_500 = np.count_nonzero(within[:, 1])
+    total_pois, service_diversity, transport_types, bike, innovation, adaptability, heritage = extra
+    transport, business, park, wellbeing, community, entertainment = counts[:6]
+    redundancy = np.minimum(counts[PREMIUM_ESSENTIAL_COLUMNS] * 20, 100).mean()
+    raw = np.array([
+        # Future
+        transport / total_pois * 100 * 5,
+        service_diversity * 12.5,
+        business * 5,
+        (park + bike) * 15,
+        innovation * 25,
+        # Mobility
+        within_500 * 3,
+        near[0, 0] * 25,
+        bike * 30,
+        100 - near[6, 2] * 20,
+        transport_types * 20,
+        # Resilience
+        redundancy,
+        service_diversity * 15,
+        transport * 20,
+        community * 5,
+        adaptability * 25,
+        # Social
+        wellbeing * 8,
+        transport * 15 + within_500 * 2,
+        park * 20 + bike * 15,
+        business * 4,
+        heritage * 25 + entertainment * 10
+    ], dtype=np.float64)
+    return np.clip(raw, 0, 100)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_premium_metrics(pois_fingerprint):
+    """Future, Mobility, Resilience and Social Impact indicators with their overall scores"""
+    # Columnar view of the POIs
+    n = len(pois_fingerprint)
+    cats = list(map(fp_category, pois_fingerprint))
+    group_mask = np.array(
+        [[cat in group for group in PREMIUM_GROUPS] for cat in cats], dtype=bool
+    ).reshape(n, len(PREMIUM_GROUPS))
+    dist = np.fromiter(map(fp_distance, pois_fingerprint), dtype=np.float32, count=n)
+    
+    # (POI, keyword) matches per keyword family, from the same single regex scan as the other premium kernels
+    hits = keyword_hits(pois_fingerprint)
+    family_hits = [
+        np.count_nonzero(hits[:, FAMILY_COLUMNS[family]])
+        for family in ('bike', 'innovation_hub', 'adaptability', 'heritage')
+    ]
+    service_diversity = len(category_counts(pois_fingerprint))
+    transport_types = len({
+        name_lc for cat, name_lc in zip(cats, poi_names_lc(pois_fingerprint)) if cat == 'transport'
+    })
+    
+    scores = _premium_kernel(group_mask, dist, (n, service_diversity, transport_types, *family_hits))
+    future, mobility, resilience, social = scores.reshape(4, 5)
+    
+    return {
+        'future': (float(future @ FUTURE_W), dict(zip(FUTURE_KEYS, future.tolist()))),
+        'mobility': (float(mobility.mean()), dict(zip(MOBILITY_KEYS, mobility.tolist()))),
+        'resilience': (float(resilience @ RESILIENCE_W), dict(zip(RESILIENCE_KEYS, resilience.tolist()))),
+        'social': (float(social @ SOCIAL_W), dict(zip(SOCIAL_KEYS, social.tolist())))
+    }
+
+# Radar axes for the mobility signature, closed back on the first axis
+MOBILITY_THETA = np.array(['Caminhabilidade', 'Transporte Público', 'Ciclismo', 'Dependência Carro', 'Conectividade', 'Caminhabilidade'])
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def mobility_radar_figure(values):
+    """Closed radar chart of the five mobility metrics"""
+    r = np.asarray(values, dtype=np.float64)
+    fig = go.Figure(go.Scatterpolar(
+        r=np.concatenate([r, r[:1]]),
+        theta=MOBILITY_THETA,
+        fill='toself',
+        name='Assinatura de Mobilidade',
+        line_color='rgb(90, 200, 250)'
+    ))
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )),
+        showlegend=False,
+        title="Assinatura de Mobilidade da Localização"
+    )
+    return fig
+
+def render_score_table(label, rows):
+    """Show (name, score, status) rows as one dataframe with a progress bar per score"""
+    st.dataframe(
+        pd.DataFrame(rows, columns=[label, 'Score', 'Status']),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Score': st.column_config.ProgressColumn(
+                'Score', format="%.0f/100", min_value=0, max_value=100
+            )
+        }
+    )
+
+@st.fragment
+def _render_time_savings(soa):
+    """Time Savings calculator; its sliders rerun only this section"""
+    st.subheader("⏱️ Time Savings Calculator")
+    st.markdown("*Calcule o tempo e dinheiro economizados morando aqui*")
+    
+    # Time savings calculator
+    calc_col1, calc_col2 = st.columns(2)
+    
+    with calc_col1:
+        st.markdown("### ⚙️ Configuração do Cálculo")
+        
+        current_commute = st.slider("Tempo atual de deslocamento ao trabalho (min/dia)", 0, 180, 60)
+        work_frequency = st.slider("Dias de trabalho por semana", 1, 7, 5)
+        
+        shopping_frequency = st.slider("Vezes que vai ao mercado por semana", 1, 7, 2)
+        current_shopping_time = st.slider("Tempo atual para ir ao mercado (min)", 5, 60, 20)
+        
+        leisure_frequency = st.slider("Atividades de lazer por semana", 0, 7, 2)
+        current_leisure_time = st.slider("Tempo atual para lazer (min)", 10, 120, 30)
+        
+        hourly_value = st.number_input("Valor da sua hora (R$)", min_value=10, max_value=500, value=50)
+    
+    with calc_col2:
+        st.markdown("### 📊 Tempo Economizado Nesta Localização")
+        
+        # Calculate potential time savings
+        # One (transport, shopping, leisure) x POI mask drives every reduction below
+        dist = soa['dist']
+        masks = np.vstack([soa['cats'] == 'transport', soa['cats'] == 'shopping', np.isin(soa['cats'], LEISURE_CATS)])
+        counts = np.count_nonzero(masks, axis=1)
+        mean_dist = (masks @ dist) / np.maximum(counts, 1)
+        min_dist = np.where(masks, dist, np.inf).min(axis=1, initial=np.inf)
+        
+        # Work commute savings
+        if counts[0]:
+            new_commute_time = max(10, current_commute - (500 - float(mean_dist[0])) / 10)  # Better transport = less time
+        else:
+            new_commute_time = current_commute + 10  # Worse transport = more time
+        
+        commute_savings = (current_commute - new_commute_time) * work_frequency
+        
+        # Shopping time savings
+        if counts[1]:
+            new_shopping_time = max(5, float(min_dist[1]) / 83.33 * 2)  # Walking time * 2 (round trip)
+        else:
+            new_shopping_time = current_shopping_time
+        
+        shopping_savings = (current_shopping_time - new_shopping_time) * shopping_frequency
+        
+        # Leisure time savings
+        if counts[2]:
+            new_leisure_time = max(5, float(mean_dist[2]) / 83.33 * 2)
+        else:
+            new_leisure_time = current_leisure_time
+        
+        leisure_savings = (current_leisure_time - new_leisure_time) * leisure_frequency
+        
+        # Total weekly savings
+        total_weekly_savings = commute_savings + shopping_savings + leisure_savings
+        
+        # Display savings
+        st.metric("🚌 Economia Trabalho", f"{commute_savings:.0f} min/semana")
+        st.metric("🛒 Economia Compras", f"{shopping_savings:.0f} min/semana")
+        st.metric("🎭 Economia Lazer", f"{leisure_savings:.0f} min/semana")
+        
+        st.markdown("---")
+        
+        st.metric("⏰ **TOTAL SEMANAL**", f"{total_weekly_savings:.0f} min")
+        st.metric("📅 **TOTAL MENSAL**", f"{total_weekly_savings * 4.3:.0f} min")
+        st.metric("📆 **TOTAL ANUAL**", f"{total_weekly_savings * 52 / 60:.0f} horas")
+    
+    # Financial impact
+    st.markdown("---")
+    st.subheader("💰 Impacto Financeiro da Economia de Tempo")
+    
+    finance_cols = st.columns(4)
+    
+    weekly_value = (total_weekly_savings / 60) * hourly_value
+    monthly_value = weekly_value * 4.3
+    annual_value = weekly_value * 52
+    
+    with finance_cols[0]:
+        st.metric("💵 Semanal", f"R$ {weekly_value:.0f}")
+    with finance_cols[1]:
+        st.metric("💵 Mensal", f"R$ {monthly_value:.0f}")
+    with finance_cols[2]:
+        st.metric("💵 Anual", f"R$ {annual_value:.0f}")
+    with finance_cols[3]:
+        st.metric("💵 10 Anos", f"R$ {annual_value * 10:,.0f}")
+
+# Premium sub-sections; only the selected one is computed and drawn on each rerun
+PREMIUM_TAB_LABELS = (
+    "🎯 UrbanScore Elite",
+    "🧬 DNA da Localização",
+    "🎮 Lifestyle Simulator",
+    "💎 Rarity Index",
+    "⏱️ Time Savings Calculator",
+    "🔮 Future Index",
+    "🚶 Mobility Signature",
+    "🛡️ Resilience Score",
+    "🌍 Social Impact Report"
+)
+
+# Static banner at the top of the premium tab
+PREMIUM_HEADER_HTML = """
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+           padding: 20px; border-radius: 15px; color: white; text-align: center; margin-bottom: 20px;">
+    <h2 style="margin: 0; color: white;">🏆 Análise Premium Ativa</h2>
+    <p style="margin: 5px 0 0 0; opacity: 0.9;">Análises avançadas baseadas em algoritmos proprietários</p>
+</div>
+"""
+
+# Premium sections with the one-line description shown before any analysis exists
+_PREMIUM_FEATURES = tuple(zip(PREMIUM_TAB_LABELS, (
+    "Algoritmo proprietário com 50+ variáveis urbanas",
+    "Perfil genético único baseado em características urbanas",
+    "Simule sua vida diária na localização",
+    "Exclusividade e raridade da localização",
+    "Economia de tempo e dinheiro",
+    "Potencial futuro baseado em tendências",
+    "Assinatura única de mobilidade",
+    "Resistência a mudanças e crises",
+    "Impacto social e sustentabilidade"
+)))
+
+_LEFT_FEATURES, _RIGHT_FEATURES = _PREMIUM_FEATURES[0::2], _PREMIUM_FEATURES[1::2]
+
+def _preview_column_html(features):
+    """One stacked column of premium preview entries"""
+    return "<div>" + "".join(
+        f'<div style="padding: 8px 0; border-bottom: 1px solid rgba(128, 128, 128, 0.3);">'
+        f'<b>{feature}</b><br><small style="opacity: 0.7;">{description}</small></div>'
+        for feature, description in features
+    ) + "</div>"
+
+@st.cache_data(show_spinner=False)
+def _premium_preview_html():
+    """Static two-column grid of the premium sections, shown before any analysis exists"""
+    return (
+        '<div style="display: grid; grid-template-columns: 1fr 1fr; column-gap: 2rem; align-items: start;">'
+        f'{_preview_column_html(_LEFT_FEATURES)}{_preview_column_html(_RIGHT_FEATURES)}</div>'
+    )
+
+# Persona Tools Helpers
+@st.cache_resource(ttl=3600, max_entries=32)
+def _poi_index(addr, analysis_id, _result):
+    """Read-only index of an analysis' POIs by category, shared across sessions per analysis run"""
+    distances = {}
+    for poi in _result.pois:
+        distances.setdefault(poi.get('category', 'other'), []).append(poi.get('distance', 0))
+    return MappingProxyType({
+        'counts': MappingProxyType(Counter({cat: len(d) for cat, d in distances.items()})),
+        'category_distances': MappingProxyType({cat: tuple(d) for cat, d in distances.items()}),
+        'min_distance': MappingProxyType({cat: min(d) for cat, d in distances.items()})
+    })
+
+@st.cache_data(show_spinner=False)
+def _objections(roi, walk, n_pois):
+    """Build the suggested answers to common buyer objections"""
+    return (
+        ("💰 'Está muito caro'", f"Análise comparativa: imóveis similares custam 15% mais. Este tem ROI de {roi:.1f}% ao ano."),
+        ("🚗 'Fica longe de tudo'", f"Walk Score de {walk}/100. Você economiza R$ 500/mês sem carro!"),
+        ("🏢 'Não conheço a região'", f"{n_pois} estabelecimentos mapeados. Região consolidada com infraestrutura completa."),
+        ("⏰ 'Vou pensar'", f"Apenas 2% dos imóveis têm essa infraestrutura. {min(n_pois, 5)} interessados este mês.")
+    )
+
+# Headline metrics of the individual analysis: (label, tooltip)
+KEY_METRIC_CARDS = (
+    ("Pontuação Geral", "Pontuação geral da propriedade"),
+    ("Walk Score", "Classificação de caminhabilidade"),
+    ("Transporte", "Acesso ao transporte público"),
+    ("Conveniência", "Serviços próximos"),
+    ("Estilo de Vida", "Pontuação de qualidade de vida")
+)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_key_metric_cards(values):
+    """Headline metric cards as a single five-column HTML grid"""
+    cards = "".join(
+        f'<div title="{help_text}" style="padding: 0.25rem 0;">'
+        f'<div style="font-size: 0.875rem; opacity: 0.8;">{label}</div>'
+        f'<div style="font-size: 2.25rem; line-height: 1.3;">{value:.1f}</div></div>'
+        for (label, help_text), value in zip(KEY_METRIC_CARDS, values)
+    )
+    return f'<div style="display: grid; grid-template-columns: repeat(5, 1fr); gap: 1rem; margin-bottom: 1rem;">{cards}</div>'
+
+# Urban benchmarks used by the location benchmarking tool
+_BENCHMARKS_DF = pd.DataFrame({
+    "Tipo de Área": ["Centro da Cidade", "Bairro Residencial", "Subúrbio", "Área Rural"],
+    "Score Referência": np.array([85, 70, 55, 30], dtype=np.int16)
+})
+
+def main():
+    # Build the shared orchestrator up front so the first analysis does not pay for it
+    get_orchestrator()
+    
+    # Sidebar for advanced options
+    with st.sidebar:
+        st.header("🎛️ Configurações Avançadas")
+        
+        # Analysis radius
+        st.subheader("📏 Raio de Análise")
+        radius_options = {
+            "1 km": 1000,
+            "2 km": 2000, 
+            "3 km": 3000
+        }
+        selected_radius = st.selectbox(
+            "Selecione o raio:",
+            options=list(radius_options.keys()),
+            index=0,
+            help="Defina o raio de análise para coleta de POIs"
+        )
+        st.session_state.analysis_radius = radius_options[selected_radius]
+        
+        # Quick Stats
+        st.subheader("📊 Estatísticas da Sessão")
+        if st.session_state.analysis_results:
+            st.metric("Análises Realizadas", len(st.session_state.analysis_results))
+            total_pois = sum(len(r.pois) for r in st.session_state.analysis_results.values() if r.success)
+            st.metric("Total de POIs Coletados", total_pois)
+        else:
+            st.info("Nenhuma análise realizada ainda")
+
+    # Main Application Header
+    st.title("🏙️ UrbanSight Enhanced")
+    st.subheader("Plataforma Avançada de Inteligência Imobiliária")
+    
+    # Navigation tabs
+    main_tab1, main_tab2, main_tab3, main_tab4, main_tab5, main_tab6, main_tab7, main_tab8, main_tab9, main_tab10 = st.tabs([
+        "🔍 Análise Individual", 
+        "⚖️ Comparação de Propriedades", 
+        "📊 Analytics Avançados",
+        "🗺️ Mapas Avançados",
+        "📈 Tendências & Futuro",
+        "🎯 Ferramentas Inteligentes",
+        "🛠️ Ferramentas Extras",
+        "🏠 Minha Casa Ideal",
+        "🏢 Para Imobiliárias",
+        "🏆 UrbanSight Premium"
+    ])
+    
+    with main_tab1:
+        st.header("🔍 Análise de Propriedades")
+
+        # Address Input
+        address = st.text_input(
+            "Endereço da Propriedade",
+            placeholder="Digite o endereço completo (ex: Avenida Paulista, 1000, Bela Vista, São Paulo, SP)",
+            help="💡 Quanto mais específico o endereço, melhor será a análise"
+        )
+
+        # Analysis Button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            analyze_button = st.button(
+                "🚀 Iniciar Análise",
+                type="primary",
+                use_container_width=True
+            )
+
+        # Analysis Execution
+        if analyze_button and address:
+            st.info("🤖 UrbanSight Processando - Analisando dados de localização...")
+
+            try:
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+
+                # Run analysis; the orchestrator overlaps its independent stages
+                status_text.text("🗺️ Coletando dados do OpenStreetMap e analisando a vizinhança...")
+                progress_bar.progress(25)
+                result = analyze_address(address)
+                progress_bar.progress(100)
+
+                # Store result
+                store_analysis(address, result)
+                st.session_state.current_analysis = result
+
+                # Clear progress
+                progress_bar.empty()
+                status_text.empty()
+
+                if result.success:
+                    st.success("✅ Análise concluída com sucesso!")
+                    st.balloons()
+                else:
+                    st.error(f"❌ Falha na análise: {result.error_message}")
+
+            except Exception as e:
+                st.error(f"❌ Erro inesperado: {str(e)}")
+
+        elif analyze_button and not address:
+            st.warning("⚠️ Por favor, digite um endereço válido")
+
+        # Results Display
+        if st.session_state.current_analysis:
+            result = st.session_state.current_analysis
+
+            if result.success:
+                st.write("---")
+
+                # Analysis Header
+                st.header("📋 Relatório de Análise")
+                st.subheader(f"📍 {result.property_data.address}")
+                st.caption(f"Analisado em {datetime.now().strftime('%d de %B de %Y às %H:%M')}")
+
+                # Key Metrics Row
+                st.subheader("🎯 Métricas Principais de Desempenho")
+
+                # One HTML grid instead of five columns of st.metric
+                st.markdown(render_key_metric_cards((
+                    result.metrics.total_score,
+                    result.metrics.walk_score.overall_score,
+                    result.metrics.accessibility_score,
+                    result.metrics.convenience_score,
+                    result.metrics.quality_of_life_score
+                )), unsafe_allow_html=True)
+
+                # Enhanced Tabbed Content
+                tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+                    "📋 Resumo Executivo",
+                    "🗺️ Mapas Interativos", 
+                    "📊 Análise Detalhada",
+                    "🎯 Acessibilidade",
+                    "📈 Densidade & Distribuição",
+                    "🧠 Insights de IA"
+                ])
+
+                with tab1:
+                    st.subheader("📄 Resumo Executivo")
+
+                    st.info(f"**🎯 Avaliação Geral:** {result.insights.executive_summary}")
+
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.write("### ✅ Principais Pontos Fortes")
+                        for i, strength in enumerate(result.insights.strengths[:5], 1):
+                            st.success(f"**{i}.** {strength}")
+
+                    with col2:
+                        st.write("### ⚠️ Áreas de Preocupação") 
+                        for i, concern in enumerate(result.insights.concerns[:5], 1):
+                            st.warning(f"**{i}.** {concern}")
+
+                    st.info(f"**👥 Perfil Ideal do Morador:** {result.insights.ideal_resident_profile}")
                     
                     # POI Quick Stats
                     st.subheader("📍 Estatísticas Rápidas dos POIs")
@@ -1355,8 +2750,7 @@ def main():
                     if map_type == "Mapa Padrão":
                         show_radius = st.checkbox("Mostrar raio de análise", value=True)
                         try:
-                            m = create_folium_map(result, show_radius=show_radius)
-                            folium_static(m, width=800, height=600)
+                            components.html(create_folium_map(result, show_radius=show_radius), width=800, height=600)
                         except Exception as e:
                             st.error(f"Erro ao carregar mapa: {str(e)}")
                     
@@ -1364,8 +2758,8 @@ def main():
                         st.write("**Mapa de Calor de Densidade de POIs**")
                         heat_categories = st.multiselect(
                             "Categorias para heatmap:",
-                            list(set([poi.get('category', 'other') for poi in result.pois])),
-                            default=list(set([poi.get('category', 'other') for poi in result.pois]))[:3]
+                            list({poi.get('category', 'other') for poi in result.pois}),
+                            default=list({poi.get('category', 'other') for poi in result.pois})[:3]
                         )
                         
                         if heat_categories:
@@ -1378,13 +2772,12 @@ def main():
                     elif map_type == "Mapa Filtrado por Categoria":
                         filter_categories = st.multiselect(
                             "Mostrar apenas estas categorias:",
-                            list(set([poi.get('category', 'other') for poi in result.pois])),
+                            list({poi.get('category', 'other') for poi in result.pois}),
                             default=[]
                         )
                         
                         try:
-                            m = create_folium_map(result, poi_filter=filter_categories)
-                            folium_static(m, width=800, height=600)
+                            components.html(create_folium_map(result, poi_filter=filter_categories), width=800, height=600)
                         except Exception as e:
                             st.error(f"Erro ao carregar mapa: {str(e)}")
 
@@ -1438,7 +2831,7 @@ def main():
                     st.subheader("🚶‍♂️ Tempo de Caminhada para Cada Categoria")
                     
                     walking_data = []
-                    for category in set([poi.get('category', 'other') for poi in result.pois]):
+                    for category in {poi.get('category', 'other') for poi in result.pois}:
                         category_pois = [poi for poi in result.pois if poi.get('category') == category]
                         if category_pois:
                             min_distance = min([poi.get('distance', 1000) for poi in category_pois])
@@ -1591,9 +2984,9 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                         comparison_results[address] = st.session_state.analysis_results[address]
                     else:
                         try:
-                            result = asyncio.run(orchestrator.analyze_property(address))
+                            result = analyze_address(address)
                             if result.success:
-                                st.session_state.analysis_results[address] = result
+                                store_analysis(address, result)
                                 comparison_results[address] = result
                             else:
                                 st.error(f"Falha ao analisar {address}: {result.error_message}")
@@ -1669,7 +3062,7 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     st.metric("Walk Score Médio", f"{avg_walk_score:.1f}")
                 
                 with col3:
-                    total_pois = sum([len(r.pois) for r in successful_results])
+                    total_pois = sum(len(r.pois) for r in successful_results)
                     st.metric("Total de POIs Analisados", total_pois)
                 
                 with col4:
@@ -1754,13 +3147,13 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                 st.subheader("🏷️ Categorias")
                 filter_option = st.selectbox("Filtro", ["Todas", "Essenciais", "Lazer", "Comércio"], index=0)
                 
-                available_cats = list(set([poi.get('category', 'other') for poi in result.pois]))
+                available_cats = list({poi.get('category', 'other') for poi in result.pois})
                 if filter_option == "Essenciais":
-                    selected_cats = [cat for cat in available_cats if cat in ['healthcare', 'education', 'pharmacy', 'supermarket']]
+                    selected_cats = [cat for cat in available_cats if cat in {'healthcare', 'education', 'pharmacy', 'supermarket'}]
                 elif filter_option == "Lazer":
-                    selected_cats = [cat for cat in available_cats if cat in ['restaurant', 'bar', 'park', 'entertainment', 'cinema']]
+                    selected_cats = [cat for cat in available_cats if cat in {'restaurant', 'bar', 'park', 'entertainment', 'cinema'}]
                 elif filter_option == "Comércio":
-                    selected_cats = [cat for cat in available_cats if cat in ['shopping', 'supermarket', 'bank', 'services']]
+                    selected_cats = [cat for cat in available_cats if cat in {'shopping', 'supermarket', 'bank', 'services'}]
                 else:  # Todas
                     selected_cats = available_cats
             
@@ -1945,9 +3338,10 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
             result = st.session_state.current_analysis
             
             # Calculate all indices
-            maturity_index, maturity_factors = calculate_urban_maturity_index(result.pois)
-            gentrification_index, gentrification_scores = calculate_gentrification_index(result.pois)
-            development_potential, development_indicators = predict_development_potential(result.pois, (result.property_data.lat, result.property_data.lon))
+            premium_cache = get_premium_cache(result)
+            maturity_index, maturity_factors = premium_cache['maturity']
+            gentrification_index, gentrification_scores = premium_cache['gentrification']
+            development_potential, development_indicators = premium_cache['potential']
             investment_timeline = calculate_investment_timeline(development_potential, maturity_index)
             
             # Main metrics
@@ -2056,10 +3450,11 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     comparison_data = []
                     
                     for address, analysis_result in st.session_state.analysis_results.items():
-                        if hasattr(analysis_result, 'pois'):
-                            addr_maturity, _ = calculate_urban_maturity_index(analysis_result.pois)
-                            addr_gentrification, _ = calculate_gentrification_index(analysis_result.pois)
-                            addr_development, _ = predict_development_potential(analysis_result.pois, (analysis_result.property_data.lat, analysis_result.property_data.lon))
+                        if analysis_result.success:
+                            addr_cache = get_premium_cache(analysis_result)
+                            addr_maturity, _ = addr_cache['maturity']
+                            addr_gentrification, _ = addr_cache['gentrification']
+                            addr_development, _ = addr_cache['potential']
                             
                             comparison_data.append({
                                 'Endereço': address[:40] + '...' if len(address) > 40 else address,
@@ -2289,8 +3684,9 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     st.markdown("### 📊 Propriedades Similares Analisadas")
                     
                     for i, (address, similarity, similar_result) in enumerate(similar_neighborhoods):
-                        similar_maturity, _ = calculate_urban_maturity_index(similar_result.pois)
-                        similar_development, _ = predict_development_potential(similar_result.pois, (similar_result.property_data.lat, similar_result.property_data.lon))
+                        similar_fp = pois_key(similar_result.pois)
+                        similar_maturity, _ = calculate_urban_maturity_index(similar_fp)
+                        similar_development, _ = predict_development_potential(similar_fp, (similar_result.property_data.lat, similar_result.property_data.lon))
                         
                         with st.expander(f"#{i+1} {address[:50]}... (Similaridade: {similarity:.2f})"):
                             
@@ -2428,8 +3824,8 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     avg_delivery_cost = st.number_input("🍕 Custo Médio por Delivery (R$)", value=35, step=5)
                 
                 # Cálculos automáticos baseados na infraestrutura
-                restaurants_nearby = len([p for p in pois if p['category'] in ['restaurant', 'fast_food', 'cafe']])
-                markets_nearby = len([p for p in pois if p['category'] in ['supermarket', 'convenience']])
+                restaurants_nearby = sum(1 for p in pois if p['category'] in {'restaurant', 'fast_food', 'cafe'})
+                markets_nearby = sum(1 for p in pois if p['category'] in {'supermarket', 'convenience'})
                 
                 # Fatores de desconto/aumento baseados na infraestrutura
                 restaurant_factor = max(0.7, 1 - (restaurants_nearby * 0.05))  # Mais restaurantes = menos delivery
@@ -2499,13 +3895,13 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                 
                 with filter_col1:
                     st.markdown("#### 🐕 Pet-Friendly Score")
-                    pet_pois = [p for p in pois if p['category'] in ['veterinary', 'pet', 'park']]
+                    pet_pois = [p for p in pois if p['category'] in {'veterinary', 'pet', 'park'}]
                     pet_score = min(100, len(pet_pois) * 20)
                     st.progress(pet_score/100)
                     st.caption(f"Score: {pet_score}/100 ({len(pet_pois)} POIs pet-friendly)")
                     
                     st.markdown("#### 👶 Família com Bebê Score")
-                    family_pois = [p for p in pois if p['category'] in ['hospital', 'pharmacy', 'kindergarten', 'school']]
+                    family_pois = [p for p in pois if p['category'] in {'hospital', 'pharmacy', 'kindergarten', 'school'}]
                     family_score = min(100, len(family_pois) * 15)
                     st.progress(family_score/100)
                     st.caption(f"Score: {family_score}/100 ({len(family_pois)} POIs familiares)")
@@ -2517,7 +3913,7 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     st.caption(f"Walk Score: {walk_score}/100")
                     
                     st.markdown("#### 🎵 Vida Noturna Score")
-                    nightlife_pois = [p for p in pois if p['category'] in ['bar', 'pub', 'nightclub', 'theatre', 'cinema']]
+                    nightlife_pois = [p for p in pois if p['category'] in {'bar', 'pub', 'nightclub', 'theatre', 'cinema'}]
                     nightlife_score = min(100, len(nightlife_pois) * 12)
                     st.progress(nightlife_score/100)
                     st.caption(f"Score: {nightlife_score}/100 ({len(nightlife_pois)} POIs noturnos)")
@@ -2538,10 +3934,10 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                 st.markdown("### 🏨 Análise de Potencial Airbnb")
                 
                 # Fatores para Airbnb
-                tourism_pois = [p for p in pois if p['category'] in ['attraction', 'museum', 'theatre', 'viewpoint', 'monument']]
-                transport_pois = [p for p in pois if p['category'] in ['public_transport', 'bus_station', 'subway_entrance']]
-                restaurant_pois = [p for p in pois if p['category'] in ['restaurant', 'cafe', 'bar']]
-                convenience_pois = [p for p in pois if p['category'] in ['supermarket', 'pharmacy', 'atm']]
+                tourism_pois = [p for p in pois if p['category'] in {'attraction', 'museum', 'theatre', 'viewpoint', 'monument'}]
+                transport_pois = [p for p in pois if p['category'] in {'public_transport', 'bus_station', 'subway_entrance'}]
+                restaurant_pois = [p for p in pois if p['category'] in {'restaurant', 'cafe', 'bar'}]
+                convenience_pois = [p for p in pois if p['category'] in {'supermarket', 'pharmacy', 'atm'}]
                 
                 tourism_score = min(30, len(tourism_pois) * 5)
                 transport_score = min(25, len(transport_pois) * 5)
@@ -2642,8 +4038,8 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                 st.markdown("### 📈 Ciclo de Valorização")
                 
                 infrastructure_density = len(pois) / 5  # POIs por km²
-                essential_services = len([p for p in pois if p['category'] in ['hospital', 'school', 'supermarket', 'pharmacy']])
-                premium_services = len([p for p in pois if p['category'] in ['restaurant', 'cafe', 'gym', 'beauty_salon']])
+                essential_services = sum(1 for p in pois if p['category'] in {'hospital', 'school', 'supermarket', 'pharmacy'})
+                premium_services = sum(1 for p in pois if p['category'] in {'restaurant', 'cafe', 'gym', 'beauty_salon'})
                 
                 if infrastructure_density < 10:
                     cycle_stage = "🌱 Emergente"
@@ -2683,8 +4079,14 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
             
             if 'analysis_results' in st.session_state and st.session_state.analysis_results:
                 # Pegar o último resultado analisado
-                result = list(st.session_state.analysis_results.values())[-1]
+                address, result = list(st.session_state.analysis_results.items())[-1]
                 pois = result.pois
+                idx = _poi_index(address, result.analysis_id, result)
+                cat_count = idx['counts']
+                total_score = result.metrics.total_score
+                walk_overall = result.metrics.walk_score.overall_score
+                n_pois = len(pois)
+                roi_est = 6.0 + (total_score - 50) * 0.1
                 
                 # Gerador de Pitch
                 st.markdown("### 📋 Gerador de Pitch Automático")
@@ -2704,14 +4106,17 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     
                     # Identificar diferenciais únicos
                     unique_features = []
-                    premium_pois = [p for p in pois if p['category'] in ['restaurant', 'gym', 'beauty_salon', 'cinema']]
-                    essential_pois = [p for p in pois if p['category'] in ['hospital', 'school', 'supermarket', 'pharmacy']]
+                    premium_n = sum(cat_count[c] for c in ('restaurant', 'gym', 'beauty_salon', 'cinema'))
+                    essential_n = sum(cat_count[c] for c in ('hospital', 'school', 'supermarket', 'pharmacy'))
+                    health_n = cat_count['hospital'] + cat_count['pharmacy'] + cat_count['gym']
+                    conv_n = cat_count['supermarket'] + cat_count['convenience'] + cat_count['bakery']
+                    gastro_n = cat_count['restaurant'] + cat_count['cafe'] + cat_count['bar']
                     
-                    if len(premium_pois) > 8:
+                    if premium_n > 8:
                         unique_features.append("Região premium com alta concentração de serviços sofisticados")
-                    if len(essential_pois) > 6:
+                    if essential_n > 6:
                         unique_features.append("Infraestrutura completa para o dia a dia")
-                    if result.metrics.walk_score.overall_score > 80:
+                    if walk_overall > 80:
                         unique_features.append("Excelente walkability - viva sem carro!")
                     
                     # Gerar pitch personalizado
@@ -2721,9 +4126,9 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
 ## 🏆 {property_type} Excepcional - R$ {property_price:,.0f}
 
 ### 📍 **Localização Premium Comprovada por Dados**
-- **Análise UrbanSight**: {result.metrics.total_score:.0f}/100 pontos
-- **Walk Score**: {result.metrics.walk_score.overall_score:.0f}/100 
-- **{len(pois)} estabelecimentos** mapeados em 1km
+- **Análise UrbanSight**: {total_score:.0f}/100 pontos
+- **Walk Score**: {walk_overall:.0f}/100 
+- **{n_pois} estabelecimentos** mapeados em 1km
 
 ### 🌟 **Diferenciais Únicos desta Região**
 """
@@ -2734,16 +4139,16 @@ Gerado por UrbanSight em {datetime.now().strftime('%d/%m/%Y às %H:%M')}
                     pitch_text += f"""
 ### 🎯 **Por que este {property_type.lower()} é uma oportunidade única:**
 
-**🏥 Saúde & Bem-estar**: {len([p for p in pois if p['category'] in ['hospital', 'pharmacy', 'gym']])} estabelecimentos próximos
+**🏥 Saúde & Bem-estar**: {health_n} estabelecimentos próximos
 
-**🛒 Conveniência Diária**: {len([p for p in pois if p['category'] in ['supermarket', 'convenience', 'bakery']])} opções para compras
+**🛒 Conveniência Diária**: {conv_n} opções para compras
 
-**🍽️ Gastronomia & Lazer**: {len([p for p in pois if p['category'] in ['restaurant', 'cafe', 'bar']])} restaurantes e cafés
+**🍽️ Gastronomia & Lazer**: {gastro_n} restaurantes e cafés
 
 **🚶 Mobilidade**: Caminhe para tudo - economia de R$ 500+ mensais em transporte
 
 ### 💰 **Análise de Investimento**
-- **ROI Estimado**: {6 + (result.metrics.total_score - 50) * 0.1:.1f}% ao ano
+- **ROI Estimado**: {roi_est:.1f}% ao ano
 - **Potencial de Valorização**: {cycle_stage} 
 - **Liquidez**: Alta (região consolidada)
 
@@ -2769,12 +4174,12 @@ Apenas **2% dos imóveis** da cidade têm essa combinação de infraestrutura e
                             instagram_post = f"""🏆 {property_type} dos Sonhos! 
 
 📍 Localização PREMIUM
-🎯 UrbanSight Score: {result.metrics.total_score:.0f}/100
-🚶 Walk Score: {result.metrics.walk_score.overall_score:.0f}/100
+🎯 UrbanSight Score: {total_score:.0f}/100
+🚶 Walk Score: {walk_overall:.0f}/100
 
-✅ {len(pois)} estabelecimentos em 1km
+✅ {n_pois} estabelecimentos em 1km
 ✅ Infraestrutura completa
-✅ ROI: {6 + (result.metrics.total_score - 50) * 0.1:.1f}% ao ano
+✅ ROI: {roi_est:.1f}% ao ano
 
 💰 R$ {property_price:,.0f}
 
@@ -2792,9 +4197,9 @@ Olá [NOME],
 Encontrei uma oportunidade perfeita para você!
 
 {property_type} com localização PREMIUM comprovada por dados:
-• UrbanSight Score: {result.metrics.total_score:.0f}/100
-• {len(pois)} estabelecimentos mapeados
-• ROI estimado: {6 + (result.metrics.total_score - 50) * 0.1:.1f}% ao ano
+• UrbanSight Score: {total_score:.0f}/100
+• {n_pois} estabelecimentos mapeados
+• ROI estimado: {roi_est:.1f}% ao ano
 
 Apenas R$ {property_price:,.0f}
 
@@ -2821,21 +4226,21 @@ Quer ver pessoalmente? Responda este email!
                     # Calcular compatibility score
                     compatibility = 50  # Base score
                     
-                    if not has_car and result.metrics.walk_score.overall_score > 70:
+                    if not has_car and walk_overall > 70:
                         compatibility += 20
-                    elif has_car and result.metrics.walk_score.overall_score < 50:
+                    elif has_car and walk_overall < 50:
                         compatibility += 10
                     
                     if has_family:
-                        family_pois = len([p for p in pois if p['category'] in ['school', 'kindergarten', 'playground']])
+                        family_pois = cat_count['school'] + cat_count['kindergarten'] + cat_count['playground']
                         compatibility += min(20, family_pois * 3)
                     
                     if client_age < 35:
-                        nightlife_pois = len([p for p in pois if p['category'] in ['bar', 'nightclub', 'restaurant']])
+                        nightlife_pois = cat_count['bar'] + cat_count['nightclub'] + cat_count['restaurant']
                         compatibility += min(15, nightlife_pois * 2)
                     
                     if client_income > 15:
-                        premium_pois = len([p for p in pois if p['category'] in ['restaurant', 'gym', 'beauty_salon']])
+                        premium_pois = cat_count['restaurant'] + cat_count['gym'] + cat_count['beauty_salon']
                         compatibility += min(15, premium_pois * 2)
                     
                     compatibility = min(100, compatibility)
@@ -2863,12 +4268,7 @@ Quer ver pessoalmente? Responda este email!
                 # Objeções automáticas
                 st.markdown("### 🛡️ Tratamento de Objeções")
                 
-                common_objections = [
-                    ("💰 'Está muito caro'", f"Análise comparativa: imóveis similares custam 15% mais. Este tem ROI de {6 + (result.metrics.total_score - 50) * 0.1:.1f}% ao ano."),
-                    ("🚗 'Fica longe de tudo'", f"Walk Score de {result.metrics.walk_score.overall_score}/100. Você economiza R$ 500/mês sem carro!"),
-                    ("🏢 'Não conheço a região'", f"{len(pois)} estabelecimentos mapeados. Região consolidada com infraestrutura completa."),
-                    ("⏰ 'Vou pensar'", f"Apenas 2% dos imóveis têm essa infraestrutura. {len([p for p in pois[:5]])} interessados este mês.")
-                ]
+                common_objections = _objections(roi_est, walk_overall, n_pois)
                 
                 for objection, response in common_objections:
                     with st.expander(objection):
@@ -2882,8 +4282,10 @@ Quer ver pessoalmente? Responda este email!
             
             if 'analysis_results' in st.session_state and st.session_state.analysis_results:
                 # Pegar o último resultado analisado
-                result = list(st.session_state.analysis_results.values())[-1]
+                address, result = list(st.session_state.analysis_results.items())[-1]
                 pois = result.pois
+                idx = _poi_index(address, result.analysis_id, result)
+                category_distances = idx['category_distances']
                 
                 # Simulador de Rotina
                 st.markdown("### 🕐 Simulador de Rotina Diária")
@@ -2901,13 +4303,18 @@ Quer ver pessoalmente? Responda este email!
                     st.markdown("#### 🎯 Análise da Rotina")
                     
                     # Calcular tempos de deslocamento baseado nos POIs
-                    gym_pois = [p for p in pois if p['category'] == 'gym']
-                    market_pois = [p for p in pois if p['category'] in ['supermarket', 'convenience']]
-                    restaurant_pois = [p for p in pois if p['category'] in ['restaurant', 'cafe', 'bar']]
+                    gym_dists = category_distances.get('gym', ())
+                    market_dists = category_distances.get('supermarket', ()) + category_distances.get('convenience', ())
+                    restaurant_dists = category_distances.get('restaurant', ()) + category_distances.get('cafe', ()) + category_distances.get('bar', ())
+                    
+                    gym_min_d = min(gym_dists, default=math.inf)
+                    market_min_d = min(market_dists, default=math.inf)
+                    restaurant_min_d = min(restaurant_dists, default=math.inf)
+                    n_restaurants = len(restaurant_dists)
                     
-                    gym_time = min([p['distance'] for p in gym_pois]) * 2 if gym_pois else 20  # ida e volta
-                    market_time = min([p['distance'] for p in market_pois]) * 2 if market_pois else 15
-                    social_time = min([p['distance'] for p in restaurant_pois]) * 2 if restaurant_pois else 25
+                    gym_time = gym_min_d * 2 if gym_dists else 20  # ida e volta
+                    market_time = market_min_d * 2 if market_dists else 15
+                    social_time = restaurant_min_d * 2 if restaurant_dists else 25
                     
                     # Converter para minutos
                     gym_weekly = (gym_time / 1000) * 10 * gym_days  # ~10 min por km caminhando
@@ -2916,10 +4323,13 @@ Quer ver pessoalmente? Responda este email!
                     
                     total_commute_weekly = gym_weekly + market_weekly + social_weekly
                     
-                    st.metric("⏱️ Tempo Semanal", f"{total_commute_weekly:.0f} min")
-                    st.metric("🚶 Academia mais próxima", f"{min([p['distance'] for p in gym_pois])/1000:.1f}km" if gym_pois else "N/A")
-                    st.metric("🛒 Mercado mais próximo", f"{min([p['distance'] for p in market_pois])/1000:.1f}km" if market_pois else "N/A")
-                    st.metric("🍽️ Restaurante mais próximo", f"{min([p['distance'] for p in restaurant_pois])/1000:.1f}km" if restaurant_pois else "N/A")
+                    routine_metrics = {
+                        "⏱️ Tempo Semanal": f"{total_commute_weekly:.0f} min",
+                        "🚶 Academia mais próxima": f"{gym_min_d/1000:.1f}km" if gym_dists else "N/A",
+                        "🛒 Mercado mais próximo": f"{market_min_d/1000:.1f}km" if market_dists else "N/A",
+                        "🍽️ Restaurante mais próximo": f"{restaurant_min_d/1000:.1f}km" if restaurant_dists else "N/A"
+                    }
+                    st.table(pd.Series(routine_metrics).to_frame("Valor"))
                 
                 # Gamification - Sistema de Pontos
                 st.markdown("### 🏆 Sistema de Pontos Lifestyle")
@@ -2927,15 +4337,15 @@ Quer ver pessoalmente? Responda este email!
                 points = 0
                 achievements = []
                 
-                if gym_pois and min([p['distance'] for p in gym_pois]) < 500:
+                if gym_min_d < 500:
                     points += 20
                     achievements.append("🏋️ **Fitness Master**: Academia a menos de 500m!")
                 
-                if market_pois and min([p['distance'] for p in market_pois]) < 300:
+                if market_min_d < 300:
                     points += 15
                     achievements.append("🛒 **Convenience King**: Mercado super próximo!")
                 
-                if len(restaurant_pois) > 10:
+                if n_restaurants > 10:
                     points += 25
                     achievements.append("🍽️ **Foodie Paradise**: +10 opções gastronômicas!")
                 
@@ -2943,7 +4353,7 @@ Quer ver pessoalmente? Responda este email!
                     points += 30
                     achievements.append("🚶 **Walking Champion**: Viva sem carro!")
                 
-                if len([p for p in pois if p['category'] in ['hospital', 'pharmacy']]) > 3:
+                if idx['counts']['hospital'] + idx['counts']['pharmacy'] > 3:
                     points += 20
                     achievements.append("🏥 **Health Guardian**: Saúde sempre por perto!")
                 
@@ -2977,19 +4387,20 @@ Quer ver pessoalmente? Responda este email!
                     
                     timeline = [
                         ("07:00", "☀️ **Acordar**", "Bom dia! Sua nova casa está pronta para um dia incrível."),
-                        ("07:30", "☕ **Café da Manhã**", f"Café fresco na padaria a {min([p['distance'] for p in pois if p['category'] == 'bakery'])/1000:.1f}km!" if [p for p in pois if p['category'] == 'bakery'] else "Café em casa com vista para a cidade"),
+                        ("07:30", "☕ **Café da Manhã**", f"Café fresco na padaria a {idx['min_distance']['bakery']/1000:.1f}km!" if idx['counts']['bakery'] > 0 else "Café em casa com vista para a cidade"),
                         ("08:30", "🚶 **Caminhada para o Trabalho**", f"Walk Score {result.metrics.walk_score.overall_score}/100 - deslocamento fácil!"),
-                        ("12:00", "🍽️ **Almoço**", f"{len([p for p in pois if p['category'] == 'restaurant'])} restaurantes próximos para escolher!"),
-                        ("18:30", "🏋️ **Academia**", f"Gym a {min([p['distance'] for p in gym_pois])/1000:.1f}km - sem desculpas!" if gym_pois else "Exercícios no parque próximo"),
-                        ("20:00", "🛒 **Mercado**", f"Compras rápidas no mercado a {min([p['distance'] for p in market_pois])/1000:.1f}km" if market_pois else "Compras online com delivery rápido"),
-                        ("21:00", "🍻 **Happy Hour**", f"Escolha entre {len([p for p in pois if p['category'] in ['bar', 'cafe']])} bares e cafés próximos!"),
+                        ("12:00", "🍽️ **Almoço**", f"{idx['counts']['restaurant']} restaurantes próximos para escolher!"),
+                        ("18:30", "🏋️ **Academia**", f"Gym a {gym_min_d/1000:.1f}km - sem desculpas!" if gym_dists else "Exercícios no parque próximo"),
+                        ("20:00", "🛒 **Mercado**", f"Compras rápidas no mercado a {market_min_d/1000:.1f}km" if market_dists else "Compras online com delivery rápido"),
+                        ("21:00", "🍻 **Happy Hour**", f"Escolha entre {idx['counts']['bar'] + idx['counts']['cafe']} bares e cafés próximos!"),
                         ("22:30", "🏠 **Volta para Casa**", "Fim de um dia perfeito na sua nova localização ideal!")
                     ]
                     
-                    for time_slot, activity, description in timeline:
-                        st.markdown(f"**{time_slot}** - {activity}")
-                        st.caption(description)
-                        st.markdown("---")
+                    lines = [
+                        f"**{time_slot}** - {activity}\n\n<small>{description}</small>\n\n---"
+                        for time_slot, activity, description in timeline
+                    ]
+                    st.markdown("\n".join(lines), unsafe_allow_html=True)
                 
             else:
                 st.info("🎮 **Analise um endereço primeiro!** Use a aba 'Análise Individual' para começar.")
@@ -3029,7 +4440,7 @@ Quer ver pessoalmente? Responda este email!
             base_score = min(90, total_pois * 1.5)  # Base score from quantity
             
             # Bonus for diversity
-            categories_present = sum([1 for count in [education_count, healthcare_count, shopping_count, transport_count, restaurant_count, entertainment_count, services_count, park_count] if count > 0])
+            categories_present = sum(1 for count in (education_count, healthcare_count, shopping_count, transport_count, restaurant_count, entertainment_count, services_count, park_count) if count > 0)
             diversity_bonus = categories_present * 2
             
             estimated_score = min(100, base_score + diversity_bonus)
@@ -3121,23 +4532,10 @@ Quer ver pessoalmente? Responda este email!
                     # Benchmarks comparison
                     st.subheader("🎯 Comparação com Benchmarks")
                     
-                    benchmarks = {
-                        "Centro da Cidade": {"score": 85, "walk": 90, "pois": 200},
-                        "Bairro Residencial": {"score": 70, "walk": 65, "pois": 120},
-                        "Subúrbio": {"score": 55, "walk": 45, "pois": 80},
-                        "Área Rural": {"score": 30, "walk": 20, "pois": 30}
-                    }
-                    
-                    benchmark_data = []
-                    for area_type, bench_values in benchmarks.items():
-                        benchmark_data.append({
-                            "Tipo de Área": area_type,
-                            "Score Referência": bench_values["score"],
-                            "Sua Média": f"{avg_total:.1f}",
-                            "Diferença": f"{avg_total - bench_values['score']:+.1f}"
-                        })
-                    
-                    df_benchmark = pd.DataFrame(benchmark_data)
+                    df_benchmark = _BENCHMARKS_DF.assign(**{
+                        "Sua Média": f"{avg_total:.1f}",
+                        "Diferença": (avg_total - _BENCHMARKS_DF["Score Referência"]).map("{:+.1f}".format)
+                    })
                     st.dataframe(df_benchmark, use_container_width=True)
             else:
                 st.info("📊 Realize algumas análises primeiro para ver o benchmarking!")
@@ -3154,7 +4552,7 @@ Quer ver pessoalmente? Responda este email!
                 
                 for address, result in st.session_state.analysis_results.items():
                     if result.success:
-                        categories = set([poi.get('category', 'other') for poi in result.pois])
+                        categories = {poi.get('category', 'other') for poi in result.pois}
                         all_categories.update(categories)
                         location_categories[address] = categories
                 
@@ -3177,7 +4575,7 @@ Quer ver pessoalmente? Responda este email!
                     
                     category_coverage = {}
                     for category in all_categories:
-                        coverage_count = sum([1 for cats in location_categories.values() if category in cats])
+                        coverage_count = sum(1 for cats in location_categories.values() if category in cats)
                         coverage_percentage = (coverage_count / len(location_categories)) * 100
                         category_coverage[category] = coverage_percentage
                     
@@ -3215,6 +4613,10 @@ Quer ver pessoalmente? Responda este email!
         
         if st.session_state.current_analysis:
             result = st.session_state.current_analysis
+            soa = get_poi_arrays(result)
+            dist, cat_codes, band = soa['dist'], soa['cat_codes'], soa['band']
+            poi_fp = pois_key(result.pois)
+            cat_distances, cat_names = _group_pois(poi_fp)
             
             # Quick Profile Quiz
             with st.expander("🎯 Defina Seu Perfil (Opcional)", expanded=False):
@@ -3232,56 +4634,6 @@ Quer ver pessoalmente? Responda este email!
                     elderly_care = st.checkbox("👴 Cuido de idosos", key="elderly_care")
                     frequent_shopping = st.checkbox("🛒 Compro frequentemente", key="frequent_shopping")
             
-            # Calculate personalized scores
-            def calculate_personalized_score(pois):
-                weights = {
-                    'education': 0.1,
-                    'healthcare': 0.15,
-                    'shopping': 0.15,
-                    'transport': 0.15,
-                    'entertainment': 0.1,
-                    'restaurant': 0.1,
-                    'services': 0.1,
-                    'park': 0.15
-                }
-                
-                # Adjust weights based on profile
-                if has_children:
-                    weights['education'] = 0.25
-                    weights['park'] = 0.2
-                    weights['healthcare'] = 0.2
-                
-                if uses_public_transport:
-                    weights['transport'] = 0.3
-                
-                if likes_nightlife:
-                    weights['entertainment'] = 0.2
-                    weights['restaurant'] = 0.15
-                
-                if exercises_regularly:
-                    weights['park'] = 0.25
-                
-                if elderly_care:
-                    weights['healthcare'] = 0.3
-                
-                if frequent_shopping:
-                    weights['shopping'] = 0.25
-                
-                # Calculate score based on POI counts and distances
-                category_scores = {}
-                for category in weights.keys():
-                    category_pois = [p for p in pois if p.get('category', '').lower() == category.lower()]
-                    if category_pois:
-                        avg_distance = sum(p.get('distance', 1000) for p in category_pois) / len(category_pois)
-                        count_score = min(len(category_pois) * 20, 100)  # Max 100 for 5+ POIs
-                        distance_score = max(0, 100 - (avg_distance / 10))  # Max 100 for 0m, 0 for 1000m+
-                        category_scores[category] = (count_score + distance_score) / 2
-                    else:
-                        category_scores[category] = 0
-                
-                total_score = sum(category_scores[cat] * weights[cat] for cat in weights.keys())
-                return total_score, category_scores, weights
-            
             # Main Analysis Sections
             tab1, tab2, tab3, tab4, tab5 = st.tabs([
                 "🎯 Meu Score Personalizado",
@@ -3294,19 +4646,17 @@ Quer ver pessoalmente? Responda este email!
             with tab1:
                 st.subheader("🎯 Seu Score Personalizado")
                 
-                personal_score, category_scores, weights = calculate_personalized_score(result.pois)
+                # POIs without a distance score as 1 km away rather than on the doorstep
+                personal_score, category_scores, weights = calculate_personalized_score(
+                    pois_key(result.pois, missing_distance=1000), has_children, uses_public_transport, likes_nightlife,
+                    exercises_regularly, elderly_care, frequent_shopping
+                )
                 
                 # Display main score
                 col1, col2, col3 = st.columns([1, 2, 1])
                 with col2:
                     score_color = "🟢" if personal_score >= 70 else "🟡" if personal_score >= 50 else "🔴"
-                    st.markdown(f"""
-                    <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; color: white;">
-                        <h1 style="margin: 0; font-size: 3rem;">{score_color}</h1>
-                        <h2 style="margin: 0;">{personal_score:.1f}/100</h2>
-                        <p style="margin: 0; font-size: 1.2rem;">Compatibilidade com seu perfil</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(SCORE_CARD_TMPL.format(emoji=score_color, score=personal_score), unsafe_allow_html=True)
                 
                 st.markdown("---")
                 
@@ -3318,17 +4668,7 @@ Quer ver pessoalmente? Responda este email!
                     col1, col2, col3 = st.columns([3, 2, 1])
                     
                     with col1:
-                        category_names = {
-                            'education': '🎓 Educação',
-                            'healthcare': '🏥 Saúde',
-                            'shopping': '🛒 Compras',
-                            'transport': '🚌 Transporte',
-                            'entertainment': '🎭 Entretenimento',
-                            'restaurant': '🍽️ Restaurantes',
-                            'services': '🏛️ Serviços',
-                            'park': '🌳 Parques'
-                        }
-                        st.write(category_names.get(category, category.title()))
+                        st.write(CATEGORY_NAMES.get(category, category.title()))
                     
                     with col2:
                         st.progress(score/100)
@@ -3341,16 +4681,6 @@ Quer ver pessoalmente? Responda este email!
             with tab2:
                 st.subheader("📍 O que tem por perto?")
                 
-                # Calculate walking times
-                walking_speed = 80  # meters per minute (average walking speed)
-                
-                def get_walking_time(distance):
-                    return distance / walking_speed
-                
-                def filter_pois_by_time(pois, max_minutes):
-                    max_distance = max_minutes * walking_speed
-                    return [p for p in pois if p.get('distance', 0) <= max_distance]
-                
                 # Time-based analysis
                 time_ranges = [
                     (5, "🏃‍♂️ Em 5 minutos a pé"),
@@ -3360,177 +4690,69 @@ Quer ver pessoalmente? Responda este email!
                 
                 for max_time, title in time_ranges:
                     with st.expander(title, expanded=(max_time==5)):
-                        nearby_pois = filter_pois_by_time(result.pois, max_time)
+                        max_distance = max_time * WALK_SPEED_M_PER_MIN
                         
-                        if not nearby_pois:
+                        if not (dist <= max_distance).any():
                             st.warning(f"Nenhum POI encontrado em {max_time} minutos de caminhada.")
                             continue
                         
-                        # Group by category
-                        categories = {}
-                        for poi in nearby_pois:
-                            cat = poi.get('category', 'outros')
-                            if cat not in categories:
-                                categories[cat] = []
-                            categories[cat].append(poi)
-                        
                         # Display by category
                         cols = st.columns(2)
                         col_idx = 0
                         
-                        for category, pois in categories.items():
+                        for category, distances in cat_distances.items():
+                            nearby = np.flatnonzero(distances <= max_distance)
+                            if not nearby.size:
+                                continue
+                            
                             with cols[col_idx % 2]:
-                                category_icons = {
-                                    'shopping': '🛒',
-                                    'healthcare': '🏥', 
-                                    'education': '🎓',
-                                    'transport': '🚌',
-                                    'restaurant': '🍽️',
-                                    'entertainment': '🎭',
-                                    'services': '🔧',
-                                    'park': '🌳'
-                                }
-                                icon = category_icons.get(category, '📍')
+                                icon = CATEGORY_ICONS.get(category, '📍')
                                 
-                                st.markdown(f"**{icon} {category.title()}** ({len(pois)})")
-                                for poi in pois[:3]:  # Show top 3
-                                    time_min = get_walking_time(poi.get('distance', 0))
-                                    st.caption(f"• {poi.get('name', 'N/A')} ({time_min:.1f}min)")
+                                st.markdown(f"**{icon} {category.title()}** ({nearby.size})")
+                                for i in nearby[:3]:  # Show top 3
+                                    time_min = get_walking_time(distances[i])
+                                    st.caption(f"• {cat_names[category][i] or 'N/A'} ({time_min:.1f}min)")
                                 
-                                if len(pois) > 3:
-                                    st.caption(f"... e mais {len(pois)-3}")
+                                if nearby.size > 3:
+                                    st.caption(f"... e mais {nearby.size-3}")
                                 
                                 col_idx += 1
             
             with tab3:
                 st.subheader("🚶‍♂️ Tempos de Caminhada para Essenciais")
                 
-                # Define essential categories
-                essentials = {
-                    '🛒 Mercado/Supermercado': ['shopping', 'supermarket'],
-                    '🏥 Hospital/Clínica': ['healthcare', 'hospital', 'clinic'],
-                    '💊 Farmácia': ['pharmacy', 'healthcare'],
-                    '🚌 Ponto de Ônibus': ['transport', 'bus_stop'],
-                    '🏦 Banco/ATM': ['bank', 'atm', 'services'],
-                    '⛽ Posto de Gasolina': ['fuel', 'gas_station'],
-                    '🎓 Escola': ['education', 'school'],
-                    '🌳 Parque/Praça': ['park', 'leisure']
-                }
-                
-                for essential_name, keywords in essentials.items():
+                essential_rows = []
+                for essential_name in ESSENTIALS:
                     # Find closest POI for this essential
-                    essential_pois = []
-                    for poi in result.pois:
-                        poi_cat = poi.get('category', '').lower()
-                        poi_name = poi.get('name', '').lower()
-                        
-                        if any(keyword in poi_cat or keyword in poi_name for keyword in keywords):
-                            essential_pois.append(poi)
-                    
-                    if essential_pois:
-                        closest = min(essential_pois, key=lambda x: x.get('distance', float('inf')))
-                        distance = closest.get('distance', 0)
-                        time_walk = distance / walking_speed
+                    mask = essential_mask(soa, essential_name)
+                    sub = dist[mask]
+                    
+                    if sub.size:
+                        j = sub.argmin()
+                        closest_name = soa['names'][mask][j] or 'N/A'
+                        distance = float(sub[j])
+                        time_walk = distance / WALK_SPEED_M_PER_MIN
                         time_car = distance / 500  # Approximate car speed in city (30km/h = 500m/min)
-                        
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        
-                        with col1:
-                            st.write(f"{essential_name}")
-                            st.caption(f"📍 {closest.get('name', 'N/A')} ({distance:.0f}m)")
-                        
-                        with col2:
-                            walk_color = "🟢" if time_walk <= 5 else "🟡" if time_walk <= 10 else "🔴"
-                            st.metric("🚶‍♂️ A pé", f"{time_walk:.1f}min", delta=None)
-                        
-                        with col3:
-                            car_color = "🟢" if time_car <= 2 else "🟡" if time_car <= 5 else "🔴"
-                            st.metric("🚗 De carro", f"{time_car:.1f}min", delta=None)
+                        walk_color = "🟢" if time_walk <= 5 else "🟡" if time_walk <= 10 else "🔴"
+                        car_color = "🟢" if time_car <= 2 else "🟡" if time_car <= 5 else "🔴"
+                        essential_rows.append((
+                            essential_name, f"📍 {closest_name} ({distance:.0f}m)",
+                            f"{walk_color} {time_walk:.1f}min", f"{car_color} {time_car:.1f}min"
+                        ))
                     else:
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        with col1:
-                            st.write(f"{essential_name}")
-                            st.caption("❌ Não encontrado próximo")
-                        with col2:
-                            st.metric("🚶‍♂️ A pé", "N/A")
-                        with col3:
-                            st.metric("🚗 De carro", "N/A")
+                        essential_rows.append((essential_name, "❌ Não encontrado próximo", "N/A", "N/A"))
+                
+                st.dataframe(
+                    pd.DataFrame(essential_rows, columns=['Essencial', 'Local mais próximo', '🚶‍♂️ A pé', '🚗 De carro']),
+                    hide_index=True,
+                    use_container_width=True
+                )
             
             with tab4:
                 st.subheader("💰 Vale a Pena?")
                 
                 # Calculate pros and cons
-                def analyze_pros_cons(pois):
-                    pros = []
-                    cons = []
-                    
-                    # Count POIs by category within different ranges
-                    categories_5min = {}
-                    categories_10min = {}
-                    categories_15min = {}
-                    
-                    for poi in pois:
-                        distance = poi.get('distance', 0)
-                        category = poi.get('category', 'outros')
-                        
-                        if distance <= 400:  # 5 min
-                            categories_5min[category] = categories_5min.get(category, 0) + 1
-                        if distance <= 800:  # 10 min
-                            categories_10min[category] = categories_10min.get(category, 0) + 1
-                        if distance <= 1200:  # 15 min
-                            categories_15min[category] = categories_15min.get(category, 0) + 1
-                    
-                    # Analyze pros
-                    if categories_5min.get('shopping', 0) >= 3:
-                        pros.append("🛒 Muitos mercados/lojas em 5 min a pé")
-                    elif categories_10min.get('shopping', 0) >= 2:
-                        pros.append("🛒 Boa oferta de compras em 10 min a pé")
-                    
-                    if categories_10min.get('education', 0) >= 2:
-                        pros.append("🎓 Várias opções de educação próximas")
-                    
-                    if categories_5min.get('healthcare', 0) >= 1:
-                        pros.append("🏥 Acesso rápido a serviços de saúde")
-                    
-                    if categories_10min.get('transport', 0) >= 3:
-                        pros.append("🚌 Excelente conectividade de transporte")
-                    elif categories_5min.get('transport', 0) >= 1:
-                        pros.append("🚌 Transporte público acessível")
-                    
-                    if categories_10min.get('restaurant', 0) >= 5:
-                        pros.append("🍽️ Rica oferta gastronômica")
-                    
-                    if categories_15min.get('park', 0) >= 2:
-                        pros.append("🌳 Boas opções de lazer e exercícios")
-                    
-                    if categories_10min.get('entertainment', 0) >= 2:
-                        pros.append("🎭 Vida cultural e entretenimento ativa")
-                    
-                    # Analyze cons
-                    if categories_15min.get('shopping', 0) < 1:
-                        cons.append("🛒 Falta de opções de compras próximas")
-                    
-                    if categories_15min.get('healthcare', 0) < 1:
-                        cons.append("🏥 Serviços de saúde distantes")
-                    
-                    if categories_10min.get('transport', 0) < 1:
-                        cons.append("🚌 Transporte público limitado")
-                    
-                    if categories_15min.get('education', 0) < 1:
-                        cons.append("🎓 Poucas opções educacionais")
-                    
-                    if categories_15min.get('restaurant', 0) < 2:
-                        cons.append("🍽️ Opções gastronômicas limitadas")
-                    
-                    if categories_15min.get('park', 0) < 1:
-                        cons.append("🌳 Falta de espaços verdes e lazer")
-                    
-                    if categories_15min.get('entertainment', 0) < 1:
-                        cons.append("🎭 Vida noturna/cultural limitada")
-                    
-                    return pros, cons
-                
-                pros, cons = analyze_pros_cons(result.pois)
+                pros, cons = analyze_pros_cons(poi_fp)
                 
                 col1, col2 = st.columns(2)
                 
@@ -3567,55 +4789,7 @@ Quer ver pessoalmente? Responda este email!
                 st.subheader("🎨 Perfil do Bairro")
                 st.markdown("*Descubra para quem este local é mais adequado:*")
                 
-                def calculate_profile_scores(pois):
-                    # Count POIs by category and calculate accessibility
-                    categories = {}
-                    for poi in pois:
-                        cat = poi.get('category', 'outros')
-                        distance = poi.get('distance', 0)
-                        if cat not in categories:
-                            categories[cat] = []
-                        categories[cat].append(distance)
-                    
-                    # Calculate scores for different profiles
-                    profiles = {}
-                    
-                    # Families with children
-                    education_score = min(len(categories.get('education', [])) * 20, 100)
-                    park_score = min(len(categories.get('park', [])) * 25, 100)
-                    healthcare_score = min(len(categories.get('healthcare', [])) * 15, 100)
-                    safety_base = 70  # Base safety score
-                    profiles['👨‍👩‍👧‍👦 Famílias com crianças'] = (education_score + park_score + healthcare_score + safety_base) / 4
-                    
-                    # Young professionals
-                    transport_score = min(len(categories.get('transport', [])) * 20, 100)
-                    restaurant_score = min(len(categories.get('restaurant', [])) * 15, 100)
-                    entertainment_score = min(len(categories.get('entertainment', [])) * 25, 100)
-                    profiles['👥 Jovens profissionais'] = (transport_score + restaurant_score + entertainment_score) / 3
-                    
-                    # Elderly
-                    healthcare_elderly = min(len(categories.get('healthcare', [])) * 30, 100)
-                    shopping_score = min(len(categories.get('shopping', [])) * 20, 100)
-                    transport_elderly = min(len(categories.get('transport', [])) * 25, 100)
-                    profiles['👴 Idosos'] = (healthcare_elderly + shopping_score + transport_elderly) / 3
-                    
-                    # Car owners
-                    parking_base = 85  # Assume good for car owners
-                    shopping_car = min(len(categories.get('shopping', [])) * 15, 100)
-                    profiles['🚗 Quem tem carro'] = (parking_base + shopping_car) / 2
-                    
-                    # Pedestrians
-                    walkability_score = 0
-                    for cat, distances in categories.items():
-                        if distances:
-                            avg_dist = sum(distances) / len(distances)
-                            walkability_score += max(0, 100 - (avg_dist / 10))
-                    walkability_score = min(walkability_score / len(categories) if categories else 0, 100)
-                    profiles['🚶 Quem anda a pé'] = walkability_score
-                    
-                    return profiles
-                
-                profiles = calculate_profile_scores(result.pois)
+                profiles = calculate_profile_scores(dist, cat_codes)
                 
                 for profile_name, score in profiles.items():
                     col1, col2 = st.columns([3, 2])
@@ -3634,83 +4808,36 @@ Quer ver pessoalmente? Responda este email!
                 st.subheader("🗺️ Mapa da Conveniência")
                 st.markdown("*Visualize a conveniência por tempo de caminhada:*")
                 
-                # Create a simple folium map with color zones
-                if hasattr(result, 'latitude') and hasattr(result, 'longitude'):
-                    m = folium.Map(
-                        location=[result.latitude, result.longitude],
-                        zoom_start=15
+                # Build the folium map only on demand; the HTML is cached per location
+                if st.button("🗺️ Gerar mapa", key="build_convenience_map") or st.session_state.get('convenience_map_built'):
+                    st.session_state.convenience_map_built = True
+                    map_html = _build_convenience_map(
+                        result.property_data.lat, result.property_data.lon, poi_fp[:20]
                     )
-                    
-                    # Add center point
-                    folium.Marker(
-                        [result.latitude, result.longitude],
-                        popup="📍 Localização Analisada",
-                        icon=folium.Icon(color='red', icon='home')
-                    ).add_to(m)
-                    
-                    # Add colored circles for convenience zones
-                    folium.Circle(
-                        location=[result.latitude, result.longitude],
-                        radius=400,  # 5 min walk
-                        popup="🟢 5 min a pé - Muito Conveniente",
-                        color='green',
-                        fill=True,
-                        fillOpacity=0.2
-                    ).add_to(m)
-                    
-                    folium.Circle(
-                        location=[result.latitude, result.longitude],
-                        radius=800,  # 10 min walk
-                        popup="🟡 10 min a pé - Conveniente",
-                        color='yellow',
-                        fill=True,
-                        fillOpacity=0.1
-                    ).add_to(m)
-                    
-                    folium.Circle(
-                        location=[result.latitude, result.longitude],
-                        radius=1200,  # 15 min walk
-                        popup="🟠 15 min a pé - Aceitável",
-                        color='orange',
-                        fill=True,
-                        fillOpacity=0.05
-                    ).add_to(m)
-                    
-                    # Add POIs with appropriate colors
-                    for poi in result.pois[:20]:  # Show top 20 POIs
-                        distance = poi.get('distance', 0)
-                        if distance <= 400:
-                            color = 'green'
-                        elif distance <= 800:
-                            color = 'yellow'
-                        elif distance <= 1200:
-                            color = 'orange'
-                        else:
-                            color = 'red'
-                        
-                        time_min = distance / 80  # walking speed
-                        folium.Marker(
-                            [poi.get('lat', result.latitude), poi.get('lon', result.longitude)],
-                            popup=f"{poi.get('name', 'N/A')}<br>🚶‍♂️ {time_min:.1f} min",
-                            icon=folium.Icon(color=color, icon='info-sign')
-                        ).add_to(m)
-                    
-                    folium_static(m, height=400)
+                    components.html(map_html, height=400)
                 
                 # Checklist
                 st.markdown("---")
                 st.subheader("📋 Checklist da Mudança")
                 st.markdown("*Itens essenciais para sua nova casa:*")
                 
+                is_cat = {cat: cat_codes == code for cat, code in CAT_TO_CODE.items()}
+                is_pharmacy = np.fromiter(('pharmacy' in name for name in soa['names_lc']), dtype=bool, count=len(dist))
+                # POIs without a distance count as 999 m away, as the checklist always treated them
+                check_band = np.where(soa['has_dist'], band, np.digitize(999, RADII, right=True))
+                checklist_masks = {
+                    '🛒 Mercado/Supermercado próximo': (check_band <= 1) & is_cat['shopping'],
+                    '🏥 Serviços de saúde acessíveis': (check_band <= 2) & is_cat['healthcare'],
+                    '🚌 Transporte público próximo': (check_band == 0) & is_cat['transport'],
+                    '🎓 Escolas na região': is_cat['education'],
+                    '💊 Farmácia acessível': (check_band <= 1) & (is_pharmacy | is_cat['healthcare']),
+                    '🌳 Áreas verdes próximas': is_cat['park'],
+                    '🍽️ Opções gastronômicas': is_cat['restaurant'],
+                    '🔧 Serviços essenciais': is_cat['services']
+                }
                 essentials_check = {
-                    '🛒 Mercado/Supermercado próximo': any(poi.get('distance', 999) <= 800 and 'shopping' in poi.get('category', '') for poi in result.pois),
-                    '🏥 Serviços de saúde acessíveis': any(poi.get('distance', 999) <= 1200 and 'healthcare' in poi.get('category', '') for poi in result.pois),
-                    '🚌 Transporte público próximo': any(poi.get('distance', 999) <= 400 and 'transport' in poi.get('category', '') for poi in result.pois),
-                    '🎓 Escolas na região': any('education' in poi.get('category', '') for poi in result.pois),
-                    '💊 Farmácia acessível': any(poi.get('distance', 999) <= 800 and ('pharmacy' in poi.get('name', '').lower() or 'healthcare' in poi.get('category', '')) for poi in result.pois),
-                    '🌳 Áreas verdes próximas': any('park' in poi.get('category', '') for poi in result.pois),
-                    '🍽️ Opções gastronômicas': len([p for p in result.pois if 'restaurant' in p.get('category', '')]) >= 2,
-                    '🔧 Serviços essenciais': any('services' in poi.get('category', '') for poi in result.pois)
+                    item: int(np.count_nonzero(mask)) >= CHECKLIST_MIN_COUNT.get(item, 1)
+                    for item, mask in checklist_masks.items()
                 }
                 
                 checked_items = sum(essentials_check.values())
@@ -3745,6 +4872,14 @@ Quer ver pessoalmente? Responda este email!
         
         if st.session_state.current_analysis:
             result = st.session_state.current_analysis
+            poi_fp = pois_key(result.pois)
+            
+            # Per-category aggregates shared by all professional tools
+            n_pois = len(poi_fp)
+            cat_counts = Counter(cat for cat, *_ in poi_fp)
+            # The express checklist has always counted POIs without a distance as 999 m away
+            checklist_distances, _ = _group_pois(pois_key(result.pois, missing_distance=999))
+            min_distance = {cat: float(d.min()) for cat, d in checklist_distances.items()}
             
             # Professional Tools Tabs
             prof_tab1, prof_tab2, prof_tab3, prof_tab4, prof_tab5 = st.tabs([
@@ -3759,67 +4894,7 @@ Quer ver pessoalmente? Responda este email!
                 st.subheader("🎯 Pitch Automático para Corretor")
                 st.markdown("*Texto pronto para usar com seus clientes:*")
                 
-                def generate_automatic_pitch(pois):
-                    # Count POIs by category and calculate key metrics
-                    categories = {}
-                    for poi in pois:
-                        cat = poi.get('category', 'outros')
-                        distance = poi.get('distance', 0)
-                        if cat not in categories:
-                            categories[cat] = []
-                        categories[cat].append(distance)
-                    
-                    # Generate pitch components
-                    pitch_parts = []
-                    
-                    # Shopping analysis
-                    shopping_pois = categories.get('shopping', [])
-                    if shopping_pois:
-                        shopping_5min = len([d for d in shopping_pois if d <= 400])
-                        shopping_10min = len([d for d in shopping_pois if d <= 800])
-                        if shopping_5min >= 3:
-                            pitch_parts.append(f"🛒 **{shopping_5min} mercados em apenas 5 minutos a pé**")
-                        elif shopping_10min >= 2:
-                            pitch_parts.append(f"🛒 **{shopping_10min} opções de compras em 10 minutos a pé**")
-                    
-                    # Education analysis
-                    education_pois = categories.get('education', [])
-                    if education_pois:
-                        closest_school = min(education_pois)
-                        school_count = len(education_pois)
-                        if closest_school <= 500:
-                            pitch_parts.append(f"🎓 **Escola a apenas {closest_school:.0f}m - ideal para famílias**")
-                        elif school_count >= 2:
-                            pitch_parts.append(f"🎓 **{school_count} escolas na região**")
-                    
-                    # Healthcare analysis
-                    healthcare_pois = categories.get('healthcare', [])
-                    if healthcare_pois:
-                        closest_health = min(healthcare_pois)
-                        if closest_health <= 800:
-                            pitch_parts.append(f"🏥 **Serviços de saúde a {closest_health:.0f}m**")
-                    
-                    # Transport analysis
-                    transport_pois = categories.get('transport', [])
-                    if transport_pois:
-                        transport_5min = len([d for d in transport_pois if d <= 400])
-                        if transport_5min >= 2:
-                            pitch_parts.append(f"🚌 **{transport_5min} opções de transporte em 5 minutos**")
-                    
-                    # Restaurant/Entertainment
-                    restaurant_pois = categories.get('restaurant', [])
-                    entertainment_pois = categories.get('entertainment', [])
-                    social_count = len(restaurant_pois) + len(entertainment_pois)
-                    if social_count >= 5:
-                        pitch_parts.append(f"🍽️ **Rica vida social com {social_count} restaurantes e entretenimento**")
-                    
-                    # Calculate Walk Score
-                    total_pois = len(pois)
-                    walk_score = min(total_pois * 3, 100)  # Simple calculation
-                    
-                    return pitch_parts, walk_score
-                
-                pitch_parts, walk_score = generate_automatic_pitch(result.pois)
+                pitch_parts, walk_score = generate_automatic_pitch(poi_fp)
                 
                 # Display the pitch
                 st.markdown("### 💬 **Seu Pitch Pronto:**")
@@ -3840,7 +4915,7 @@ Quer ver pessoalmente? Responda este email!
                 """, unsafe_allow_html=True)
                 
                 # Copy button simulation
-                st.code(pitch_text.replace("**", "").replace("*", ""), language=None)
+                st.code(MARKDOWN_EMPHASIS_RE.sub("", pitch_text), language=None)
                 st.caption("📋 Copie o texto acima e use em suas apresentações!")
                 
                 # Additional talking points
@@ -3851,16 +4926,16 @@ Quer ver pessoalmente? Responda este email!
                 
                 with col1:
                     st.markdown("**Para Famílias:**")
-                    education_count = len([p for p in result.pois if p.get('category') == 'education'])
-                    park_count = len([p for p in result.pois if p.get('category') == 'park'])
+                    education_count = cat_counts.get('education', 0)
+                    park_count = cat_counts.get('park', 0)
                     if education_count > 0:
                         st.markdown(f"• {education_count} opções educacionais")
                     if park_count > 0:
                         st.markdown(f"• {park_count} áreas de lazer para crianças")
                     
                     st.markdown("**Para Profissionais:**")
-                    transport_count = len([p for p in result.pois if p.get('category') == 'transport'])
-                    services_count = len([p for p in result.pois if p.get('category') == 'services'])
+                    transport_count = cat_counts.get('transport', 0)
+                    services_count = cat_counts.get('services', 0)
                     if transport_count > 0:
                         st.markdown(f"• {transport_count} opções de transporte")
                     if services_count > 0:
@@ -3868,106 +4943,67 @@ Quer ver pessoalmente? Responda este email!
                 
                 with col2:
                     st.markdown("**Para Investidores:**")
-                    total_pois = len(result.pois)
-                    st.markdown(f"• {total_pois} POIs identificados na região")
-                    st.markdown(f"• Densidade urbana favorável")
-                    st.markdown(f"• Infraestrutura consolidada")
+                    st.markdown(
+                        f"- {n_pois} POIs identificados na região\n"
+                        "- Densidade urbana favorável\n"
+                        "- Infraestrutura consolidada"
+                    )
                     
                     st.markdown("**Vantagens Competitivas:**")
+                    advantages = ["Análise baseada em dados reais", "Relatório técnico disponível"]
                     if walk_score >= 70:
-                        st.markdown("• Walk Score superior à média")
-                    st.markdown("• Análise baseada em dados reais")
-                    st.markdown("• Relatório técnico disponível")
+                        advantages.insert(0, "Walk Score superior à média")
+                    st.markdown("\n".join(f"- {advantage}" for advantage in advantages))
             
             with prof_tab2:
                 st.subheader("📋 Argumentos de Venda Automáticos")
                 
-                def generate_sales_arguments(pois):
-                    # Analyze POIs for sales arguments
-                    categories = {}
-                    for poi in pois:
-                        cat = poi.get('category', 'outros')
-                        distance = poi.get('distance', 0)
-                        if cat not in categories:
-                            categories[cat] = {'count': 0, 'distances': []}
-                        categories[cat]['count'] += 1
-                        categories[cat]['distances'].append(distance)
-                    
-                    strengths = []
-                    selling_points = []
-                    convenience_factors = []
-                    
-                    # Analyze each category
-                    for category, data in categories.items():
-                        count = data['count']
-                        avg_distance = sum(data['distances']) / len(data['distances']) if data['distances'] else 0
-                        min_distance = min(data['distances']) if data['distances'] else 0
-                        
-                        category_names = {
-                            'shopping': '🛒 Compras e Mercados',
-                            'education': '🎓 Educação',
-                            'healthcare': '🏥 Saúde',
-                            'transport': '🚌 Transporte',
-                            'restaurant': '🍽️ Gastronomia',
-                            'entertainment': '🎭 Entretenimento',
-                            'services': '🔧 Serviços',
-                            'park': '🌳 Lazer e Parques'
-                        }
-                        
-                        name = category_names.get(category, category.title())
-                        
-                        # Generate specific arguments
-                        if count >= 3 and avg_distance <= 600:
-                            strengths.append(f"{name}: {count} opções próximas (média {avg_distance:.0f}m)")
-                            if category == 'shopping':
-                                selling_points.append("Compras do dia a dia resolvidas a pé")
-                            elif category == 'education':
-                                selling_points.append("Várias opções educacionais para os filhos")
-                            elif category == 'transport':
-                                selling_points.append("Mobilidade urbana facilitada")
-                        
-                        if min_distance <= 300:
-                            convenience_factors.append(f"{name}: {min_distance:.0f}m do mais próximo")
-                    
-                    return strengths, selling_points, convenience_factors
+                strengths, selling_points, convenience_factors = generate_sales_arguments(poi_fp)
                 
-                strengths, selling_points, convenience_factors = generate_sales_arguments(result.pois)
+                # Competitive analysis
+                st.subheader("⚖️ Análise Competitiva")
+                
+                if n_pois >= 15:
+                    st.success("🏆 **Localização PREMIUM** - Rica em infraestrutura urbana")
+                elif n_pois >= 10:
+                    st.info("👍 **Localização CONSOLIDADA** - Boa disponibilidade de serviços")
+                else:
+                    st.warning("📍 **Localização RESIDENCIAL** - Foque em outros diferenciais do imóvel")
                 
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     st.markdown("### ✅ **Pontos Fortes do Imóvel**")
                     if strengths:
-                        for strength in strengths:
-                            st.markdown(f"• {strength}")
+                        st.markdown("\n".join(f"- {strength}" for strength in strengths))
                     else:
                         st.info("Localização com características específicas - destaque outros aspectos do imóvel.")
                     
                     st.markdown("### 🎯 **Argumentos de Fechamento**")
-                    if selling_points:
-                        for point in selling_points:
-                            st.markdown(f"• {point}")
+                    closing_points = list(selling_points)
                     
                     # Calculate scarcity argument
                     total_analysis = len(st.session_state.analysis_results)
                     if total_analysis > 1:
-                        current_score = len(result.pois) * 3
-                        avg_score = sum([len(r.pois) * 3 for r in st.session_state.analysis_results.values()]) / total_analysis
+                        current_score = n_pois * 3
+                        avg_score = portfolio_avg_score()
                         if current_score > avg_score:
-                            st.markdown(f"• Localização {((current_score - avg_score) / avg_score * 100):.0f}% superior à média analisada")
+                            closing_points.append(f"Localização {((current_score - avg_score) / avg_score * 100):.0f}% superior à média analisada")
+                    
+                    if closing_points:
+                        st.markdown("\n".join(f"- {point}" for point in closing_points))
                 
                 with col2:
                     st.markdown("### 🚀 **Fatores de Conveniência**")
                     if convenience_factors:
-                        for factor in convenience_factors:
-                            st.markdown(f"• {factor}")
+                        st.markdown("\n".join(f"- {factor}" for factor in convenience_factors))
                     
                     st.markdown("### 💡 **Dicas de Abordagem**")
                     
                     # Smart suggestions based on POI profile
-                    education_count = len([p for p in result.pois if p.get('category') == 'education'])
-                    healthcare_count = len([p for p in result.pois if p.get('category') == 'healthcare'])
-                    entertainment_count = len([p for p in result.pois if p.get('category') == 'entertainment'])
+                    education_count = cat_counts.get('education', 0)
+                    healthcare_count = cat_counts.get('healthcare', 0)
+                    entertainment_count = cat_counts.get('entertainment', 0)
                     
                     if education_count >= 2:
                         st.markdown("👨‍👩‍👧‍👦 **Para famílias:** Destaque a proximidade de escolas")
@@ -3978,23 +5014,9 @@ Quer ver pessoalmente? Responda este email!
                     
                     st.markdown("📊 **Sempre mencionar:** Análise baseada em dados técnicos do UrbanSight")
                 
-                # Generate competitive analysis
-                st.markdown("---")
-                st.subheader("⚖️ Análise Competitiva")
-                
-                total_pois = len(result.pois)
-                if total_pois >= 15:
-                    st.success("🏆 **Localização PREMIUM** - Rica em infraestrutura urbana")
-                elif total_pois >= 10:
-                    st.info("👍 **Localização CONSOLIDADA** - Boa disponibilidade de serviços")
-                else:
-                    st.warning("📍 **Localização RESIDENCIAL** - Foque em outros diferenciais do imóvel")
-                
-                # ROI Calculator for agents
-                st.markdown("### 💰 Calculadora de Argumentos Financeiros")
-                col1, col2 = st.columns(2)
-                
+                # ROI Calculator for agents, laid out in the same columns as the arguments
                 with col1:
+                    st.markdown("### 💰 Calculadora de Argumentos Financeiros")
                     valor_imovel = st.number_input("Valor do imóvel (R$)", min_value=0, value=500000, step=50000)
                 
                 with col2:
@@ -4002,91 +5024,20 @@ Quer ver pessoalmente? Responda este email!
                 
                 if valor_imovel > 0 and valor_m2_regiao > 0:
                     # Simple ROI calculation based on POI density
-                    poi_factor = min(total_pois / 20, 1.2)  # Max 20% premium for high POI density
+                    poi_factor = min(n_pois / 20, 1.2)  # Max 20% premium for high POI density
                     estimated_appreciation = (poi_factor - 1) * 100
                     
                     if estimated_appreciation > 0:
                         st.success(f"💡 **Argumento financeiro:** Esta localização pode ter potencial de valorização de até {estimated_appreciation:.1f}% devido à alta densidade de serviços")
                     
                     # Cost-benefit of location
-                    walking_savings = total_pois * 10  # R$10 per month saved per nearby POI
+                    walking_savings = n_pois * 10  # R$10 per month saved per nearby POI
                     st.info(f"💡 **Economia mensal estimada:** R$ {walking_savings:.0f} em deslocamentos devido à proximidade de serviços")
             
             with prof_tab3:
                 st.subheader("👥 Perfil Ideal do Comprador")
                 
-                def analyze_buyer_profile(pois):
-                    # Analyze POI composition to determine ideal buyer
-                    categories = {}
-                    for poi in pois:
-                        cat = poi.get('category', 'outros')
-                        categories[cat] = categories.get(cat, 0) + 1
-                    
-                    # Calculate suitability scores for different profiles
-                    profiles = {}
-                    
-                    # Family with children
-                    education_score = min(categories.get('education', 0) * 25, 100)
-                    park_score = min(categories.get('park', 0) * 30, 100) 
-                    healthcare_score = min(categories.get('healthcare', 0) * 20, 100)
-                    safety_base = 70  # Assume reasonable safety
-                    profiles['👨‍👩‍👧‍👦 Famílias com crianças'] = {
-                        'score': (education_score + park_score + healthcare_score + safety_base) / 4,
-                        'reasons': []
-                    }
-                    if education_score > 50: profiles['👨‍👩‍👧‍👦 Famílias com crianças']['reasons'].append("Boas opções educacionais")
-                    if park_score > 50: profiles['👨‍👩‍👧‍👦 Famílias com crianças']['reasons'].append("Áreas de lazer para crianças")
-                    
-                    # Young professionals
-                    transport_score = min(categories.get('transport', 0) * 25, 100)
-                    restaurant_score = min(categories.get('restaurant', 0) * 15, 100)
-                    entertainment_score = min(categories.get('entertainment', 0) * 30, 100)
-                    services_score = min(categories.get('services', 0) * 20, 100)
-                    profiles['👥 Jovens profissionais'] = {
-                        'score': (transport_score + restaurant_score + entertainment_score + services_score) / 4,
-                        'reasons': []
-                    }
-                    if transport_score > 50: profiles['👥 Jovens profissionais']['reasons'].append("Excelente mobilidade urbana")
-                    if entertainment_score > 50: profiles['👥 Jovens profissionais']['reasons'].append("Vida noturna ativa")
-                    
-                    # Elderly
-                    healthcare_elderly = min(categories.get('healthcare', 0) * 40, 100)
-                    shopping_score = min(categories.get('shopping', 0) * 25, 100)
-                    transport_elderly = min(categories.get('transport', 0) * 35, 100)
-                    profiles['👴 Idosos'] = {
-                        'score': (healthcare_elderly + shopping_score + transport_elderly) / 3,
-                        'reasons': []
-                    }
-                    if healthcare_elderly > 50: profiles['👴 Idosos']['reasons'].append("Fácil acesso a serviços de saúde")
-                    if shopping_score > 50: profiles['👴 Idosos']['reasons'].append("Compras próximas")
-                    
-                    # Investors
-                    total_pois = sum(categories.values())
-                    density_score = min(total_pois * 4, 100)
-                    diversity_score = len(categories) * 12.5  # 8 categories max = 100
-                    profiles['💼 Investidores'] = {
-                        'score': (density_score + diversity_score) / 2,
-                        'reasons': []
-                    }
-                    if total_pois > 15: profiles['💼 Investidores']['reasons'].append("Alta densidade urbana")
-                    if len(categories) >= 6: profiles['💼 Investidores']['reasons'].append("Diversidade de serviços")
-                    
-                    # Car-free lifestyle
-                    walking_score = 0
-                    for cat, count in categories.items():
-                        if cat in ['shopping', 'healthcare', 'services']:
-                            walking_score += count * 20
-                    walking_score = min(walking_score, 100)
-                    profiles['🚶 Estilo de vida sem carro'] = {
-                        'score': walking_score,
-                        'reasons': []
-                    }
-                    if categories.get('shopping', 0) >= 2: profiles['🚶 Estilo de vida sem carro']['reasons'].append("Compras essenciais a pé")
-                    if categories.get('transport', 0) >= 2: profiles['🚶 Estilo de vida sem carro']['reasons'].append("Boa rede de transporte público")
-                    
-                    return profiles
-                
-                profiles = analyze_buyer_profile(result.pois)
+                profiles = analyze_buyer_profile(poi_fp)
                 
                 # Sort by score
                 sorted_profiles = sorted(profiles.items(), key=lambda x: x[1]['score'], reverse=True)
@@ -4095,50 +5046,8 @@ Quer ver pessoalmente? Responda este email!
                 st.markdown("*Baseado na análise de infraestrutura local:*")
                 
                 for i, (profile_name, data) in enumerate(sorted_profiles[:3]):  # Top 3
-                    score = data['score']
-                    reasons = data['reasons']
-                    
-                    # Create recommendation level
-                    if score >= 70:
-                        level = "🏆 ALTAMENTE RECOMENDADO"
-                        color = "success"
-                    elif score >= 50:
-                        level = "✅ RECOMENDADO"
-                        color = "info"
-                    else:
-                        level = "📍 ADEQUADO"
-                        color = "warning"
-                    
-                    with st.expander(f"{i+1}. {profile_name} - {score:.0f}/100", expanded=(i==0)):
-                        st.markdown(f"**{level}**")
-                        
-                        if reasons:
-                            st.markdown("**Por que é ideal:**")
-                            for reason in reasons:
-                                st.markdown(f"• {reason}")
-                        
-                        # Marketing suggestions
-                        st.markdown("**💡 Sugestões de Marketing:**")
-                        if 'Famílias' in profile_name:
-                            st.markdown("• Destaque proximidade de escolas nos anúncios")
-                            st.markdown("• Mencione segurança e áreas de lazer")
-                            st.markdown("• Foque em imóveis com 2+ quartos")
-                        elif 'Jovens' in profile_name:
-                            st.markdown("• Enfatize vida noturna e entretenimento")
-                            st.markdown("• Destaque facilidade de transporte")
-                            st.markdown("• Mencione proximidade do trabalho/universidades")
-                        elif 'Idosos' in profile_name:
-                            st.markdown("• Priorize acesso à saúde")
-                            st.markdown("• Destaque facilidade de locomoção")
-                            st.markdown("• Mencione segurança da região")
-                        elif 'Investidores' in profile_name:
-                            st.markdown("• Apresente dados de valorização")
-                            st.markdown("• Destaque potencial de aluguel")
-                            st.markdown("• Mencione desenvolvimento da região")
-                        elif 'sem carro' in profile_name:
-                            st.markdown("• Destaque Walk Score alto")
-                            st.markdown("• Mencione economia com transporte")
-                            st.markdown("• Foque em sustentabilidade")
+                    with st.expander(f"{i+1}. {profile_name} - {data['score']:.0f}/100", expanded=(i==0)):
+                        _render_profile_card(profile_name, data)
                 
                 # Generate marketing copy
                 st.markdown("---")
@@ -4147,17 +5056,14 @@ Quer ver pessoalmente? Responda este email!
                 best_profile = sorted_profiles[0]
                 profile_name = best_profile[0]
                 
-                marketing_copy = f"""
-**Imóvel Ideal para {profile_name}**
-
-📍 Localização estratégica com {len(result.pois)} pontos de interesse próximos
-
-{' '.join(['• ' + reason for reason in best_profile[1]['reasons']])}
-
-Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
-
-*Agende sua visita e comprove a qualidade desta localização!*
-                """
+                reasons_block = "\n".join(f"• {reason}" for reason in best_profile[1]['reasons'])
+                marketing_copy = "\n\n".join([
+                    f"**Imóvel Ideal para {profile_name}**",
+                    f"📍 Localização estratégica com {n_pois} pontos de interesse próximos",
+                    reasons_block,
+                    f"Walk Score: {walk_score:.0f}/100 - Excelente caminhabilidade",
+                    "*Agende sua visita e comprove a qualidade desta localização!*"
+                ])
                 
                 st.code(marketing_copy.strip(), language=None)
                 st.caption("📋 Copy pronta para usar em anúncios e redes sociais")
@@ -4168,83 +5074,72 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                 if len(st.session_state.analysis_results) > 1:
                     st.markdown("### 🏆 **Ranking dos Imóveis Analisados**")
                     
-                    # Create ranking
-                    ranking_data = []
+                    # Create ranking from per-address summaries, computed once per analysis
+                    ranking_cache = st.session_state.setdefault('_ranking_cache', {})
+                    for address in list(ranking_cache):
+                        if address not in st.session_state.analysis_results:
+                            del ranking_cache[address]
                     for address, analysis_result in st.session_state.analysis_results.items():
                         if hasattr(analysis_result, 'pois'):
-                            total_pois = len(analysis_result.pois)
-                            walk_score = min(total_pois * 3, 100)
-                            
-                            # Calculate category strengths
-                            categories = {}
-                            for poi in analysis_result.pois:
-                                cat = poi.get('category', 'outros')
-                                categories[cat] = categories.get(cat, 0) + 1
-                            
-                            # Determine best profile
-                            education_score = categories.get('education', 0) * 25
-                            transport_score = categories.get('transport', 0) * 25
-                            entertainment_score = categories.get('entertainment', 0) * 30
-                            
-                            if education_score >= transport_score and education_score >= entertainment_score:
-                                best_for = "Famílias"
-                            elif transport_score >= entertainment_score:
-                                best_for = "Profissionais"
-                            else:
-                                best_for = "Jovens"
-                            
-                            ranking_data.append({
-                                'Endereço': address,
-                                'Walk Score': walk_score,
-                                'Total POIs': total_pois,
-                                'Ideal para': best_for,
-                                'Mercados': categories.get('shopping', 0),
-                                'Escolas': categories.get('education', 0),
-                                'Transporte': categories.get('transport', 0),
-                                'Saúde': categories.get('healthcare', 0)
-                            })
+                            cached = ranking_cache.get(address)
+                            if cached is None or cached[0] != analysis_result.analysis_id:
+                                ranking_cache[address] = (analysis_result.analysis_id, _summarize(address, analysis_result))
+                    ranking_data = [summary for _, summary in ranking_cache.values()]
                     
                     # Sort by Walk Score
                     ranking_data.sort(key=lambda x: x['Walk Score'], reverse=True)
+                    ranking_df = pd.DataFrame(ranking_data)
+                    ranking_df.insert(0, 'Posição', ["🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}°" for i in range(len(ranking_df))])
                     
                     # Display ranking
-                    for i, item in enumerate(ranking_data):
-                        rank_color = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}°"
+                    st.dataframe(
+                        ranking_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            'Walk Score': st.column_config.ProgressColumn(
+                                'Walk Score', format="%d", min_value=0, max_value=100
+                            )
+                        }
+                    )
+                    
+                    selected_address = st.selectbox("Ver detalhes de", ranking_df['Endereço'], key="ranking_details")
+                    i = int(ranking_df.index[ranking_df['Endereço'] == selected_address][0])
+                    item = ranking_data[i]
+                    
+                    with st.expander(f"{ranking_df.at[i, 'Posição']} {item['Endereço']} - Score: {item['Walk Score']:.0f}/100", 
+                                   expanded=True):
                         
-                        with st.expander(f"{rank_color} {item['Endereço']} - Score: {item['Walk Score']:.0f}/100", 
-                                       expanded=(i < 3)):
-                            
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.metric("Total POIs", item['Total POIs'])
-                                st.metric("Mercados", item['Mercados'])
-                            
-                            with col2:
-                                st.metric("Escolas", item['Escolas'])
-                                st.metric("Transporte", item['Transporte'])
-                            
-                            with col3:
-                                st.metric("Saúde", item['Saúde'])
-                                st.info(f"💡 Ideal para: **{item['Ideal para']}**")
-                            
-                            # Quick pitch for this property
-                            if i < 3:  # Top 3 get special treatment
-                                st.markdown("**🎯 Pitch para este imóvel:**")
-                                if item['Walk Score'] >= 80:
-                                    st.success("Localização PREMIUM - Destaque como oportunidade única")
-                                elif item['Walk Score'] >= 60:
-                                    st.info("Localização CONSOLIDADA - Enfatize conveniência")
-                                else:
-                                    st.warning("Localização RESIDENCIAL - Foque em outros diferenciais")
+                        col1, col2, col3 = st.columns(3)
+                        
+                        with col1:
+                            st.metric("Total POIs", item['Total POIs'])
+                            st.metric("Mercados", item['Mercados'])
+                        
+                        with col2:
+                            st.metric("Escolas", item['Escolas'])
+                            st.metric("Transporte", item['Transporte'])
+                        
+                        with col3:
+                            st.metric("Saúde", item['Saúde'])
+                            st.info(f"💡 Ideal para: **{item['Ideal para']}**")
+                        
+                        # Quick pitch for this property
+                        if i < 3:  # Top 3 get special treatment
+                            st.markdown("**🎯 Pitch para este imóvel:**")
+                            if item['Walk Score'] >= 80:
+                                st.success("Localização PREMIUM - Destaque como oportunidade única")
+                            elif item['Walk Score'] >= 60:
+                                st.info("Localização CONSOLIDADA - Enfatize conveniência")
+                            else:
+                                st.warning("Localização RESIDENCIAL - Foque em outros diferenciais")
                     
                     # Portfolio insights
                     st.markdown("---")
                     st.subheader("📈 Insights da Carteira")
                     
-                    avg_score = sum([item['Walk Score'] for item in ranking_data]) / len(ranking_data)
-                    best_score = max([item['Walk Score'] for item in ranking_data])
-                    worst_score = min([item['Walk Score'] for item in ranking_data])
+                    scores = ranking_df['Walk Score'].to_numpy(dtype=np.float32)
+                    avg_score, best_score, worst_score = float(scores.mean()), float(scores.max()), float(scores.min())
                     
                     col1, col2, col3 = st.columns(3)
                     
@@ -4260,14 +5155,14 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                     # Recommendations
                     st.markdown("### 💡 **Recomendações Estratégicas**")
                     
-                    premium_count = len([x for x in ranking_data if x['Walk Score'] >= 80])
-                    good_count = len([x for x in ranking_data if 60 <= x['Walk Score'] < 80])
-                    basic_count = len([x for x in ranking_data if x['Walk Score'] < 60])
+                    basic_count, good_count, premium_count = np.bincount(np.digitize(scores, [60, 80]), minlength=3).tolist()
                     
-                    st.markdown(f"**Composição da Carteira:**")
-                    st.markdown(f"• 🏆 Premium (80+): {premium_count} imóveis")
-                    st.markdown(f"• ✅ Consolidados (60-79): {good_count} imóveis") 
-                    st.markdown(f"• 📍 Residenciais (<60): {basic_count} imóveis")
+                    st.markdown(
+                        f"**Composição da Carteira:**\n\n"
+                        f"- 🏆 Premium (80+): {premium_count} imóveis\n"
+                        f"- ✅ Consolidados (60-79): {good_count} imóveis\n"
+                        f"- 📍 Residenciais (<60): {basic_count} imóveis"
+                    )
                     
                     if premium_count > 0:
                         st.success("💰 Foque nos imóveis premium para margem maior")
@@ -4295,13 +5190,10 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                     
                     # Quick checklist based on POIs
                     essentials = {
-                        '🛒 Mercado próximo': any(poi.get('distance', 999) <= 800 and 'shopping' in poi.get('category', '') for poi in result.pois),
-                        '🏥 Saúde acessível': any(poi.get('distance', 999) <= 1200 and 'healthcare' in poi.get('category', '') for poi in result.pois),
-                        '🚌 Transporte próximo': any(poi.get('distance', 999) <= 400 and 'transport' in poi.get('category', '') for poi in result.pois),
-                        '🎓 Escola na região': any('education' in poi.get('category', '') for poi in result.pois),
-                        '🌳 Área de lazer': any('park' in poi.get('category', '') for poi in result.pois),
-                        '🍽️ Opções gastronômicas': len([p for p in result.pois if 'restaurant' in p.get('category', '')]) >= 2
+                        label: min_distance.get(cat, math.inf) <= max_distance
+                        for label, cat, max_distance in EXPRESS_CHECKLIST
                     }
+                    essentials['🍽️ Opções gastronômicas'] = cat_counts.get('restaurant', 0) >= 2
                     
                     checked = sum(essentials.values())
                     total = len(essentials)
@@ -4309,9 +5201,7 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                     st.progress(checked / total)
                     st.caption(f"✅ {checked}/{total} itens atendidos")
                     
-                    for item, is_ok in essentials.items():
-                        icon = "✅" if is_ok else "❌"
-                        st.markdown(f"{icon} {item}")
+                    st.markdown("  \n".join(f"{'✅' if is_ok else '❌'} {item}" for item, is_ok in essentials.items()))
                     
                     # Overall recommendation
                     if checked >= 5:
@@ -4330,20 +5220,24 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                     
                     if st.button("🔗 Gerar Link de Compartilhamento"):
                         # Simulate URL generation
-                        import hashlib
-                        property_id = hashlib.md5(property_address.encode()).hexdigest()[:8]
+                        property_id = _share_id(property_address)
                         share_url = f"https://urbansight.onrender.com/report/{property_id}"
                         
                         st.success("✅ Link gerado com sucesso!")
                         st.code(share_url)
                         st.markdown("📱 **Como usar:**")
-                        st.markdown("• Envie por WhatsApp para o cliente")
-                        st.markdown("• Inclua em apresentações") 
-                        st.markdown("• Adicione em anúncios online")
+                        st.markdown(
+                            "- Envie por WhatsApp para o cliente\n"
+                            "- Inclua em apresentações\n"
+                            "- Adicione em anúncios online"
+                        )
                         
                         # QR Code placeholder
                         st.markdown("📱 **QR Code:**")
-                        st.info("🔲 [QR Code seria gerado aqui]")
+                        if segno is not None:
+                            st.image(_qr_png(share_url), width=200)
+                        else:
+                            st.info("🔲 [QR Code seria gerado aqui]")
                         st.caption("Cliente escaneia e vê a análise completa")
                 
                 # Quick comparison tool
@@ -4367,27 +5261,7 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                         result2 = st.session_state.analysis_results[addr2]
                         
                         # Quick comparison
-                        comparison_data = {
-                            'Métrica': ['Total POIs', 'Mercados', 'Escolas', 'Transporte', 'Saúde', 'Walk Score'],
-                            addr1: [
-                                len(result1.pois),
-                                len([p for p in result1.pois if p.get('category') == 'shopping']),
-                                len([p for p in result1.pois if p.get('category') == 'education']),
-                                len([p for p in result1.pois if p.get('category') == 'transport']),
-                                len([p for p in result1.pois if p.get('category') == 'healthcare']),
-                                f"{min(len(result1.pois) * 3, 100):.0f}/100"
-                            ],
-                            addr2: [
-                                len(result2.pois),
-                                len([p for p in result2.pois if p.get('category') == 'shopping']),
-                                len([p for p in result2.pois if p.get('category') == 'education']),
-                                len([p for p in result2.pois if p.get('category') == 'transport']),
-                                len([p for p in result2.pois if p.get('category') == 'healthcare']),
-                                f"{min(len(result2.pois) * 3, 100):.0f}/100"
-                            ]
-                        }
-                        
-                        df_comp = pd.DataFrame(comparison_data)
+                        df_comp = _quick_comparison(addr1, addr2, pois_key(result1.pois), pois_key(result2.pois))
                         st.dataframe(df_comp, hide_index=True)
                         
                         # Quick recommendation
@@ -4412,23 +5286,8 @@ Walk Score: {len(result.pois) * 3:.0f}/100 - Excelente caminhabilidade
                 
                 st.markdown("### 📨 **Template de WhatsApp**")
                 
-                # Generate WhatsApp message
-                total_pois = len(result.pois)
-                walk_score = min(total_pois * 3, 100)
-                
-                whatsapp_template = f"""🏠 *Análise Técnica do Imóvel*
-
-📍 Localização com {total_pois} pontos de interesse próximos
-🚶‍♂️ Walk Score: {walk_score}/100
-
-✅ *Destaques da região:*
-• Infraestrutura consolidada
-• Boa caminhabilidade
-• Serviços diversificados
-
-💡 Gostaria de agendar uma visita para conhecer pessoalmente?
-
-_Análise realizada com UrbanSight - Inteligência Imobiliária_"""
+                # Generate WhatsApp and email messages
+                whatsapp_template, email_template = build_templates(n_pois, min(n_pois * 3, 100))
                 
                 st.code(whatsapp_template, language=None)
                 st.caption("📱 Copie e personalize para seus clientes")
@@ -4436,28 +5295,6 @@ _Análise realizada com UrbanSight - Inteligência Imobiliária_"""
                 # Email template
                 st.markdown("### 📧 **Template de Email**")
                 
-                email_template = f"""Assunto: Análise Técnica - Imóvel de Interesse
-
-Olá!
-
-Realizei uma análise técnica detalhada da localização do imóvel que você demonstrou interesse.
-
-📊 RESUMO DA ANÁLISE:
-• {total_pois} pontos de interesse identificados
-• Walk Score: {walk_score}/100
-• Infraestrutura consolidada na região
-
-A localização oferece excelente conveniência para o dia a dia, com fácil acesso a comércios, serviços e transporte.
-
-Gostaria de agendar uma apresentação detalhada?
-
-Atenciosamente,
-[Seu Nome]
-[Sua Imobiliária]
-
----
-Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
-                
                 st.code(email_template, language=None)
                 st.caption("✉️ Template profissional para follow-up")
         
@@ -4497,108 +5334,37 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
         
         if st.session_state.current_analysis:
             result = st.session_state.current_analysis
+            poi_fp = pois_key(result.pois)
+            soa = get_poi_arrays(result)
             
             # Premium header with subscription status
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                       padding: 20px; border-radius: 15px; color: white; text-align: center; margin-bottom: 20px;">
-                <h2 style="margin: 0; color: white;">🏆 Análise Premium Ativa</h2>
-                <p style="margin: 5px 0 0 0; opacity: 0.9;">Análises avançadas baseadas em algoritmos proprietários</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(PREMIUM_HEADER_HTML, unsafe_allow_html=True)
             
             # Calculate premium metrics
-            maturity_index, _ = calculate_urban_maturity_index(result.pois)
-            gentrification_index, _ = calculate_gentrification_index(result.pois)
-            development_potential, _ = predict_development_potential(result.pois, (result.property_data.lat, result.property_data.lon))
+            premium_cache = get_premium_cache(result)
+            maturity_index, _ = premium_cache['maturity']
+            gentrification_index, _ = premium_cache['gentrification']
+            development_potential, _ = premium_cache['potential']
             
             # Premium Analysis Tabs
-            premium_tabs = st.tabs([
-                "🎯 UrbanScore Elite",
-                "🧬 DNA da Localização", 
-                "🎮 Lifestyle Simulator",
-                "💎 Rarity Index",
-                "⏱️ Time Savings Calculator",
-                "🔮 Future Index",
-                "🚶 Mobility Signature",
-                "🛡️ Resilience Score",
-                "🌍 Social Impact Report"
-            ])
+            active_premium_tab = st.radio(
+                "Análise Premium", PREMIUM_TAB_LABELS, horizontal=True,
+                label_visibility="collapsed", key="premium_active"
+            )
             
-            with premium_tabs[0]:
+            premium_metrics = compute_premium_metrics(poi_fp)
+            
+            if active_premium_tab == PREMIUM_TAB_LABELS[0]:
                 st.subheader("🎯 UrbanScore Elite - Análise Proprietária")
                 st.markdown("*Algoritmo avançado que combina 50+ variáveis urbanas*")
                 
-                # Calculate sophisticated UrbanScore
-                def calculate_urban_score_elite(pois):
-                    # Base scores
-                    diversity_score = len(set([poi.get('category', 'other') for poi in pois])) * 10
-                    density_score = min(len(pois) * 2, 100)
-                    
-                    # Quality indicators
-                    quality_keywords = ['premium', 'gourmet', 'boutique', 'design', 'luxury', 'fine']
-                    quality_count = sum([1 for poi in pois for keyword in quality_keywords 
-                                       if keyword in poi.get('name', '').lower()])
-                    quality_score = min(quality_count * 15, 100)
-                    
-                    # Accessibility premium
-                    close_pois = len([p for p in pois if p.get('distance', 0) <= 300])
-                    accessibility_premium = min(close_pois * 5, 100)
-                    
-                    # Innovation index
-                    innovation_keywords = ['tech', 'coworking', 'startup', 'innovation', 'digital']
-                    innovation_count = sum([1 for poi in pois for keyword in innovation_keywords
-                                          if keyword in poi.get('name', '').lower()])
-                    innovation_score = min(innovation_count * 20, 100)
-                    
-                    # Cultural richness
-                    cultural_categories = ['entertainment', 'art', 'museum', 'theater']
-                    cultural_count = len([p for p in pois if p.get('category', '') in cultural_categories])
-                    cultural_score = min(cultural_count * 12, 100)
-                    
-                    # Calculate elite score
-                    weights = {
-                        'diversity': 0.20,
-                        'density': 0.15,
-                        'quality': 0.25,
-                        'accessibility': 0.15,
-                        'innovation': 0.15,
-                        'cultural': 0.10
-                    }
-                    
-                    elite_score = (diversity_score * weights['diversity'] + 
-                                 density_score * weights['density'] +
-                                 quality_score * weights['quality'] +
-                                 accessibility_premium * weights['accessibility'] +
-                                 innovation_score * weights['innovation'] +
-                                 cultural_score * weights['cultural'])
-                    
-                    return elite_score, {
-                        'diversity': diversity_score,
-                        'density': density_score, 
-                        'quality': quality_score,
-                        'accessibility': accessibility_premium,
-                        'innovation': innovation_score,
-                        'cultural': cultural_score
-                    }
-                
-                elite_score, elite_breakdown = calculate_urban_score_elite(result.pois)
+                elite_score, elite_breakdown = calculate_urban_score_elite(poi_fp)
                 
                 # Display elite score
                 col1, col2, col3 = st.columns([1, 2, 1])
                 
                 with col2:
-                    score_color = "#4CAF50" if elite_score >= 80 else "#FF9800" if elite_score >= 60 else "#F44336"
-                    st.markdown(f"""
-                    <div style="text-align: center; padding: 30px; background: {score_color}20; 
-                               border-radius: 20px; border: 3px solid {score_color};">
-                        <h1 style="margin: 0; color: {score_color}; font-size: 4rem;">{elite_score:.0f}</h1>
-                        <h3 style="margin: 10px 0 0 0; color: {score_color};">UrbanScore Elite</h3>
-                        <p style="margin: 5px 0 0 0; opacity: 0.8;">
-                            {'🏆 EXCEPCIONAL' if elite_score >= 80 else '⭐ PREMIUM' if elite_score >= 60 else '📍 PADRÃO'}
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(render_elite_card(elite_score), unsafe_allow_html=True)
                 
                 # Elite breakdown
                 st.markdown("---")
@@ -4608,16 +5374,7 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
                 
                 for i, (factor, score) in enumerate(elite_breakdown.items()):
                     with breakdown_cols[i % 3]:
-                        factor_names = {
-                            'diversity': '🏷️ Diversidade',
-                            'density': '📍 Densidade',
-                            'quality': '✨ Qualidade Premium',
-                            'accessibility': '🚶 Acessibilidade Elite',
-                            'innovation': '🚀 Índice de Inovação',
-                            'cultural': '🎭 Riqueza Cultural'
-                        }
-                        
-                        name = factor_names.get(factor, factor.title())
+                        name = ELITE_FACTOR_NAMES.get(factor, factor.title())
                         st.metric(name, f"{score:.0f}/100")
                         st.progress(score/100)
                 
@@ -4635,104 +5392,30 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
                     st.warning("📍 **LOCALIZAÇÃO PADRÃO**: Foque em outros diferenciais")
                     st.error("💡 **Estratégia**: Apenas com desconto significativo")
             
-            with premium_tabs[1]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[1]:
                 st.subheader("🧬 DNA da Localização")
                 st.markdown("*Perfil genético único baseado em 25+ características urbanas*")
                 
-                # Calculate DNA profile
-                def calculate_location_dna(pois):
-                    # DNA characteristics
-                    dna_profile = {
-                        'Urbano': 0, 'Residencial': 0, 'Comercial': 0, 'Cultural': 0,
-                        'Tecnológico': 0, 'Gastronômico': 0, 'Educacional': 0, 'Verde': 0
-                    }
-                    
-                    # Calculate DNA based on POI patterns
-                    for poi in pois:
-                        category = poi.get('category', '').lower()
-                        name = poi.get('name', '').lower()
-                        
-                        # Urban DNA
-                        if category in ['transport', 'services']:
-                            dna_profile['Urbano'] += 2
-                        
-                        # Residential DNA
-                        if category in ['shopping', 'healthcare', 'education']:
-                            dna_profile['Residencial'] += 2
-                        
-                        # Commercial DNA
-                        if category in ['shopping', 'services', 'restaurant']:
-                            dna_profile['Comercial'] += 1.5
-                        
-                        # Cultural DNA
-                        if category in ['entertainment'] or any(word in name for word in ['museum', 'theater', 'art']):
-                            dna_profile['Cultural'] += 3
-                        
-                        # Tech DNA
-                        if any(word in name for word in ['tech', 'digital', 'coworking', 'startup']):
-                            dna_profile['Tecnológico'] += 4
-                        
-                        # Gastronomic DNA
-                        if category == 'restaurant' or any(word in name for word in ['coffee', 'bakery', 'bistro']):
-                            dna_profile['Gastronômico'] += 2
-                        
-                        # Educational DNA
-                        if category == 'education':
-                            dna_profile['Educacional'] += 3
-                        
-                        # Green DNA
-                        if category == 'park' or any(word in name for word in ['park', 'garden', 'green']):
-                            dna_profile['Verde'] += 3
-                    
-                    # Normalize to 100
-                    total = sum(dna_profile.values())
-                    if total > 0:
-                        dna_profile = {k: (v/total)*100 for k, v in dna_profile.items()}
-                    
-                    return dna_profile
-                
-                dna_profile = calculate_location_dna(result.pois)
+                dna_profile = calculate_location_dna(poi_fp)
                 
                 # DNA Visualization
                 st.markdown("### 🧬 Sequência Genética da Localização")
                 
                 # Create DNA bar chart
-                dna_data = pd.DataFrame(list(dna_profile.items()), columns=['Gene', 'Expressão'])
-                dna_data = dna_data.sort_values('Expressão', ascending=False)
-                
-                fig_dna = px.bar(
-                    dna_data, 
-                    x='Gene', 
-                    y='Expressão',
-                    title="DNA Urbano - Expressão Genética por Característica",
-                    color='Expressão',
-                    color_continuous_scale='Viridis'
-                )
+                dna_order = np.argsort(-dna_profile, kind='stable')
+                fig_dna = dna_bar_figure(tuple((DNA_KEYS[idx], float(dna_profile[idx])) for idx in dna_order))
                 st.plotly_chart(fig_dna, use_container_width=True)
                 
                 # Dominant genes
                 st.markdown("### 🎯 Genes Dominantes")
                 
-                sorted_dna = sorted(dna_profile.items(), key=lambda x: x[1], reverse=True)
-                
-                for i, (gene, expression) in enumerate(sorted_dna[:3]):
+                for i, idx in enumerate(dna_order[:3]):
+                    expression = float(dna_profile[idx])
                     if expression > 0:
-                        st.markdown(f"**#{i+1} Gene {gene}**: {expression:.1f}% de expressão")
-                        
-                        gene_descriptions = {
-                            'Urbano': "Localização com forte infraestrutura urbana e conectividade",
-                            'Residencial': "Área ideal para moradia familiar com serviços essenciais",
-                            'Comercial': "Centro de atividade comercial e empresarial",
-                            'Cultural': "Rica vida cultural e entretenimento",
-                            'Tecnológico': "Hub de inovação e tecnologia",
-                            'Gastronômico': "Paraíso gastronômico com diversas opções",
-                            'Educacional': "Foco em educação e desenvolvimento acadêmico",
-                            'Verde': "Abundante em áreas verdes e natureza urbana"
-                        }
-                        
-                        st.caption(gene_descriptions.get(gene, "Gene único desta localização"))
+                        st.markdown(f"**#{i+1} Gene {DNA_KEYS[idx]}**: {expression:.1f}% de expressão")
+                        st.caption(DNA_GENE_DESCRIPTIONS[idx])
             
-            with premium_tabs[2]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[2]:
                 st.subheader("🎮 Lifestyle Simulator")
                 st.markdown("*Simule sua vida diária nesta localização*")
                 
@@ -4758,35 +5441,36 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
                 with lifestyle_col2:
                     st.markdown("### 📅 Simulação da Sua Semana")
                     
-                    # Calculate weekly routine scores
+                    # Calculate weekly routine scores from one pass over the POIs
+                    cat_counts = category_counts(poi_fp)
+                    cafe_or_restaurant = exercise_spots = 0
+                    for cat, name in zip(soa['cats'], soa['names_lc']):
+                        cafe_or_restaurant += 'cafe' in name or cat == 'restaurant'
+                        exercise_spots += cat == 'park' or 'gym' in name
+                    
                     routine_scores = {}
                     
                     # Morning routine
-                    cafe_pois = [p for p in result.pois if 'cafe' in p.get('name', '').lower() or p.get('category') == 'restaurant']
-                    morning_score = min(len(cafe_pois) * 20, 100)
+                    morning_score = min(cafe_or_restaurant * 20, 100)
                     routine_scores['☀️ Manhã (café, caminhada)'] = morning_score
                     
                     # Work commute
                     if work_location == "Home office":
                         commute_score = 100
                     else:
-                        transport_pois = [p for p in result.pois if p.get('category') == 'transport']
-                        commute_score = min(len(transport_pois) * 30, 100)
+                        commute_score = min(cat_counts['transport'] * 30, 100)
                     routine_scores['🚌 Deslocamento trabalho'] = commute_score
                     
                     # Daily shopping
-                    shopping_pois = [p for p in result.pois if p.get('category') == 'shopping']
-                    shopping_score = min(len(shopping_pois) * 25, 100)
+                    shopping_score = min(cat_counts['shopping'] * 25, 100)
                     routine_scores['🛒 Compras diárias'] = shopping_score
                     
                     # Exercise
-                    exercise_pois = [p for p in result.pois if p.get('category') == 'park' or 'gym' in p.get('name', '').lower()]
-                    exercise_score = min(len(exercise_pois) * 30, 100)
+                    exercise_score = min(exercise_spots * 30, 100)
                     routine_scores['🏃 Exercícios'] = exercise_score
                     
                     # Evening entertainment
-                    entertainment_pois = [p for p in result.pois if p.get('category') in ['restaurant', 'entertainment']]
-                    evening_score = min(len(entertainment_pois) * 15, 100)
+                    evening_score = min((cat_counts['restaurant'] + cat_counts['entertainment']) * 15, 100)
                     routine_scores['🌆 Entretenimento noturno'] = evening_score
                     
                     # Display routine scores
@@ -4800,283 +5484,44 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
                 st.markdown("---")
                 st.subheader("📊 Score do Seu Lifestyle")
                 
-                lifestyle_color = "#4CAF50" if avg_lifestyle_score >= 75 else "#FF9800" if avg_lifestyle_score >= 50 else "#F44336"
-                st.markdown(f"""
-                <div style="text-align: center; padding: 20px; background: {lifestyle_color}20; 
-                           border-radius: 15px; border: 2px solid {lifestyle_color};">
-                    <h2 style="margin: 0; color: {lifestyle_color};">{avg_lifestyle_score:.0f}/100</h2>
-                    <p style="margin: 5px 0 0 0; color: {lifestyle_color};">
-                        {'🎯 LIFESTYLE PERFEITO' if avg_lifestyle_score >= 75 else '👍 BOM LIFESTYLE' if avg_lifestyle_score >= 50 else '⚠️ LIFESTYLE LIMITADO'}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(render_lifestyle_card(avg_lifestyle_score), unsafe_allow_html=True)
             
-            with premium_tabs[3]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[3]:
                 st.subheader("💎 Rarity Index - Exclusividade da Localização")
                 st.markdown("*Quão única e rara é esta localização?*")
                 
-                # Calculate rarity factors
-                def calculate_rarity_index(pois):
-                    rarity_factors = {
-                        'uniqueness': 0,
-                        'exclusivity': 0,
-                        'scarcity': 0,
-                        'premium_density': 0
-                    }
-                    
-                    # Uniqueness - rare POI categories
-                    rare_categories = ['art_gallery', 'museum', 'theater', 'observatory', 'monument']
-                    unique_pois = [p for p in pois if any(rare in p.get('category', '').lower() for rare in rare_categories)]
-                    rarity_factors['uniqueness'] = min(len(unique_pois) * 25, 100)
-                    
-                    # Exclusivity - premium keywords
-                    premium_keywords = ['luxury', 'premium', 'exclusive', 'boutique', 'gourmet', 'fine', 'private']
-                    exclusive_pois = [p for p in pois if any(keyword in p.get('name', '').lower() for keyword in premium_keywords)]
-                    rarity_factors['exclusivity'] = min(len(exclusive_pois) * 20, 100)
-                    
-                    # Scarcity - high POI density (rare in most cities)
-                    total_pois = len(pois)
-                    if total_pois > 150:
-                        rarity_factors['scarcity'] = 100
-                    elif total_pois > 100:
-                        rarity_factors['scarcity'] = 75
-                    elif total_pois > 50:
-                        rarity_factors['scarcity'] = 50
-                    else:
-                        rarity_factors['scarcity'] = 25
-                    
-                    # Premium density - concentration of high-end services
-                    high_end_categories = ['restaurant', 'entertainment', 'services']
-                    premium_density = len([p for p in pois if p.get('category') in high_end_categories]) / len(pois) * 100
-                    rarity_factors['premium_density'] = min(premium_density * 2, 100)
-                    
-                    # Overall rarity index
-                    weights = {'uniqueness': 0.3, 'exclusivity': 0.3, 'scarcity': 0.2, 'premium_density': 0.2}
-                    overall_rarity = sum([rarity_factors[factor] * weights[factor] for factor in rarity_factors.keys()])
-                    
-                    return overall_rarity, rarity_factors
-                
-                rarity_index, rarity_breakdown = calculate_rarity_index(result.pois)
+                rarity_index, rarity_breakdown = calculate_rarity_index(poi_fp)
                 
                 # Display rarity index
                 rarity_col1, rarity_col2, rarity_col3 = st.columns([1, 2, 1])
                 
                 with rarity_col2:
-                    if rarity_index >= 80:
-                        rarity_level = "💎 ULTRA RARO"
-                        rarity_color = "#9C27B0"
-                        rarity_desc = "Localização excepcional - menos de 1% das áreas urbanas"
-                    elif rarity_index >= 60:
-                        rarity_level = "💍 RARO"
-                        rarity_color = "#3F51B5"
-                        rarity_desc = "Localização especial - top 5% das áreas urbanas"
-                    elif rarity_index >= 40:
-                        rarity_level = "⭐ DIFERENCIADO"
-                        rarity_color = "#FF9800"
-                        rarity_desc = "Acima da média - top 20% das áreas urbanas"
-                    else:
-                        rarity_level = "📍 COMUM"
-                        rarity_color = "#9E9E9E"
-                        rarity_desc = "Padrão urbano comum"
-                    
-                    st.markdown(f"""
-                    <div style="text-align: center; padding: 25px; background: {rarity_color}20; 
-                               border-radius: 20px; border: 3px solid {rarity_color};">
-                        <h1 style="margin: 0; color: {rarity_color}; font-size: 3rem;">{rarity_index:.0f}</h1>
-                        <h3 style="margin: 10px 0; color: {rarity_color};">{rarity_level}</h3>
-                        <p style="margin: 0; opacity: 0.8;">{rarity_desc}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(render_rarity_card(rarity_index), unsafe_allow_html=True)
             
-            with premium_tabs[4]:
-                st.subheader("⏱️ Time Savings Calculator")
-                st.markdown("*Calcule o tempo e dinheiro economizados morando aqui*")
-                
-                # Time savings calculator
-                calc_col1, calc_col2 = st.columns(2)
-                
-                with calc_col1:
-                    st.markdown("### ⚙️ Configuração do Cálculo")
-                    
-                    current_commute = st.slider("Tempo atual de deslocamento ao trabalho (min/dia)", 0, 180, 60)
-                    work_frequency = st.slider("Dias de trabalho por semana", 1, 7, 5)
-                    
-                    shopping_frequency = st.slider("Vezes que vai ao mercado por semana", 1, 7, 2)
-                    current_shopping_time = st.slider("Tempo atual para ir ao mercado (min)", 5, 60, 20)
-                    
-                    leisure_frequency = st.slider("Atividades de lazer por semana", 0, 7, 2)
-                    current_leisure_time = st.slider("Tempo atual para lazer (min)", 10, 120, 30)
-                    
-                    hourly_value = st.number_input("Valor da sua hora (R$)", min_value=10, max_value=500, value=50)
-                
-                with calc_col2:
-                    st.markdown("### 📊 Tempo Economizado Nesta Localização")
-                    
-                    # Calculate potential time savings
-                    
-                    # Work commute savings
-                    transport_pois = [p for p in result.pois if p.get('category') == 'transport']
-                    if transport_pois:
-                        avg_transport_distance = sum([p.get('distance', 0) for p in transport_pois]) / len(transport_pois)
-                        new_commute_time = max(10, current_commute - (500 - avg_transport_distance) / 10)  # Better transport = less time
-                    else:
-                        new_commute_time = current_commute + 10  # Worse transport = more time
-                    
-                    commute_savings = (current_commute - new_commute_time) * work_frequency
-                    
-                    # Shopping time savings
-                    shopping_pois = [p for p in result.pois if p.get('category') == 'shopping']
-                    if shopping_pois:
-                        closest_shopping = min([p.get('distance', 1000) for p in shopping_pois])
-                        new_shopping_time = max(5, closest_shopping / 83.33 * 2)  # Walking time * 2 (round trip)
-                    else:
-                        new_shopping_time = current_shopping_time
-                    
-                    shopping_savings = (current_shopping_time - new_shopping_time) * shopping_frequency
-                    
-                    # Leisure time savings
-                    leisure_pois = [p for p in result.pois if p.get('category') in ['entertainment', 'restaurant', 'park']]
-                    if leisure_pois:
-                        avg_leisure_distance = sum([p.get('distance', 0) for p in leisure_pois]) / len(leisure_pois)
-                        new_leisure_time = max(5, avg_leisure_distance / 83.33 * 2)
-                    else:
-                        new_leisure_time = current_leisure_time
-                    
-                    leisure_savings = (current_leisure_time - new_leisure_time) * leisure_frequency
-                    
-                    # Total weekly savings
-                    total_weekly_savings = commute_savings + shopping_savings + leisure_savings
-                    
-                    # Display savings
-                    st.metric("🚌 Economia Trabalho", f"{commute_savings:.0f} min/semana")
-                    st.metric("🛒 Economia Compras", f"{shopping_savings:.0f} min/semana")
-                    st.metric("🎭 Economia Lazer", f"{leisure_savings:.0f} min/semana")
-                    
-                    st.markdown("---")
-                    
-                    st.metric("⏰ **TOTAL SEMANAL**", f"{total_weekly_savings:.0f} min")
-                    st.metric("📅 **TOTAL MENSAL**", f"{total_weekly_savings * 4.3:.0f} min")
-                    st.metric("📆 **TOTAL ANUAL**", f"{total_weekly_savings * 52 / 60:.0f} horas")
-                
-                # Financial impact
-                st.markdown("---")
-                st.subheader("💰 Impacto Financeiro da Economia de Tempo")
-                
-                finance_cols = st.columns(4)
-                
-                weekly_value = (total_weekly_savings / 60) * hourly_value
-                monthly_value = weekly_value * 4.3
-                annual_value = weekly_value * 52
-                
-                with finance_cols[0]:
-                    st.metric("💵 Semanal", f"R$ {weekly_value:.0f}")
-                with finance_cols[1]:
-                    st.metric("💵 Mensal", f"R$ {monthly_value:.0f}")
-                with finance_cols[2]:
-                    st.metric("💵 Anual", f"R$ {annual_value:.0f}")
-                with finance_cols[3]:
-                    st.metric("💵 10 Anos", f"R$ {annual_value * 10:,.0f}")
+            if active_premium_tab == PREMIUM_TAB_LABELS[4]:
+                _render_time_savings(soa)
             
-            with premium_tabs[5]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[5]:
                 st.subheader("🔮 Future Index - Potencial Futuro")
                 st.markdown("*Análise preditiva baseada em padrões de crescimento urbano*")
                 
-                # Calculate future index
-                future_indicators = {
-                    'infrastructure_momentum': 0,
-                    'demographic_trends': 0,
-                    'economic_growth': 0,
-                    'sustainability_index': 0,
-                    'innovation_potential': 0
-                }
-                
-                # Infrastructure momentum
-                transport_density = len([p for p in result.pois if p.get('category') == 'transport']) / len(result.pois) * 100
-                future_indicators['infrastructure_momentum'] = min(transport_density * 5, 100)
-                
-                # Demographic trends (diversity of services indicates growing population)
-                service_diversity = len(set([poi.get('category', 'other') for poi in result.pois]))
-                future_indicators['demographic_trends'] = min(service_diversity * 12.5, 100)
-                
-                # Economic growth (business density)
-                business_categories = ['shopping', 'restaurant', 'services']
-                business_count = len([p for p in result.pois if p.get('category') in business_categories])
-                future_indicators['economic_growth'] = min(business_count * 5, 100)
-                
-                # Sustainability index
-                green_pois = len([p for p in result.pois if p.get('category') == 'park'])
-                bike_friendly = len([p for p in result.pois if 'bike' in p.get('name', '').lower()])
-                future_indicators['sustainability_index'] = min((green_pois + bike_friendly) * 15, 100)
-                
-                # Innovation potential
-                innovation_keywords = ['tech', 'coworking', 'startup', 'innovation', 'digital', 'hub']
-                innovation_count = sum([1 for poi in result.pois for keyword in innovation_keywords
-                                      if keyword in poi.get('name', '').lower()])
-                future_indicators['innovation_potential'] = min(innovation_count * 25, 100)
-                
-                # Overall future index
-                future_weights = {
-                    'infrastructure_momentum': 0.25,
-                    'demographic_trends': 0.20,
-                    'economic_growth': 0.25,
-                    'sustainability_index': 0.15,
-                    'innovation_potential': 0.15
-                }
-                
-                future_index = sum([future_indicators[indicator] * future_weights[indicator] for indicator in future_indicators.keys()])
+                future_index, future_indicators = premium_metrics['future']
                 
                 # Display future index
                 future_col1, future_col2, future_col3 = st.columns([1, 2, 1])
                 
                 with future_col2:
-                    if future_index >= 80:
-                        future_level = "🚀 FUTURO BRILHANTE"
-                        future_color = "#4CAF50"
-                    elif future_index >= 60:
-                        future_level = "📈 BOM POTENCIAL"
-                        future_color = "#2196F3"
-                    elif future_index >= 40:
-                        future_level = "⚖️ ESTÁVEL"
-                        future_color = "#FF9800"
-                    else:
-                        future_level = "⚠️ INCERTO"
-                        future_color = "#F44336"
-                    
-                    st.markdown(f"""
-                    <div style="text-align: center; padding: 25px; background: {future_color}20; 
-                               border-radius: 20px; border: 3px solid {future_color};">
-                        <h1 style="margin: 0; color: {future_color}; font-size: 3rem;">{future_index:.0f}</h1>
-                        <h3 style="margin: 10px 0; color: {future_color};">Future Index</h3>
-                        <p style="margin: 0; opacity: 0.8;">{future_level}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(render_index_card(future_index, "Future Index", FUTURE_TIERS), unsafe_allow_html=True)
                 
                 # Future indicators breakdown
                 st.markdown("---")
                 st.subheader("🔮 Indicadores do Futuro")
                 
-                for indicator, score in future_indicators.items():
-                    indicator_names = {
-                        'infrastructure_momentum': '🏗️ Momentum de Infraestrutura',
-                        'demographic_trends': '👥 Tendências Demográficas',
-                        'economic_growth': '💼 Crescimento Econômico',
-                        'sustainability_index': '🌱 Índice de Sustentabilidade',
-                        'innovation_potential': '🚀 Potencial de Inovação'
-                    }
-                    
-                    name = indicator_names.get(indicator, indicator.title())
-                    
-                    col1, col2 = st.columns([2, 1])
-                    with col1:
-                        st.progress(score/100)
-                        st.caption(f"{name}: {score:.0f}/100")
-                    with col2:
-                        if score >= 75:
-                            st.markdown("🟢 Excelente")
-                        elif score >= 50:
-                            st.markdown("🟡 Bom")
-                        else:
-                            st.markdown("🔴 Limitado")
+                render_score_table('Indicador', [
+                    (FUTURE_INDICATOR_NAMES.get(indicator, indicator.title()), score,
+                     "🟢 Excelente" if score >= 75 else "🟡 Bom" if score >= 50 else "🔴 Limitado")
+                    for indicator, score in future_indicators.items()
+                ])
                 
                 # Future scenarios
                 st.markdown("---")
@@ -5135,71 +5580,20 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
                 
                 st.caption("⚠️ Projeções baseadas em padrões urbanos simulados, não garantem resultados reais.")
                 
-            with premium_tabs[6]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[6]:
                 st.subheader("🚶 Mobility Signature - Assinatura de Mobilidade")
                 st.markdown("*Análise única dos padrões de mobilidade desta localização*")
                 
-                # Calculate mobility signature
-                mobility_metrics = {
-                    'walkability_premium': 0,
-                    'public_transport_density': 0,
-                    'cycling_infrastructure': 0,
-                    'car_dependency': 0,
-                    'multimodal_connectivity': 0
-                }
-                
-                # Walkability premium
-                walking_pois = len([p for p in result.pois if p.get('distance', 0) <= 500])
-                mobility_metrics['walkability_premium'] = min(walking_pois * 3, 100)
-                
-                # Public transport density
-                transport_pois = [p for p in result.pois if p.get('category') == 'transport']
-                transport_nearby = len([p for p in transport_pois if p.get('distance', 0) <= 300])
-                mobility_metrics['public_transport_density'] = min(transport_nearby * 25, 100)
-                
-                # Cycling infrastructure
-                bike_pois = len([p for p in result.pois if 'bike' in p.get('name', '').lower()])
-                mobility_metrics['cycling_infrastructure'] = min(bike_pois * 30, 100)
-                
-                # Car dependency (inverse of walkable services)
-                essential_walking = len([p for p in result.pois if p.get('category') in ['shopping', 'healthcare'] and p.get('distance', 0) <= 800])
-                mobility_metrics['car_dependency'] = max(0, 100 - essential_walking * 20)
-                
-                # Multimodal connectivity
-                transport_types = len(set([p.get('name', '').lower() for p in transport_pois]))
-                mobility_metrics['multimodal_connectivity'] = min(transport_types * 20, 100)
+                mobility_score, mobility_metrics = premium_metrics['mobility']
                 
                 # Create mobility signature visualization
-                mobility_df = pd.DataFrame(list(mobility_metrics.items()), columns=['Metric', 'Score'])
-                
-                fig_mobility = go.Figure()
-                
-                fig_mobility.add_trace(go.Scatterpolar(
-                    r=list(mobility_metrics.values()) + [list(mobility_metrics.values())[0]],
-                    theta=['Caminhabilidade', 'Transporte Público', 'Ciclismo', 'Dependência Carro', 'Conectividade'] + ['Caminhabilidade'],
-                    fill='toself',
-                    name='Assinatura de Mobilidade',
-                    line_color='rgb(90, 200, 250)'
-                ))
-                
-                fig_mobility.update_layout(
-                    polar=dict(
-                        radialaxis=dict(
-                            visible=True,
-                            range=[0, 100]
-                        )),
-                    showlegend=False,
-                    title="Assinatura de Mobilidade da Localização"
-                )
-                
+                fig_mobility = mobility_radar_figure(tuple(mobility_metrics.values()))
                 st.plotly_chart(fig_mobility, use_container_width=True)
                 
                 # Mobility profile
                 st.markdown("---")
                 st.subheader("🎯 Perfil de Mobilidade")
                 
-                mobility_score = sum(mobility_metrics.values()) / len(mobility_metrics)
-                
                 if mobility_score >= 80:
                     mobility_profile = "🌟 MOBILIDADE EXCEPCIONAL"
                     mobility_desc = "Localização com conectividade superior e múltiplas opções de transporte"
@@ -5273,218 +5667,54 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
                 if cycling_score >= 40:
                     st.info("🚲 **Bike-friendly**: Bom para ciclistas urbanos")
                 
-            with premium_tabs[7]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[7]:
                 st.subheader("🛡️ Resilience Score - Resistência e Adaptabilidade")
                 st.markdown("*Capacidade da localização de resistir a mudanças e crises*")
                 
-                # Calculate resilience factors
-                resilience_factors = {
-                    'service_redundancy': 0,
-                    'economic_diversity': 0,
-                    'infrastructure_stability': 0,
-                    'social_cohesion': 0,
-                    'adaptability_index': 0
-                }
-                
-                # Service redundancy (multiple options for each essential service)
-                essential_categories = ['shopping', 'healthcare', 'education', 'transport']
-                redundancy_score = 0
-                for category in essential_categories:
-                    category_count = len([p for p in result.pois if p.get('category') == category])
-                    redundancy_score += min(category_count * 20, 100)
-                resilience_factors['service_redundancy'] = redundancy_score / len(essential_categories)
-                
-                # Economic diversity (variety of business types)
-                business_categories = set([poi.get('category', 'other') for poi in result.pois])
-                resilience_factors['economic_diversity'] = min(len(business_categories) * 15, 100)
-                
-                # Infrastructure stability (transport connectivity)
-                transport_pois = [p for p in result.pois if p.get('category') == 'transport']
-                resilience_factors['infrastructure_stability'] = min(len(transport_pois) * 20, 100)
-                
-                # Social cohesion (community spaces and gathering places)
-                community_categories = ['park', 'entertainment', 'restaurant', 'education']
-                community_pois = [p for p in result.pois if p.get('category') in community_categories]
-                resilience_factors['social_cohesion'] = min(len(community_pois) * 5, 100)
-                
-                # Adaptability index (presence of modern/flexible services)
-                adaptability_keywords = ['coworking', 'digital', 'tech', 'innovation', 'startup', 'flex']
-                adaptable_pois = sum([1 for poi in result.pois for keyword in adaptability_keywords
-                                    if keyword in poi.get('name', '').lower()])
-                resilience_factors['adaptability_index'] = min(adaptable_pois * 25, 100)
-                
-                # Overall resilience score
-                resilience_weights = {
-                    'service_redundancy': 0.25,
-                    'economic_diversity': 0.20,
-                    'infrastructure_stability': 0.20,
-                    'social_cohesion': 0.20,
-                    'adaptability_index': 0.15
-                }
-                
-                resilience_score = sum([resilience_factors[factor] * resilience_weights[factor] for factor in resilience_factors.keys()])
+                resilience_score, resilience_factors = premium_metrics['resilience']
                 
                 # Display resilience score
                 resilience_col1, resilience_col2, resilience_col3 = st.columns([1, 2, 1])
                 
                 with resilience_col2:
-                    if resilience_score >= 80:
-                        resilience_level = "🛡️ ULTRA RESILIENTE"
-                        resilience_color = "#4CAF50"
-                        resilience_desc = "Extremamente resistente a mudanças e crises"
-                    elif resilience_score >= 60:
-                        resilience_level = "🏰 RESILIENTE"
-                        resilience_color = "#2196F3"
-                        resilience_desc = "Boa capacidade de adaptação"
-                    elif resilience_score >= 40:
-                        resilience_level = "⚖️ MODERADAMENTE RESILIENTE"
-                        resilience_color = "#FF9800"
-                        resilience_desc = "Resistência adequada"
-                    else:
-                        resilience_level = "⚠️ VULNERÁVEL"
-                        resilience_color = "#F44336"
-                        resilience_desc = "Baixa resistência a mudanças"
-                    
-                    st.markdown(f"""
-                    <div style="text-align: center; padding: 25px; background: {resilience_color}20; 
-                               border-radius: 20px; border: 3px solid {resilience_color};">
-                        <h1 style="margin: 0; color: {resilience_color}; font-size: 3rem;">{resilience_score:.0f}</h1>
-                        <h3 style="margin: 10px 0; color: {resilience_color};">Resilience Score</h3>
-                        <p style="margin: 0; opacity: 0.8;">{resilience_level}</p>
-                        <p style="margin: 5px 0 0 0; font-size: 0.9em; opacity: 0.7;">{resilience_desc}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(render_index_card(resilience_score, "Resilience Score", RESILIENCE_TIERS), unsafe_allow_html=True)
                 
                 # Resilience breakdown
                 st.markdown("---")
                 st.subheader("🛡️ Fatores de Resilência")
                 
-                for factor, score in resilience_factors.items():
-                    factor_names = {
-                        'service_redundancy': '🔄 Redundância de Serviços',
-                        'economic_diversity': '💼 Diversidade Econômica',
-                        'infrastructure_stability': '🏗️ Estabilidade da Infraestrutura',
-                        'social_cohesion': '👥 Coesão Social',
-                        'adaptability_index': '🔧 Índice de Adaptabilidade'
-                    }
-                    
-                    name = factor_names.get(factor, factor.title())
-                    
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.progress(score/100)
-                        st.caption(f"{name}: {score:.0f}/100")
-                    with col2:
-                        if score >= 75:
-                            st.markdown("🟢 Forte")
-                        elif score >= 50:
-                            st.markdown("🟡 Adequado")
-                        else:
-                            st.markdown("🔴 Fraco")
+                render_score_table('Fator', [
+                    (RESILIENCE_FACTOR_NAMES.get(factor, factor.title()), score,
+                     "🟢 Forte" if score >= 75 else "🟡 Adequado" if score >= 50 else "🔴 Fraco")
+                    for factor, score in resilience_factors.items()
+                ])
                 
-            with premium_tabs[8]:
+            if active_premium_tab == PREMIUM_TAB_LABELS[8]:
                 st.subheader("🌍 Social Impact Report")
                 st.markdown("*Análise do impacto social e sustentabilidade da localização*")
                 
-                # Calculate social impact metrics
-                social_metrics = {
-                    'community_wellbeing': 0,
-                    'accessibility_inclusion': 0,
-                    'environmental_impact': 0,
-                    'economic_contribution': 0,
-                    'cultural_preservation': 0
-                }
-                
-                # Community wellbeing (healthcare, education, recreation)
-                wellbeing_categories = ['healthcare', 'education', 'park']
-                wellbeing_pois = [p for p in result.pois if p.get('category') in wellbeing_categories]
-                social_metrics['community_wellbeing'] = min(len(wellbeing_pois) * 8, 100)
-                
-                # Accessibility inclusion (public transport, walkability)
-                transport_pois = [p for p in result.pois if p.get('category') == 'transport']
-                walking_distance_pois = len([p for p in result.pois if p.get('distance', 0) <= 500])
-                social_metrics['accessibility_inclusion'] = min((len(transport_pois) * 15 + walking_distance_pois * 2), 100)
-                
-                # Environmental impact (green spaces, sustainable transport)
-                green_pois = len([p for p in result.pois if p.get('category') == 'park'])
-                bike_infrastructure = len([p for p in result.pois if 'bike' in p.get('name', '').lower()])
-                social_metrics['environmental_impact'] = min((green_pois * 20 + bike_infrastructure * 15), 100)
-                
-                # Economic contribution (business density, job creation)
-                business_pois = [p for p in result.pois if p.get('category') in ['shopping', 'restaurant', 'services']]
-                social_metrics['economic_contribution'] = min(len(business_pois) * 4, 100)
-                
-                # Cultural preservation (cultural venues, diversity)
-                cultural_keywords = ['museum', 'art', 'theater', 'cultural', 'heritage', 'history']
-                cultural_pois = sum([1 for poi in result.pois for keyword in cultural_keywords
-                                   if keyword in poi.get('name', '').lower()])
-                entertainment_pois = len([p for p in result.pois if p.get('category') == 'entertainment'])
-                social_metrics['cultural_preservation'] = min((cultural_pois * 25 + entertainment_pois * 10), 100)
-                
-                # Overall social impact score
-                social_weights = {
-                    'community_wellbeing': 0.25,
-                    'accessibility_inclusion': 0.25,
-                    'environmental_impact': 0.20,
-                    'economic_contribution': 0.15,
-                    'cultural_preservation': 0.15
-                }
-                
-                social_impact_score = sum([social_metrics[metric] * social_weights[metric] for metric in social_metrics.keys()])
+                social_impact_score, social_metrics = premium_metrics['social']
                 
                 # Display social impact score
                 social_col1, social_col2, social_col3 = st.columns([1, 2, 1])
                 
                 with social_col2:
-                    if social_impact_score >= 80:
-                        impact_level = "🌟 IMPACTO EXCEPCIONAL"
-                        impact_color = "#4CAF50"
-                        impact_desc = "Contribuição extraordinária para o bem-estar social"
-                    elif social_impact_score >= 60:
-                        impact_level = "🌱 IMPACTO POSITIVO"
-                        impact_color = "#8BC34A"
-                        impact_desc = "Boa contribuição para a comunidade"
-                    elif social_impact_score >= 40:
-                        impact_level = "⚖️ IMPACTO NEUTRO"
-                        impact_color = "#FF9800"
-                        impact_desc = "Impacto social moderado"
-                    else:
-                        impact_level = "⚠️ IMPACTO LIMITADO"
-                        impact_color = "#F44336"
-                        impact_desc = "Baixa contribuição social"
-                    
-                    st.markdown(f"""
-                    <div style="text-align: center; padding: 25px; background: {impact_color}20; 
-                               border-radius: 20px; border: 3px solid {impact_color};">
-                        <h1 style="margin: 0; color: {impact_color}; font-size: 3rem;">{social_impact_score:.0f}</h1>
-                        <h3 style="margin: 10px 0; color: {impact_color};">Social Impact Score</h3>
-                        <p style="margin: 0; opacity: 0.8;">{impact_level}</p>
-                        <p style="margin: 5px 0 0 0; font-size: 0.9em; opacity: 0.7;">{impact_desc}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(render_index_card(social_impact_score, "Social Impact Score", SOCIAL_TIERS), unsafe_allow_html=True)
                 
                 # SDG alignment
                 st.markdown("---")
                 st.subheader("🎯 Alinhamento com ODS (Objetivos de Desenvolvimento Sustentável)")
                 
-                sdg_alignment = {
-                    "3. Saúde e Bem-estar": social_metrics['community_wellbeing'],
-                    "4. Educação de Qualidade": social_metrics['community_wellbeing'],
-                    "8. Trabalho Decente": social_metrics['economic_contribution'],
-                    "10. Redução das Desigualdades": social_metrics['accessibility_inclusion'],
-                    "11. Cidades Sustentáveis": social_impact_score,
-                    "13. Ação Climática": social_metrics['environmental_impact']
-                }
+                sdg_scores = [
+                    (sdg, social_impact_score if field is None else social_metrics[field])
+                    for sdg, field in SDG_SPEC
+                ]
                 
-                sdg_cols = st.columns(2)
-                for i, (sdg, score) in enumerate(sdg_alignment.items()):
-                    with sdg_cols[i % 2]:
-                        if score >= 70:
-                            st.success(f"✅ **ODS {sdg}**: Forte alinhamento ({score:.0f}/100)")
-                        elif score >= 50:
-                            st.info(f"📊 **ODS {sdg}**: Alinhamento moderado ({score:.0f}/100)")
-                        else:
-                            st.warning(f"⚠️ **ODS {sdg}**: Alinhamento limitado ({score:.0f}/100)")
+                render_score_table('ODS', [
+                    (sdg, score,
+                     "✅ Forte alinhamento" if score >= 70 else "📊 Alinhamento moderado" if score >= 50 else "⚠️ Alinhamento limitado")
+                    for sdg, score in sdg_scores
+                ])
                 
                 # ESG Score
                 st.markdown("---")
@@ -5504,30 +5734,12 @@ Análise realizada com UrbanSight - Inteligência Imobiliária Profissional"""
         else:
             st.info("👋 **Realize uma análise primeiro!** Use a aba 'Análise Individual' para acessar as funcionalidades premium.")
             
-            # Premium features preview
-            st.markdown("### 🏆 **Funcionalidades Premium Disponíveis:**")
-            
-            premium_features = [
-                ("🎯 UrbanScore Elite", "Algoritmo proprietário com 50+ variáveis urbanas"),
-                ("🧬 DNA da Localização", "Perfil genético único baseado em características urbanas"),
-                ("🎮 Lifestyle Simulator", "Simule sua vida diária na localização"),
-                ("💎 Rarity Index", "Exclusividade e raridade da localização"),
-                ("⏱️ Time Savings Calculator", "Economia de tempo e dinheiro"),
-                ("🔮 Future Index", "Potencial futuro baseado em tendências"),
-                ("🚶 Mobility Signature", "Assinatura única de mobilidade"),
-                ("🛡️ Resilience Score", "Resistência a mudanças e crises"),
-                ("🌍 Social Impact Report", "Impacto social e sustentabilidade")
-            ]
-            
-            premium_col1, premium_col2 = st.columns(2)
-            
-            for i, (feature, description) in enumerate(premium_features):
-                with premium_col1 if i % 2 == 0 else premium_col2:
-                    st.markdown(f"**{feature}**")
-                    st.caption(description)
-                    st.markdown("---")
-            
-            st.success("💡 **Todas essas análises avançadas estão prontas! Analise um endereço para acessá-las.**")
+            # Premium features preview, only until the first analysis of the session
+            if not st.session_state.analysis_done:
+                with st.expander("🏆 Funcionalidades Premium Disponíveis", expanded=False):
+                    st.html(_premium_preview_html())
+                
+                st.success("💡 **Todas essas análises avançadas estão prontas! Analise um endereço para acessá-las.**")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file